@@ -4,7 +4,7 @@
 # Name:		kill-pcluster.py
 # Author:	Rodney Marable <rodney.marable@gmail.com>
 # Created On:   April 20, 2019
-# Last Changed: May 26, 2019
+# Last Changed: October 17, 2026
 # Purpose:	Python3 wrapper for deleting custom pcluster stacks
 ################################################################################
 
@@ -12,6 +12,7 @@
 
 import argparse
 import boto3
+import botocore
 import contextlib
 import errno
 import os
@@ -24,7 +25,11 @@ from nested_lookup import nested_lookup
 # Source: clustermaker_aux_data.py
 
 from parallelclustermaker_aux_data import p_val
+from parallelclustermaker_aux_data import aws_cache_ttls
+from parallelclustermaker_aux_data import cached_aws_account_id
+from parallelclustermaker_aux_data import cached_aws_call
 from parallelclustermaker_aux_data import ctrlC_Abort
+from parallelclustermaker_aux_data import open_aws_cache
 from parallelclustermaker_aux_data import print_TextHeader
 
 # Parse input from the command line.
@@ -45,6 +50,7 @@ parser.add_argument('--cluster_owner_email', '-E', help='email address of the cl
 parser.add_argument('--delete_efs', choices=['True', 'true', 'False', 'false'], help='Delete the EFS file system associated with this cluster (default = true)', required=False, default='true')
 parser.add_argument('--delete_fsx', choices=['True', 'true', 'False', 'false'], help='Delete the Lustre file system associated with this cluster (default = true)', required=False, default='true')
 parser.add_argument('--delete_s3_bucketname', choices=['True', 'true', 'False', 'false'], help='Delete the S3 bucket associated with this cluster (default = true)', required=False, default='true')
+parser.add_argument('--refresh_cache', '--refresh-cache', choices=['true', 'false'], help='ignore the cached AWS metadata (AZs, account ID) and refresh it (default = false)', required=False, default='false')
 parser.add_argument('--debug_mode', '-D', choices=['true', 'false'], help='Enable debug mode (default = false)', required=False, default='false')
 
 # Set cluster_parameters to the values provided via command line.
@@ -60,6 +66,7 @@ delete_fsx = args.delete_fsx
 delete_s3_bucketname = args.delete_s3_bucketname
 cluster_owner_email = args.cluster_owner_email
 debug_mode = args.debug_mode
+refresh_cache = args.refresh_cache
 
 # Print a header for cluster variable validation.
 
@@ -67,11 +74,16 @@ if debug_mode == 'true':
     print_TextHeader(cluster_owner + '-' + cluster_name, 'Validating cluster parameter values', 80)
 
 # Perform error checking on the selected AWS Region and Availability Zone.
-# Abort if a non-existent Availability Zone was chosen.
+# Abort if a non-existent Availability Zone was chosen.  The Availability Zone
+# list and AWS Account ID are read from the AWS metadata cache shared with
+# make-pcluster.py when a fresh entry exists.
 
+aws_cache = open_aws_cache(refresh_cache == 'true')
 try:
     ec2client = boto3.client('ec2', region_name = region)
-    az_information = ec2client.describe_availability_zones()
+    stsclient = boto3.client('sts', region_name=region, endpoint_url='https://sts.' + region + '.amazonaws.com')
+    aws_account_id = cached_aws_account_id(aws_cache, stsclient)
+    az_information = cached_aws_call(aws_cache, aws_account_id, region, 'availability_zones', lambda: ec2client.describe_availability_zones()['AvailabilityZones'], aws_cache_ttls['availability_zones'])
 except ValueError:
     print('')
     print('*** ERROR ***')
@@ -4,7 +4,7 @@
 # Name:		make-pcluster.py
 # Author:	Rodney Marable <rodney.marable@gmail.com>
 # Created On:	April 20, 2019
-# Last Changed:	September 22, 2019
+# Last Changed:	October 17, 2026
 # Purpose:	Python3 wrapper for customizing ParallelCluster stacks
 ################################################################################
 
@@ -14,14 +14,13 @@ import argparse
 import boto3
 import botocore
 import errno
-import json
 import os
 import subprocess
 import sys
 import time
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from datetime import datetime as DateTime
-from jq import jq
 from nested_lookup import nested_lookup
 from requests.exceptions import ConnectionError
 from validate_email import validate_email
@@ -29,18 +28,27 @@ from validate_email import validate_email
 # Import the list of supported EC2 instances and some external functions.
 # Source: parallelparallelclustermaker_aux_data.py
 
+from parallelclustermaker_aux_data import aws_cache_ttls
 from parallelclustermaker_aux_data import base_os_efa
 from parallelclustermaker_aux_data import base_os_instance_check
+from parallelclustermaker_aux_data import cached_aws_account_id
+from parallelclustermaker_aux_data import cached_aws_call
 from parallelclustermaker_aux_data import ctrlC_Abort
 from parallelclustermaker_aux_data import default_instance_types
 from parallelclustermaker_aux_data import ec2_instances_efa
 from parallelclustermaker_aux_data import ec2_instances_full_list
+from parallelclustermaker_aux_data import iam_role_exists
 from parallelclustermaker_aux_data import illegal_az_msg
 from parallelclustermaker_aux_data import is_number
+from parallelclustermaker_aux_data import open_aws_cache
 from parallelclustermaker_aux_data import p_fail
 from parallelclustermaker_aux_data import p_val
+from parallelclustermaker_aux_data import print_preflight_latencies
 from parallelclustermaker_aux_data import print_TextHeader
+from parallelclustermaker_aux_data import probe_s3_bucket
 from parallelclustermaker_aux_data import refer_to_docs_and_quit
+from parallelclustermaker_aux_data import run_preflight_checks
+from parallelclustermaker_aux_data import s3_prefix_exists
 from parallelclustermaker_aux_data import S3Prefix
 
 # Parse input from the command line.
@@ -102,6 +110,7 @@ parser.add_argument('--perftest_custom_total_tests', help='number of performance
 parser.add_argument('--placement_group', choices=['NONE', 'DYNAMIC'], help='create a dynamic placement group for this cluster, use with caution (default=NONE)', required=False, default='NONE')
 parser.add_argument('--prod_level', choices=['dev', 'test', 'stage', 'prod'], help='operating stage of the cluster (default = dev)', required=False, default='dev')
 parser.add_argument('--project_id', '-P', help='project name or ID number (default = UNDEFINED)', required=False, default='UNDEFINED')
+parser.add_argument('--refresh_cache', '--refresh-cache', choices=['true', 'false'], help='ignore the cached AWS metadata (AZs, VPCs, subnets, account ID) and refresh it (default = false)', required=False, default='false')
 parser.add_argument('--scaledown_idletime', help='amount of time in minutes without a job after which the compute node will terminate (default = 15)', required=False, type=int, default=15)
 parser.add_argument('--scheduler', '-S', choices=['sge', 'torque', 'slurm', 'awsbatch'], help='cluster scheduler (default = sge)', required=False, default='sge')
 parser.add_argument('--sge_pe_type', choices=['make', 'mpi', 'smp'], help='select a Grid Engine parallel environment type (default = smp)', required=False, default='smp')
@@ -175,6 +184,7 @@ min_vcpus = args.min_vcpus
 placement_group = args.placement_group
 prod_level = args.prod_level
 project_id = args.project_id
+refresh_cache = args.refresh_cache
 region = az[:-1]
 scaledown_idletime = args.scaledown_idletime
 scheduler = args.scheduler
@@ -219,56 +229,6 @@ if not ANSIBLE_VERSION:
 cluster_birth_name = cluster_name
 cluster_name = cluster_owner + '-' + cluster_birth_name
 
-# Perform error checking on the selected AWS Region and Availability Zone. 
-# Abort if a non-existent Region or Availability Zone was chosen.
-
-try:
-    ec2client = boto3.client('ec2', region_name = region)
-    az_information = ec2client.describe_availability_zones()
-except (ValueError):
-    illegal_az_msg(az)
-except (botocore.exceptions.EndpointConnectionError):
-    illegal_az_msg(az)
-else:
-    p_val('region', debug_mode)
-    p_val('az', debug_mode)
-
-# Determine the vpc_id of the destination VPC based on the provided vpc_name
-# and the the selected AWS Region and Availability Zone.
-
-if vpc_name == 'vpc_default':
-    vpc_information = ec2client.describe_vpcs(Filters=[{'Name': 'isDefault', 'Values': ['true']}])
-else:
-    vpc_information = ec2client.describe_vpcs(Filters=[{'Name': 'tag:Name', 'Values': [ vpc_name ]}])
-
-for vpc in vpc_information["Vpcs"]:
-    vpc_id = vpc["VpcId"]
-
-# Parse the subnet_id from the destination vpc_id.
-# More sophisticated subnet selection logic may be added in a future release.
-# Abort if a valid Name tag for this VPC does not exist or if the selected
-# Availability Zone does not have a valid subnet available.
-
-try:
-    subnet_information = ec2client.describe_subnets(
-        Filters=[ {'Name': 'availabilityZone', 'Values': [ az, ]}, {'Name': 'vpc-id', 'Values': [ vpc_id, ]} ],
-    )
-except NameError:
-    error_msg = '"' + vpc_name + '" is an undefined VPC!'
-    refer_to_docs_and_quit(error_msg)
-p_val('vpc_name', debug_mode)
-try:
-    subnet_id = subnet_information['Subnets'][0]['SubnetId']
-except IndexError:
-    error_msg='AvailabilityZone ' + az + ' does not contain any valid subnets!'
-    refer_to_docs_and_quit(error_msg)
-p_val('subnet_id', debug_mode)
-
-# Parse the AWS Account ID.
-
-stsclient = boto3.client('sts', region_name=region, endpoint_url='https://sts.' + region + '.amazonaws.com')
-aws_account_id = stsclient.get_caller_identity()["Account"]
-
 # Set the vars_file_path.
 
 vars_file_path = './vars_files/' + cluster_name + ".yml"
@@ -300,54 +260,24 @@ if os.path.isfile(vars_file_path):
 else:
     p_val('vars_file_path', debug_mode)
 
-# Check for the presence of an existing cluster with the same name.  If an
-# existing cluster is found, abort to prevent creating duplicate stacks.
-
-status_cmd_string = 'pcluster status --region ' + region + ' ' + cluster_name
-
-with open(os.devnull, 'w') as devnull:
-    p = subprocess.run(status_cmd_string, shell=True, stdout=devnull)
-    if p.returncode == 0:
-        error_msg='pcluster stack "' + cluster_name + '" is already deployed in ' + region + '!'
-        refer_to_docs_and_quit(error_msg)
-    else:
-        if debug_mode == 'true':
-            p_val('cluster_name', debug_mode)
-
 # Set the state directory for this cluster.
 
 cluster_data_dir = './cluster_data/' + prod_level + '/' + cluster_name + '/'
 
-# Check for an existing state directory for this cluster.
-
-try:
-    os.makedirs(cluster_data_dir)
-except OSError as e:
-    if e.errno != errno.EEXIST:
-        raise
-p_val('cluster_data_dir', debug_mode)
-
-# Generate a cluster_serial_number file to store useful state information
-# about each active cluster stack.
+# Set the cluster_serial_number and the path of the cluster_serial_number
+# file that stores useful state information about each active cluster stack.
+# The state directory and serial file are only written once the pre-flight
+# phase has passed, so a failed validation leaves nothing behind and never
+# overwrites the serial file of a cluster that is already deployed.
 
 SERIAL_DIR = './active_clusters'
-try:
-    os.makedirs(SERIAL_DIR)
-except OSError as e:
-    if e.errno != errno.EEXIST:
-        raise
-
 DEPLOYMENT_DATE = time.strftime("%B %-d, %Y")
 DEPLOYMENT_DATE_TAG = time.strftime("%-d-%B-%Y")
 Deployed_On = time.strftime("%B %-d, %Y")
 cluster_serial_datestamp = DateTime.utcnow().strftime('%S%M%H%d%m%Y')
 cluster_serial_number = cluster_name + '-' + cluster_serial_datestamp
 cluster_serial_number_file = SERIAL_DIR + '/' + cluster_name + '.serial'
-
-if not os.path.isfile(cluster_serial_number):
-    print('%s' % (cluster_serial_number), file=open(cluster_serial_number_file, 'w'))
 p_val('cluster_serial_number', debug_mode)
-p_val('cluster_serial_number_file', debug_mode)
 
 # Validate the prod_level and cluster_owner_department.  These values are
 # limited by the command line argument parser so there is no need for futher
@@ -454,22 +384,6 @@ print('Selected base operating system: ' + base_os)
 print('Selected master instance type: ' + master_instance_type)
 print('Selected compute instance type: ' + compute_instance_type)
 
-# Configure a boto3 resource and client for communication with S3.
-
-s3 = boto3.resource('s3')
-s3_client = boto3.client('s3')
-
-# Perform error checking against the auto-generated name for s3_bucketname
-# If s3_bucketname doesn't exist, create it during the cfncluster stack build.
-
-s3_bucketname = 'parallelclustermaker-' + cluster_serial_number
-
-if s3.Bucket(s3_bucketname) not in s3.buckets.all():
-    p_val('s3_bucketname', debug_mode)
-else:
-    error_msg = 'Found an existing S3 bucket associated with this cluster!'
-    refer_to_docs_and_quit(error_msg)
-
 # Lustre is not currently supported when using AWS Batch as a scheduler unless
 # base_os is either Amazon Linux (alinux) or CentOS 7 (centos7):
 #
@@ -518,65 +432,220 @@ if (int(fsx_chunk_size) > 528000) or (int(fsx_chunk_size) < 1024):
 if enable_fsx_hydration == 'true':
     p_val('fsx_chunk_size', debug_mode)
 
-# Check to ensure the Lustre S3 import and export buckets and paths exist:
+# Select the Lustre S3 import and export buckets and paths:
 #   - s3://fsx_s3_import_bucket/fsx_s3_import_path
 #   - s3://fsx_s3_export_bucket/fsx_s3_export_path
 #
-# If the S3-to-Lustre import bucket name is provided but a corresponding export
+# Their existence is checked during the pre-flight phase below.  If the
+# S3-to-Lustre import bucket name is provided but a corresponding export
 # bucket was not, assume the import bucket will serve both functions.
 
+fsx_s3_bucket_paths = []
 if enable_fsx == 'true' and enable_fsx_hydration == 'true':
-    if s3.Bucket(fsx_s3_import_bucket) not in s3.buckets.all():
-        error_msg = 'Lustre hydration is enabled but no S3 import bucket was found!'
+    if fsx_s3_import_bucket == 'UNDEFINED':
+        error_msg = 'Lustre hydration is enabled but no S3 import bucket was defined!'
         refer_to_docs_and_quit(error_msg)
-    if fsx_s3_import_bucket != 'UNDEFINED' and fsx_s3_export_bucket == 'UNDEFINED':
+    if fsx_s3_export_bucket == 'UNDEFINED':
         print('*** WARNING ***')
         print('fsx_s3_import bucket is defined but fsx_s3_export_bucket is unspecified!')
         print('Lustre will hydrate *and* dehydrate from the S3 import bucket path.')
         print('')
         fsx_s3_export_bucket = fsx_s3_import_bucket
         fsx_s3_export_path = fsx_s3_import_path
-        fsx_s3_bucket_paths = { fsx_s3_import_bucket: fsx_s3_import_path }
-    if fsx_s3_import_bucket != 'UNDEFINED' and fsx_s3_export_bucket != 'UNDEFINED':
-        if s3.Bucket(fsx_s3_export_bucket) not in s3.buckets.all():
-            error_msg = 'Two-way Lustre hydration is enabled but no S3 export bucket was found!'
-            refer_to_docs_and_quit(error_msg)
-        else:
-            if fsx_s3_import_bucket == fsx_s3_export_bucket:
-                print('*** WARNING ***')
-                print('fsx_s3_import bucket and fsx_s3_export_bucket are set to the same value!')
-                print('Lustre will hydrate *and* dehydrate from the S3 import bucket.')
-                print('')
-                if fsx_s3_import_path == fsx_s3_export_path:
-                    print('*** WARNING ***')
-                    print('fsx_s3_import path and fsx_s3_export_path are set to the same value!')
-                    print('Lustre will hydrate *and* dehydrate from the S3 import path.')
-                    print('')
-                    fsx_s3_bucket_paths = { fsx_s3_import_bucket: fsx_s3_import_path }
-                else:
-                    fsx_s3_bucket_paths = {
-                        fsx_s3_import_bucket: fsx_s3_import_path,
-                        fsx_s3_export_bucket: fsx_s3_export_path
-                        }
-            else:
-                fsx_s3_bucket_paths = {
-                    fsx_s3_import_bucket: fsx_s3_import_path,
-                    fsx_s3_export_bucket: fsx_s3_export_path
-                    }
+    elif fsx_s3_import_bucket == fsx_s3_export_bucket:
+        print('*** WARNING ***')
+        print('fsx_s3_import bucket and fsx_s3_export_bucket are set to the same value!')
+        print('Lustre will hydrate *and* dehydrate from the S3 import bucket.')
+        print('')
+        if fsx_s3_import_path == fsx_s3_export_path:
+            print('*** WARNING ***')
+            print('fsx_s3_import path and fsx_s3_export_path are set to the same value!')
+            print('Lustre will hydrate *and* dehydrate from the S3 import path.')
+            print('')
+    fsx_s3_bucket_paths.append((fsx_s3_import_bucket, fsx_s3_import_path))
+    if (fsx_s3_export_bucket, fsx_s3_export_path) not in fsx_s3_bucket_paths:
+        fsx_s3_bucket_paths.append((fsx_s3_export_bucket, fsx_s3_export_path))
     print('Setting S3-Lustre import path to: s3://' + fsx_s3_import_bucket + '/' + fsx_s3_import_path)
     print('Setting Lustre-S3 export path to: s3://' + fsx_s3_export_bucket + '/' + fsx_s3_export_path)
-    for fsx_s3_bucket, fsx_s3_path in fsx_s3_bucket_paths.items():
-        check_fsx_s3_path = s3_client.list_objects_v2(
-            Bucket=fsx_s3_bucket,
-            Prefix=fsx_s3_path
-            )
-        check_fsx_s3_object_count = jq('.KeyCount').transform(text=json.dumps(check_fsx_s3_path, default=str), text_output=True)
-        if int(check_fsx_s3_object_count) == 0:
-            error_msg = 'Please ensure s3://' + fsx_s3_bucket + '/' + fsx_s3_path + ' exists!'
-            refer_to_docs_and_quit(error_msg)
-        else:
-            p_val('fsx_s3_bucket', debug_mode)
-            p_val('fsx_s3_path', debug_mode)
+
+# Run the pre-flight validation phase.  Every AWS lookup needed to validate
+# the cluster is made here, before anything is built: the Region and
+# Availability Zone, the destination VPC and its subnet, the AWS Account ID,
+# any existing pcluster stack with this name, the S3 bucket for this cluster,
+# the Lustre S3 import and export buckets and paths, the custom AMI, the
+# current spot price, and the IAM roles for this cluster.  The lookups are
+# independent except for the subnet, which needs the vpc_id, and each Lustre
+# S3 path, which needs the Region of its bucket, so they run concurrently on
+# a thread pool and share one set of boto3 clients whose connection pools
+# are sized to match.  Lookup failures are collected and reported together
+# instead of aborting on the first one.  debug_mode prints the latency of
+# each lookup.
+#
+# Each S3 bucket is probed with a single head_bucket request and each Lustre
+# S3 path with a one-key listing, so their cost doesn't grow with the number
+# of buckets in the account or objects under the path.
+#
+# The Availability Zones, VPCs, subnets, and AWS Account ID change rarely, so
+# they are read from the AWS metadata cache shared with kill-pcluster.py and
+# make-pcluster-jumphost.py when a fresh entry exists.  The cache is keyed by
+# account, so those lookups wait for the account ID, which itself is usually
+# cached.  Use "--refresh_cache true" to ignore the cache after changing the
+# network configuration.
+#
+# If s3_bucketname doesn't exist, create it during the cfncluster stack build.
+
+preflight_workers = 8
+preflight_config = Config(max_pool_connections=preflight_workers)
+try:
+    ec2client = boto3.client('ec2', region_name = region, config = preflight_config)
+except (ValueError):
+    illegal_az_msg(az)
+stsclient = boto3.client('sts', region_name=region, endpoint_url='https://sts.' + region + '.amazonaws.com', config=preflight_config)
+s3 = boto3.resource('s3')
+s3_client = boto3.client('s3', region_name=region, config=preflight_config)
+iam = boto3.client('iam', config=preflight_config)
+
+s3_bucketname = 'parallelclustermaker-' + cluster_serial_number
+ec2_iam_role = 'pclustermaker-role-' + cluster_serial_number
+serverless_ec2_iam_role = 'kill-pclustermaker-role-' + cluster_serial_number
+status_cmd_string = 'pcluster status --region ' + region + ' ' + cluster_name
+if vpc_name == 'vpc_default':
+    vpc_filters = [{'Name': 'isDefault', 'Values': ['true']}]
+else:
+    vpc_filters = [{'Name': 'tag:Name', 'Values': [ vpc_name ]}]
+
+aws_cache = open_aws_cache(refresh_cache == 'true')
+
+preflight_checks = {
+    'aws_account_id': (lambda deps: cached_aws_account_id(aws_cache, stsclient), []),
+    'availability_zones': (lambda deps: cached_aws_call(aws_cache, deps['aws_account_id'], region, 'availability_zones', lambda: ec2client.describe_availability_zones()['AvailabilityZones'], aws_cache_ttls['availability_zones']), ['aws_account_id']),
+    'vpcs': (lambda deps: cached_aws_call(aws_cache, deps['aws_account_id'], region, 'vpcs ' + str(vpc_filters), lambda: ec2client.describe_vpcs(Filters=vpc_filters)['Vpcs'], aws_cache_ttls['vpcs']), ['aws_account_id']),
+    'subnets': (lambda deps: cached_aws_call(aws_cache, deps['aws_account_id'], region, 'subnets ' + az + ' ' + deps['vpcs'][-1]['VpcId'], lambda: ec2client.describe_subnets(Filters=[ {'Name': 'availabilityZone', 'Values': [ az, ]}, {'Name': 'vpc-id', 'Values': [ deps['vpcs'][-1]['VpcId'], ]} ])['Subnets'], aws_cache_ttls['subnets']) if deps['vpcs'] else [], ['aws_account_id', 'vpcs']),
+    'pcluster_status': (lambda deps: subprocess.run(status_cmd_string, shell=True, stdout=subprocess.DEVNULL).returncode, []),
+    's3_bucket': (lambda deps: probe_s3_bucket(s3_client, s3_bucketname), []),
+    'ec2_iam_role': (lambda deps: iam_role_exists(iam, ec2_iam_role), []),
+    'serverless_ec2_iam_role': (lambda deps: iam_role_exists(iam, serverless_ec2_iam_role), []),
+}
+if custom_ami != 'NONE':
+    preflight_checks['custom_ami'] = (lambda deps: ec2client.describe_images(ImageIds=[custom_ami]), [])
+if cluster_type == 'spot' and compute_instance_type != 'optimal':
+    preflight_checks['spot_price'] = (lambda deps: ec2client.describe_spot_price_history(InstanceTypes=[compute_instance_type],MaxResults=1,ProductDescriptions=['Linux/UNIX (Amazon VPC)'],AvailabilityZone=az), [])
+for fsx_s3_bucket in sorted(set(bucket for bucket, path in fsx_s3_bucket_paths)):
+    preflight_checks['fsx_s3_bucket ' + fsx_s3_bucket] = (lambda deps, bucket=fsx_s3_bucket: probe_s3_bucket(s3_client, bucket), [])
+for fsx_s3_bucket, fsx_s3_path in fsx_s3_bucket_paths:
+    bucket_check = 'fsx_s3_bucket ' + fsx_s3_bucket
+    preflight_checks['fsx_s3_path ' + fsx_s3_bucket + '/' + fsx_s3_path] = (lambda deps, bucket=fsx_s3_bucket, path=fsx_s3_path, bucket_check=bucket_check: s3_prefix_exists(s3_client, bucket, path, deps[bucket_check][1]) if deps[bucket_check][0] == 'found' else None, [bucket_check])
+
+preflight_start_time = time.perf_counter()
+preflight_results, preflight_errors, preflight_latencies = run_preflight_checks(preflight_checks, preflight_workers)
+if debug_mode == 'true':
+    print_preflight_latencies(preflight_latencies, preflight_errors, time.perf_counter() - preflight_start_time)
+
+# Check the results of the pre-flight lookups and collect every failure.
+
+preflight_failures = []
+preflight_reported = set()
+
+# An unreachable regional STS endpoint also means the Region is invalid, and
+# the lookups keyed by the account ID are skipped.
+
+if isinstance(preflight_errors.get('aws_account_id'), (ValueError, botocore.exceptions.EndpointConnectionError)):
+    preflight_failures.append('"' + az + '"' + ' is not a valid Availability Zone in the selected AWS Region!')
+    preflight_reported.update([ 'aws_account_id', 'availability_zones', 'vpcs', 'subnets' ])
+elif isinstance(preflight_errors.get('availability_zones'), (ValueError, botocore.exceptions.EndpointConnectionError)):
+    preflight_failures.append('"' + az + '"' + ' is not a valid Availability Zone in the selected AWS Region!')
+    preflight_reported.add('availability_zones')
+elif 'availability_zones' in preflight_results:
+    if az in [ zone['ZoneName'] for zone in preflight_results['availability_zones'] ]:
+        p_val('region', debug_mode)
+        p_val('az', debug_mode)
+    else:
+        preflight_failures.append('"' + az + '"' + ' is not a valid Availability Zone in the selected AWS Region!')
+
+if 'vpcs' in preflight_results:
+    if preflight_results['vpcs']:
+        vpc_id = preflight_results['vpcs'][-1]['VpcId']
+        p_val('vpc_name', debug_mode)
+    else:
+        preflight_failures.append('"' + vpc_name + '" is an undefined VPC!')
+
+if preflight_results.get('subnets'):
+    subnet_id = preflight_results['subnets'][0]['SubnetId']
+    p_val('subnet_id', debug_mode)
+elif preflight_results.get('vpcs'):
+    preflight_failures.append('AvailabilityZone ' + az + ' does not contain any valid subnets!')
+
+if 'aws_account_id' in preflight_results:
+    aws_account_id = preflight_results['aws_account_id']
+
+if preflight_results.get('pcluster_status') == 0:
+    preflight_failures.append('pcluster stack "' + cluster_name + '" is already deployed in ' + region + '!')
+elif 'pcluster_status' in preflight_results:
+    p_val('cluster_name', debug_mode)
+
+if 's3_bucket' in preflight_results:
+    if preflight_results['s3_bucket'][0] == 'missing':
+        p_val('s3_bucketname', debug_mode)
+    elif preflight_results['s3_bucket'][0] == 'found':
+        preflight_failures.append('Found an existing S3 bucket associated with this cluster!')
+    else:
+        preflight_failures.append('S3 bucket "' + s3_bucketname + '" already exists in another AWS account!')
+
+# Lustre can only hydrate from and dehydrate to S3 buckets in its own Region.
+
+for fsx_s3_bucket in sorted(set(bucket for bucket, path in fsx_s3_bucket_paths)):
+    bucket_status, bucket_region = preflight_results.get('fsx_s3_bucket ' + fsx_s3_bucket, (None, None))
+    if bucket_status == 'missing':
+        preflight_failures.append('Lustre hydration is enabled but S3 bucket "' + fsx_s3_bucket + '" was not found!')
+    elif bucket_status == 'forbidden':
+        preflight_failures.append('S3 bucket "' + fsx_s3_bucket + '" exists but is not accessible with the current AWS credentials!')
+    elif bucket_status == 'found' and bucket_region != region:
+        preflight_failures.append('S3 bucket "' + fsx_s3_bucket + '" is in ' + str(bucket_region) + ' but Lustre requires an S3 bucket in ' + region + '!')
+    elif bucket_status == 'found':
+        p_val('fsx_s3_bucket', debug_mode)
+for fsx_s3_bucket, fsx_s3_path in fsx_s3_bucket_paths:
+    if preflight_results.get('fsx_s3_path ' + fsx_s3_bucket + '/' + fsx_s3_path) is False:
+        preflight_failures.append('Please ensure s3://' + fsx_s3_bucket + '/' + fsx_s3_path + ' exists!')
+    elif preflight_results.get('fsx_s3_path ' + fsx_s3_bucket + '/' + fsx_s3_path):
+        p_val('fsx_s3_path', debug_mode)
+
+if isinstance(preflight_errors.get('custom_ami'), ClientError):
+    preflight_failures.append('"' + custom_ami + '" does not appear to be a valid AMI!')
+    preflight_reported.add('custom_ami')
+elif 'custom_ami' in preflight_results:
+    p_val('custom_ami', debug_mode)
+
+if 'spot_price' in preflight_results and not preflight_results['spot_price']['SpotPriceHistory']:
+    preflight_failures.append('The selected compute_instance_type is unavailable for purchase on the Spot market within the selected Availability Zone.\n\ncompute_instance_type: ' + compute_instance_type + '\nAvailability Zone: ' + az)
+
+for preflight_check in sorted(preflight_errors):
+    if preflight_check not in preflight_reported:
+        preflight_failures.append('The ' + preflight_check + ' pre-flight check failed: ' + str(preflight_errors[preflight_check]))
+
+if preflight_failures:
+    error_msg = '\n'.join(preflight_failures)
+    refer_to_docs_and_quit(error_msg)
+
+# Create the state directory for this cluster.
+
+try:
+    os.makedirs(cluster_data_dir)
+except OSError as e:
+    if e.errno != errno.EEXIST:
+        raise
+p_val('cluster_data_dir', debug_mode)
+
+# Generate the cluster_serial_number file.
+
+try:
+    os.makedirs(SERIAL_DIR)
+except OSError as e:
+    if e.errno != errno.EEXIST:
+        raise
+
+if not os.path.isfile(cluster_serial_number):
+    print('%s' % (cluster_serial_number), file=open(cluster_serial_number_file, 'w'))
+p_val('cluster_serial_number_file', debug_mode)
 
 # Check to ensure external NFS support has been properly enabled.
 
@@ -636,17 +705,6 @@ if enable_efs == 'true':
     p_val('efs_throughput_mode', debug_mode)
     p_val('efs_encryption', debug_mode)
 
-# If a custom_ami was provided, perform error checking on its existence.
-
-if custom_ami != 'NONE':
-    try:
-        custom_ami_information = ec2client.describe_images(ImageIds=[custom_ami])
-    except (botocore.exceptions.ClientError):
-        error_msg='"' + custom_ami + '" does not appear to be a valid AMI!'
-        refer_to_docs_and_quit(error_msg)
-    else:
-        p_val('custom_ami', debug_mode)
-
 # Compute EC2 spot prices from: https://aws.amazon.com/ec2/spot/pricing/
 # Pad the spot_price with a buffer to protect against spot price market
 # fluctuations that might cause an instance to be reclaimed in the middle
@@ -665,16 +723,8 @@ if cluster_type == 'ondemand':
 elif cluster_type == 'spot':
     p_val('cluster_type', debug_mode)
     if compute_instance_type != 'optimal':
-        prices=ec2client.describe_spot_price_history(InstanceTypes=[compute_instance_type],MaxResults=1,ProductDescriptions=['Linux/UNIX (Amazon VPC)'],AvailabilityZone=az)
-        try:
-            raw_spot_price = float(prices['SpotPriceHistory'][0]['SpotPrice'])
-        except IndexError:
-            error_msg='''The selected compute_instance_type is unavailable for purchase on the
-Spot market within the selected Availability Zone.
-
-compute_instance_type: ' + compute_instance_type
-'Availability Zone: ' + az'''
-            refer_to_docs_and_quit(error_msg)
+        prices = preflight_results['spot_price']
+        raw_spot_price = float(prices['SpotPriceHistory'][0]['SpotPrice'])
         spot_price = round(raw_spot_price + (spot_buffer * raw_spot_price), 8)
     else:
         raw_spot_price = 'UNDEFINED'
@@ -684,47 +734,44 @@ else:
     p_fail(cluster_type, 'cluster_type', cluster_type_allowed)
 
 # Create ec2_iam_role, which will be attached to all cluster instances.
+# The pre-flight phase already checked whether it exists.
 
-iam = boto3.client('iam')
 ec2_iam_policy = 'pclustermaker-policy-' + cluster_serial_number
-ec2_iam_role = 'pclustermaker-role-' + cluster_serial_number
 ec2_json_policy_src = 'templates/ParallelClusterInstancePolicy.json_src'
 ec2_json_policy_template = cluster_data_dir + 'ParallelClusterInstancePolicy.json'
 
-try:
-    check_ec2_iam_role = iam.get_role(RoleName=ec2_iam_role)
+if preflight_results['ec2_iam_role']:
     print('Found ec2_iam_role: ' + ec2_iam_role)
-except ClientError as e:
-    if e.response['Error']['Code'] == 'NoSuchEntity':
-        with open(ec2_json_policy_src, 'r') as ec2_iam_role_src:
-            role_stage_0 = ec2_iam_role_src.read()
-            ec2_iam_role_src.close()
-            # Customize the IAM JSON policy template using cluster_parameters
-            # provided from the command line.
-            role_stage_1 = role_stage_0.replace('<AWS_ACCOUNT_ID>', aws_account_id)
-            role_stage_2 = role_stage_1.replace('<PROD_LEVEL>', prod_level)
-            role_stage_3 = role_stage_2.replace('<CLUSTER_SERIAL_NUMBER>', cluster_serial_number)
-            role_stage_4 = role_stage_3.replace('<CLUSTER_NAME>', cluster_name)
-            role_stage_5 = role_stage_4.replace('<CLUSTER_OWNER>', cluster_owner)
-            role_stage_6 = role_stage_5.replace('<CLUSTER_SERIAL_DATESTAMP>', cluster_serial_datestamp)
-            filedata = role_stage_6
-        with open(ec2_json_policy_template, 'w') as ec2_iam_role_dest:
-            ec2_iam_role_dest.write(filedata)
-            ec2_iam_role_dest.close()
-        pcluster_ec2_iam_role = iam.create_role(
+else:
+    with open(ec2_json_policy_src, 'r') as ec2_iam_role_src:
+        role_stage_0 = ec2_iam_role_src.read()
+        ec2_iam_role_src.close()
+        # Customize the IAM JSON policy template using cluster_parameters
+        # provided from the command line.
+        role_stage_1 = role_stage_0.replace('<AWS_ACCOUNT_ID>', aws_account_id)
+        role_stage_2 = role_stage_1.replace('<PROD_LEVEL>', prod_level)
+        role_stage_3 = role_stage_2.replace('<CLUSTER_SERIAL_NUMBER>', cluster_serial_number)
+        role_stage_4 = role_stage_3.replace('<CLUSTER_NAME>', cluster_name)
+        role_stage_5 = role_stage_4.replace('<CLUSTER_OWNER>', cluster_owner)
+        role_stage_6 = role_stage_5.replace('<CLUSTER_SERIAL_DATESTAMP>', cluster_serial_datestamp)
+        filedata = role_stage_6
+    with open(ec2_json_policy_template, 'w') as ec2_iam_role_dest:
+        ec2_iam_role_dest.write(filedata)
+        ec2_iam_role_dest.close()
+    pcluster_ec2_iam_role = iam.create_role(
+        RoleName=ec2_iam_role,
+        AssumeRolePolicyDocument='{ "Version": "2012-10-17", "Statement": [ { "Effect": "Allow", "Principal": { "Service": [ "ec2.amazonaws.com" ] }, "Action": "sts:AssumeRole" } ] }',
+        Description='ParallelClusterMaker EC2 IAM instance role'
+        )
+    print('')
+    print('Created ec2_iam_role: ' + ec2_iam_role)
+    with open(ec2_json_policy_template, 'r') as policy_input:
+        pcluster_ec2_iam_policy = iam.put_role_policy(
             RoleName=ec2_iam_role,
-            AssumeRolePolicyDocument='{ "Version": "2012-10-17", "Statement": [ { "Effect": "Allow", "Principal": { "Service": [ "ec2.amazonaws.com" ] }, "Action": "sts:AssumeRole" } ] }',
-            Description='ParallelClusterMaker EC2 IAM instance role'
+            PolicyName=ec2_iam_policy,
+            PolicyDocument=policy_input.read()
             )
-        print('')
-        print('Created ec2_iam_role: ' + ec2_iam_role)
-        with open(ec2_json_policy_template, 'r') as policy_input:
-            pcluster_ec2_iam_policy = iam.put_role_policy(
-                RoleName=ec2_iam_role,
-                PolicyName=ec2_iam_policy,
-                PolicyDocument=policy_input.read()
-                )
-        print('Created ec2_iam_policy: ' + ec2_iam_policy)
+    print('Created ec2_iam_policy: ' + ec2_iam_policy)
 if debug_mode == 'true':
     print('')
     p_val('ec2_iam_policy', debug_mode)
@@ -735,26 +782,23 @@ if debug_mode == 'true':
 # function that destroys the stack after cluster_lifetime has expired.
 
 serverless_ec2_iam_policy = 'kill-pclustermaker-policy-' + cluster_serial_number
-serverless_ec2_iam_role = 'kill-pclustermaker-role-' + cluster_serial_number
 
-try:
-    check_serverless_ec2_iam_role = iam.get_role(RoleName=serverless_ec2_iam_role)
+if preflight_results['serverless_ec2_iam_role']:
     print('Found serverless_ec2_iam_role: ' + serverless_ec2_iam_role)
-except ClientError as e:
-    if e.response['Error']['Code'] == 'NoSuchEntity':
-        pcluster_serverless_ec2_iam_role = iam.create_role(
+else:
+    pcluster_serverless_ec2_iam_role = iam.create_role(
+        RoleName=serverless_ec2_iam_role,
+        AssumeRolePolicyDocument='{ "Version": "2012-10-17", "Statement": [ { "Effect": "Allow", "Principal": { "Service": [ "lambda.amazonaws.com" ] }, "Action": "sts:AssumeRole" } ] }',
+        Description='Serverless ParallelClusterMaker IAM role'
+        )
+    print('Created serverless_ec2_iam_role: ' + serverless_ec2_iam_role)
+    with open(ec2_json_policy_template, 'r') as serverless_policy_input:
+        pcluster_serverless_ec2_iam_policy = iam.put_role_policy(
             RoleName=serverless_ec2_iam_role,
-            AssumeRolePolicyDocument='{ "Version": "2012-10-17", "Statement": [ { "Effect": "Allow", "Principal": { "Service": [ "lambda.amazonaws.com" ] }, "Action": "sts:AssumeRole" } ] }',
-            Description='Serverless ParallelClusterMaker IAM role'
+            PolicyName=serverless_ec2_iam_policy,
+            PolicyDocument=serverless_policy_input.read()
             )
-        print('Created serverless_ec2_iam_role: ' + serverless_ec2_iam_role)
-        with open(ec2_json_policy_template, 'r') as serverless_policy_input:
-            pcluster_serverless_ec2_iam_policy = iam.put_role_policy(
-                RoleName=serverless_ec2_iam_role,
-                PolicyName=serverless_ec2_iam_policy,
-                PolicyDocument=serverless_policy_input.read()
-                )
-        print('Created serverless_ec2_iam_policy: ' + serverless_ec2_iam_policy)
+    print('Created serverless_ec2_iam_policy: ' + serverless_ec2_iam_policy)
 if debug_mode == 'true':
     print('')
     p_val('serverless_ec2_iam_policy', debug_mode)
@@ -2,7 +2,7 @@
 # Name:		parallelclustermaker_aux_data.py
 # Author:	Rodney Marable <rodney.marable@gmail.com>
 # Created On:	April 20, 2019
-# Last Changed:	July 18, 2019
+# Last Changed:	October 17, 2026
 # Purpose:	External data structures and functions for ParallelClusterMaker
 ################################################################################
 
@@ -177,6 +177,219 @@ def refer_to_docs_and_quit(error_msg):
     print('Aborting...')
     sys.exit(1)
 
+# Function: iam_role_exists()
+# Purpose: Return True if role_name exists and False if IAM reports it as
+# NoSuchEntity.  Any other IAM error is raised to the caller.
+
+def iam_role_exists(iam, role_name):
+    from botocore.exceptions import ClientError
+    try:
+        iam.get_role(RoleName=role_name)
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'NoSuchEntity':
+            return False
+        raise
+    return True
+
+# Function: s3_regional_client()
+# Purpose: Return an S3 client for region that reuses the configuration of
+# s3_client, or s3_client itself if it already points at region.  This is
+# called from the pre-flight worker threads, and creating clients on the
+# shared default boto3 session isn't thread-safe, so each new client gets a
+# session of its own.
+
+def s3_regional_client(s3_client, region):
+    import boto3
+    if region is None or region == s3_client.meta.region_name:
+        return s3_client
+    return boto3.session.Session().client('s3', region_name=region, config=s3_client.meta.config)
+
+# Function: probe_s3_bucket()
+# Purpose: Check whether bucket_name exists with a single head_bucket request
+# instead of listing every bucket in the account.  Returns (status, region):
+#   found	the bucket exists and is accessible
+#   forbidden	the bucket exists but belongs to another account or is denied
+#		to these credentials (403)
+#   missing	no bucket by that name exists (404)
+# region is the Region of the bucket from the x-amz-bucket-region header, or
+# None when S3 doesn't report it.  A 301 or 400 from the wrong regional
+# endpoint is retried once against the Region S3 reports.  Any other error is
+# raised to the caller.
+
+def probe_s3_bucket(s3_client, bucket_name):
+    from botocore.exceptions import ClientError
+    try:
+        response = s3_client.head_bucket(Bucket=bucket_name)
+    except ClientError as e:
+        error_code = e.response['Error']['Code']
+        region = e.response.get('ResponseMetadata', {}).get('HTTPHeaders', {}).get('x-amz-bucket-region')
+        if error_code in ('404', 'NoSuchBucket'):
+            return 'missing', None
+        if error_code in ('403', 'AccessDenied', 'Forbidden'):
+            return 'forbidden', region
+        if error_code in ('301', '400', 'PermanentRedirect', 'AuthorizationHeaderMalformed') and region and region != s3_client.meta.region_name:
+            return probe_s3_bucket(s3_regional_client(s3_client, region), bucket_name)
+        raise
+    return 'found', response['ResponseMetadata']['HTTPHeaders'].get('x-amz-bucket-region', s3_client.meta.region_name)
+
+# Function: s3_prefix_exists()
+# Purpose: Return True if at least one object in bucket_name (in region) has a
+# key starting with prefix.  Only a single key is listed, so the cost doesn't
+# depend on how many objects sit under the prefix.
+
+def s3_prefix_exists(s3_client, bucket_name, prefix, region=None):
+    response = s3_regional_client(s3_client, region).list_objects_v2(Bucket=bucket_name, Prefix=prefix, MaxKeys=1)
+    return response['KeyCount'] > 0
+
+# Function: run_preflight_checks()
+# Purpose: Run the pre-flight AWS lookups concurrently on a thread pool.
+# checks maps each lookup name to (function, [names of the lookups it depends
+# on]).  A lookup starts as soon as all of its dependencies have succeeded and
+# its function is called with a dict of their results, so independent lookups
+# overlap and dependent ones wait only for what they need.  Lookups whose
+# dependencies failed are skipped.  Returns (results, errors, latencies), keyed
+# by lookup name: errors holds the exception of each failed or skipped lookup
+# and latencies the seconds each lookup took.
+
+def run_preflight_checks(checks, max_workers=8):
+    import concurrent.futures
+    import time
+    results = {}
+    errors = {}
+    latencies = {}
+    pending = dict(checks)
+    running = {}
+    def timed_check(name, function, inputs):
+        t0 = time.perf_counter()
+        try:
+            return function(inputs)
+        finally:
+            latencies[name] = time.perf_counter() - t0
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while pending or running:
+            scheduled = True
+            while scheduled:
+                scheduled = False
+                for name, (function, dependencies) in list(pending.items()):
+                    failed = [ dependency for dependency in dependencies if dependency in errors or dependency not in checks ]
+                    if failed:
+                        errors[name] = RuntimeError('skipped because ' + ', '.join(failed) + ' failed')
+                    elif all(dependency in results for dependency in dependencies):
+                        running[executor.submit(timed_check, name, function, { dependency: results[dependency] for dependency in dependencies })] = name
+                    else:
+                        continue
+                    del pending[name]
+                    scheduled = True
+            if not running:
+                for name in pending:
+                    errors[name] = RuntimeError('skipped because its dependencies form a cycle')
+                break
+            done, not_done = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    errors[name] = e
+    return results, errors, latencies
+
+# Function: print_preflight_latencies()
+# Purpose: Print the latency and status of each pre-flight lookup, slowest
+# first, followed by the wall clock time of the whole pre-flight phase.
+
+def print_preflight_latencies(latencies, errors, elapsed_time):
+    print('')
+    print('%-28s %14s  %s' % ('pre-flight check', 'latency (sec)', 'status'))
+    print(''.center(80, '-'))
+    for name in sorted(latencies, key=latencies.get, reverse=True):
+        print('%-28s %14.3f  %s' % (name, latencies[name], 'failed' if name in errors else 'ok'))
+    for name in sorted(set(errors) - set(latencies)):
+        print('%-28s %14s  %s' % (name, '-', 'skipped'))
+    print(''.center(80, '-'))
+    print('%-28s %14.3f  (sum of checks = %.3f)' % ('pre-flight wall clock', elapsed_time, sum(latencies.values())))
+    print('')
+
+# Number of seconds each kind of cached AWS lookup stays valid.  Lookups of
+# resources these scripts create or delete (stacks, buckets, IAM roles, key
+# pairs, security groups) are never cached.
+
+aws_cache_ttls = {
+    'aws_account_id': 30 * 86400,
+    'availability_zones': 7 * 86400,
+    'ami_info': 86400,
+    'vpcs': 3600,
+    'subnets': 3600
+}
+
+# Function: open_aws_cache()
+# Purpose: Return a handle to the on-disk AWS metadata cache shared by the
+# maker scripts, creating it if needed.  The cache is a SQLite database under
+# $XDG_CACHE_HOME (default = ~/.cache) keyed by AWS account, Region, and
+# query, so parallel builds can safely share it.  With refresh=True every
+# lookup ignores the cached values and stores fresh ones.  If the cache can't
+# be opened, lookups simply aren't cached.
+
+def open_aws_cache(refresh=False, path=None):
+    import contextlib
+    import os
+    import sqlite3
+    if path is None:
+        path = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'parallelclustermaker', 'aws_metadata.sqlite')
+    aws_cache = { 'path': path, 'refresh': refresh, 'enabled': True }
+    try:
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        with contextlib.closing(sqlite3.connect(path, timeout=30)) as connection:
+            with connection:
+                connection.execute('CREATE TABLE IF NOT EXISTS aws_metadata (account TEXT, region TEXT, query TEXT, value TEXT, expires REAL, PRIMARY KEY (account, region, query))')
+    except (OSError, sqlite3.Error):
+        aws_cache['enabled'] = False
+    return aws_cache
+
+# Function: cached_aws_call()
+# Purpose: Return the result of function() for query in account and region,
+# from the cache if an entry younger than ttl seconds exists.  Results are
+# stored as JSON and returned in that form (timestamps become strings)
+# whether or not they came from the cache.  Exceptions and empty results are
+# never cached, so a missing resource is looked up again on the next run.
+
+def cached_aws_call(aws_cache, account, region, query, function, ttl):
+    import contextlib
+    import json
+    import sqlite3
+    import time
+    if aws_cache['enabled'] and not aws_cache['refresh']:
+        try:
+            with contextlib.closing(sqlite3.connect(aws_cache['path'], timeout=30)) as connection:
+                row = connection.execute('SELECT value FROM aws_metadata WHERE account = ? AND region = ? AND query = ? AND expires > ?', (account, region, query, time.time())).fetchone()
+        except sqlite3.Error:
+            row = None
+        if row is not None:
+            return json.loads(row[0])
+    value_text = json.dumps(function(), default=str, sort_keys=True)
+    value = json.loads(value_text)
+    if aws_cache['enabled'] and value:
+        try:
+            with contextlib.closing(sqlite3.connect(aws_cache['path'], timeout=30)) as connection:
+                with connection:
+                    connection.execute('INSERT OR REPLACE INTO aws_metadata VALUES (?, ?, ?, ?, ?)', (account, region, query, value_text, time.time() + ttl))
+                    connection.execute('DELETE FROM aws_metadata WHERE expires <= ?', (time.time(),))
+        except sqlite3.Error:
+            pass
+    return value
+
+# Function: cached_aws_account_id()
+# Purpose: Return the AWS Account ID of the current credentials.  It is
+# cached under a hash of the access key ID, so a warm run makes no STS call.
+
+def cached_aws_account_id(aws_cache, stsclient):
+    import boto3
+    import hashlib
+    credentials = boto3.Session().get_credentials()
+    if credentials is None:
+        return stsclient.get_caller_identity()['Account']
+    credentials_key = 'credentials ' + hashlib.sha256(credentials.access_key.encode()).hexdigest()[:16]
+    return cached_aws_call(aws_cache, credentials_key, 'global', 'aws_account_id', lambda: stsclient.get_caller_identity()['Account'], aws_cache_ttls['aws_account_id'])
+
 ############################
 # EC2 instance definitions #
 ############################
@@ -4,7 +4,7 @@
 # Name:		Axb_random.py
 # Author:	Rodney Marable <rodney.marable@gmail.com>
 # Created On:	December 20, 2017
-# Last Changed: April 28, 2019
+# Last Changed: October 17, 2026
 # Purpose:	Solve Ax=b when A and b are matrices populated with randomly
 #		generated floats calculated from the normal distribution,
 #		randomly generated standard deviations (sigma) between 0 and
@@ -13,9 +13,14 @@
 #		console, a text file containing A, b, x, and all sigma values,
 #		and/or a CSV file for offline stastical analysis of the time
 #		needed to compute the solution matrix x.
-# Usage:	Axb_random.py [-h] --jobid JOBID --matrix-size MATRIX_SIZE
+# Usage:	Axb_random.py [-h] --jobid JOBID
+#                     (--matrix-size MATRIX_SIZE | --matrix-sizes MATRIX_SIZES)
 #                     [--console-dump CONSOLE_DUMP] [--create-csv CREATE_CSV]
-#                     [--create-logs CREATE_LOGS]
+#                     [--create-logs CREATE_LOGS] [--log-format LOG_FORMAT]
+#                     [--warmup WARMUP] [--repeat REPEAT]
+#                     [--thread-sweep THREAD_SWEEP] [--solver {lu,cholesky,lstsq}]
+#                     [--dtype {float32,float64}] [--rhs RHS]
+#                     [--check-finite CHECK_FINITE] [--overwrite-a OVERWRITE_A]
 # Notes:	Please refer to README.Axb_random.py for additional details.
 ###############################################################################
 ###############################################################################
@@ -39,10 +44,20 @@ import os
 import math
 import numpy as np
 import platform
+import resource
 import shutil
 import sys
+from scipy.linalg import cho_factor
+from scipy.linalg import cho_solve
+from scipy.linalg import lstsq
+from scipy.linalg import lu_factor
+from scipy.linalg import lu_solve
 from scipy.linalg import solve
 
+# Record how long the interpreter took to start and import numpy and scipy.
+
+imports_done_time = time.time()
+
 # Get the testing instance hostname and the current working directory.
 
 exec_node = platform.uname()[1]
@@ -53,18 +68,40 @@ cwd = os.getcwd()
 
 parser = argparse.ArgumentParser(description='Measures system performance by solving Ax=b using matrices and standard deviations randomly generated from the normal distribution')
 parser.add_argument('--jobid', '-J', help='name of the job - used to determine CONSOLE_DUMP, CONSOLE_LOG, and CSV_DATA file names', required=True)
-parser.add_argument('--matrix-size', '-M', help='set dimensions of the square matrix A', required=True, type=int)
+matrix_group = parser.add_mutually_exclusive_group(required=True)
+matrix_group.add_argument('--matrix-size', '-M', help='set dimensions of the square matrix A', type=int)
+matrix_group.add_argument('--matrix-sizes', '-S', help='comma-separated list of matrix dimensions to solve in a single process (batch mode)')
 parser.add_argument('--console-dump', '-D', help='print A, b, x, and all sigma values to stdout', required=False, default='yes')
 parser.add_argument('--create-csv', '-C', help='create a CSV data file for offline analysis', required=False, default='yes')
 parser.add_argument('--create-logs', '-L', help='print console_dump output to a text file', required=False, default='yes')
+parser.add_argument('--log-format', '-F', help='format of the A, b, and x matrix logs: text, npy (memory-mappable numpy arrays), or npz (compressed numpy archive) (default = text)', required=False, default='text', choices=['text', 'npy', 'npz'])
 parser.add_argument('--note', '-N', help='short description of the test to be included as a field in the CSV data file - do *not* use commas with this option', required=False, default='standalone')
+parser.add_argument('--warmup', '-W', help='number of untimed solves to run for each matrix size before measuring in batch mode (default = 0)', required=False, type=int, default=0)
+parser.add_argument('--repeat', '-R', help='number of timed solves for each matrix size in batch mode (default = 1)', required=False, type=int, default=1)
+parser.add_argument('--solver', help='linear solver: lu (general solve), cholesky (A is made symmetric positive definite), or lstsq (least squares) (default = lu)', required=False, default='lu', choices=['lu', 'cholesky', 'lstsq'])
+parser.add_argument('--dtype', help='floating point precision of A and b (default = float64)', required=False, default='float64', choices=['float32', 'float64'])
+parser.add_argument('--rhs', help='number of right-hand sides - with more than one, A is factored once and the factorization is reused to solve each column of b (default = 1)', required=False, type=int, default=1)
+parser.add_argument('--check-finite', help='check A and b for infs and NaNs before solving (default = yes)', required=False, default='yes', choices=['yes', 'no'])
+parser.add_argument('--overwrite-a', help='let the solver overwrite A instead of copying it - ignored when A is dumped to the console or logs (default = no)', required=False, default='no', choices=['yes', 'no'])
+parser.add_argument('--thread-sweep', '-T', help='solve each matrix size with the BLAS/OpenMP thread count pinned to each value in a comma-separated list, or "auto" for 1, 2, 4, ... up to the vCPU count (sweep mode)', required=False)
 args = parser.parse_args()
 cluster_jobid = args.jobid
 matrix_size = args.matrix_size
+if args.matrix_sizes:
+    matrix_sizes = [ int(N) for N in args.matrix_sizes.replace(' ', ',').split(',') if N ]
+warmup = args.warmup
+repeat = args.repeat
 console_dump = args.console_dump
 create_csv = args.create_csv
 create_logs = args.create_logs
+log_format = args.log_format
 note = args.note
+thread_sweep = args.thread_sweep
+solver = args.solver
+dtype = args.dtype
+rhs = max(1, args.rhs)
+check_finite = args.check_finite == "yes"
+overwrite_a = args.overwrite_a == "yes"
 
 # Exit if the user disables console_dump, create_csv, and create_logs.
 
@@ -83,19 +120,261 @@ if (console_dump) == "no" and (create_logs) == "no" and (create_csv) == "no":
     print("Aborting...")
     sys.exit(1)
 
+# Function: process_start_time()
+# Purpose: Return the time the Python process was created, read from /proc on
+# Linux, or the job timer start time where /proc is unavailable.
+
+def process_start_time():
+    try:
+        with open('/proc/self/stat') as f:
+            start_ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/stat') as f:
+            boot_time = [ int(line.split()[1]) for line in f if line.startswith('btime') ][0]
+        return boot_time + start_ticks / os.sysconf('SC_CLK_TCK')
+    except (OSError, IndexError, ValueError):
+        return start_time
+
+# Function: generate_random_system(matrix_size)
+# Purpose: Generate A, b, and their standard deviations from the normal
+# distribution with the origin (mu) set to zero.  b has one column per
+# right-hand side when --rhs is greater than one.  For the cholesky solver A
+# is replaced by A*A^T/N + I, which is symmetric positive definite.  A and b
+# are converted to --dtype.
+
+def generate_random_system(matrix_size):
+    mu = 0
+    sigma_A = np.random.uniform(0, math.sqrt(10), 1)
+    sigma_b = np.random.uniform(0, math.sqrt(10), 1)
+    A = np.random.normal(mu, sigma_A, (matrix_size,matrix_size))
+    if rhs == 1:
+        b = np.random.normal(mu, sigma_b, matrix_size)
+    else:
+        b = np.random.normal(mu, sigma_b, (matrix_size,rhs))
+    if (solver) == "cholesky":
+        A = A.dot(A.T) / matrix_size + np.eye(matrix_size)
+    return sigma_A, sigma_b, A.astype(dtype, copy=False), b.astype(dtype, copy=False)
+
+# Function: solve_system(A, b)
+# Purpose: Solve Ax=b with the selected solver and return x along with the
+# factorization and solve times.  With a single right-hand side, lu and
+# cholesky factor and solve in one call (reported as solve time).  With --rhs
+# greater than one, A is factored once and the factorization is reused to
+# solve each column of b in turn, as in batched right-hand side workloads.
+# lstsq solves all columns in one call.
+
+def solve_system(A, b):
+    t0 = time.perf_counter()
+    if (solver) == "lstsq":
+        x = lstsq(A, b, check_finite=check_finite, overwrite_a=overwrite_a)[0]
+        return x, 0.0, time.perf_counter() - t0
+    if rhs == 1:
+        x = solve(A, b, assume_a='pos' if (solver) == "cholesky" else 'gen', check_finite=check_finite, overwrite_a=overwrite_a)
+        return x, 0.0, time.perf_counter() - t0
+    if (solver) == "cholesky":
+        factorization = cho_factor(A, overwrite_a=overwrite_a, check_finite=check_finite)
+        solve_column = cho_solve
+    else:
+        factorization = lu_factor(A, overwrite_a=overwrite_a, check_finite=check_finite)
+        solve_column = lu_solve
+    t1 = time.perf_counter()
+    x = np.empty_like(b)
+    for k in range(rhs):
+        x[:,k] = solve_column(factorization, b[:,k], check_finite=check_finite)
+    return x, t1 - t0, time.perf_counter() - t1
+
+# Function: peak_rss_mb()
+# Purpose: Return the peak resident set size of this process in MB.
+# ru_maxrss is reported in kilobytes on Linux and in bytes on OS X.
+
+def peak_rss_mb():
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        return peak_rss / 1048576
+    return peak_rss / 1024
+
+# Function: available_cpus()
+# Purpose: Return the number of vCPUs this process may run on, honoring any
+# CPU affinity set by the scheduler.
+
+def available_cpus():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+# Function: sweep_thread_counts(thread_sweep)
+# Purpose: Expand --thread-sweep into a list of thread counts.  "auto" gives
+# 1, 2, 4, ... up to and including the vCPU count.
+
+def sweep_thread_counts(thread_sweep):
+    if thread_sweep == 'auto':
+        cpus = available_cpus()
+        thread_counts = [ 2**i for i in range(cpus.bit_length()) if 2**i < cpus ]
+        return thread_counts + [ cpus ]
+    return sorted(set( int(t) for t in thread_sweep.replace(' ', ',').split(',') if t ))
+
+# Function: sweep_solve_times_in_process(sizes, thread_counts)
+# Purpose: Time the solves for every (matrix size, thread count) in this
+# process with threadpoolctl pinning the BLAS and OpenMP thread pools.  The
+# same A and b are solved at every thread count so only the threading changes.
+# Returns {(matrix_size, threads): [solve_time, ...]}.
+
+def sweep_solve_times_in_process(sizes, thread_counts):
+    from threadpoolctl import threadpool_limits
+    solve_times = {}
+    for matrix_size in sizes:
+        sigma_A, sigma_b, A, b = generate_random_system(matrix_size)
+        for threads in thread_counts:
+            with threadpool_limits(limits=threads):
+                for i in range(warmup):
+                    solve_system(A.copy() if overwrite_a else A, b)
+                for repetition in range(repeat):
+                    x, factor_time, solve_time = solve_system(A.copy() if overwrite_a else A, b)
+                    solve_times.setdefault((matrix_size, threads), []).append(factor_time + solve_time)
+    return solve_times
+
+# Function: sweep_solve_times_with_environment(sizes, thread_counts)
+# Purpose: Time the solves when threadpoolctl is not installed.  BLAS reads its
+# thread count when numpy is imported, so each thread count runs this script
+# in batch mode in a child process with OMP_NUM_THREADS, OPENBLAS_NUM_THREADS,
+# MKL_NUM_THREADS, BLIS_NUM_THREADS, and VECLIB_MAXIMUM_THREADS set.
+# Returns {(matrix_size, threads): [solve_time, ...]}.
+
+def sweep_solve_times_with_environment(sizes, thread_counts):
+    import subprocess
+    solve_times = {}
+    for threads in thread_counts:
+        child_jobid = cluster_jobid + '.threads' + str(threads)
+        child_env = dict(os.environ)
+        for variable in [ 'OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS', 'BLIS_NUM_THREADS', 'VECLIB_MAXIMUM_THREADS' ]:
+            child_env[variable] = str(threads)
+        subprocess.run([ sys.executable, os.path.abspath(__file__), '--jobid', child_jobid, '--matrix-sizes', ','.join(str(N) for N in sizes), '--warmup', str(warmup), '--repeat', str(repeat), '--console-dump', 'no', '--create-csv', 'yes', '--create-logs', 'no', '--solver', solver, '--dtype', dtype, '--rhs', str(rhs), '--check-finite', args.check_finite, '--overwrite-a', args.overwrite_a ], env=child_env, check=True)
+        with open(child_jobid + '.batch.csv') as f:
+            next(f)
+            for line in f:
+                fields = line.strip().split(',')
+                solve_times.setdefault((int(fields[2]), threads), []).append(float(fields[6]))
+        os.remove(child_jobid + '.batch.csv')
+    return solve_times
+
+# Sweep mode (--thread-sweep) solves each matrix size (--matrix-size or
+# --matrix-sizes) with the BLAS/OpenMP thread count pinned to each value in the
+# sweep, using threadpoolctl when it is installed and environment variables in
+# child processes otherwise.  For each (size, thread count) it reports the
+# best and mean solve times over --repeat solves, GFLOP/s from the best time
+# using the (2/3)n^3 flop count of the LU factorization, and the speedup and
+# parallel efficiency relative to the smallest thread count.  The results are
+# written to JOBID.sweep.csv to build a strong-scaling curve per instance type.
+
+if thread_sweep:
+    sizes = matrix_sizes if args.matrix_sizes else [ matrix_size ]
+    thread_counts = sweep_thread_counts(thread_sweep)
+    try:
+        import threadpoolctl
+        thread_control = 'threadpoolctl'
+        solve_times = sweep_solve_times_in_process(sizes, thread_counts)
+    except ImportError:
+        thread_control = 'environment'
+        solve_times = sweep_solve_times_with_environment(sizes, thread_counts)
+    sweep_header = "execute_node,cluster_jobid,matrix_size,threads,best_solve_time,mean_solve_time,gflops,speedup,efficiency,thread_control,solver,dtype,rhs,note"
+    if (create_csv) == "yes":
+        sweep_csv = open(cluster_jobid + ".sweep.csv", "w")
+        print(sweep_header, file=sweep_csv)
+    print("--------------------------------------------------------------------------------")
+    print("matrix_size  threads  best (sec)   mean (sec)    GFLOP/s   speedup  efficiency")
+    for matrix_size in sizes:
+        base_threads = thread_counts[0]
+        base_time = min(solve_times[(matrix_size, base_threads)])
+        for threads in thread_counts:
+            best_time = min(solve_times[(matrix_size, threads)])
+            mean_time = sum(solve_times[(matrix_size, threads)]) / len(solve_times[(matrix_size, threads)])
+            gflops = (2.0 / 3.0) * matrix_size**3 / best_time / 1e9 if best_time > 0 else 0.0
+            speedup = base_time / best_time if best_time > 0 else 0.0
+            efficiency = speedup * base_threads / threads
+            print("%11d  %7d  %10.4f  %11.4f  %9.2f  %8.2f  %10.2f" % (matrix_size, threads, best_time, mean_time, gflops, speedup, efficiency))
+            if (create_csv) == "yes":
+                print("%s,%s,%d,%d,%.4f,%.4f,%.2f,%.4f,%.4f,%s,%s,%s,%d,%s" % (exec_node, cluster_jobid, matrix_size, threads, best_time, mean_time, gflops, speedup, efficiency, thread_control, solver, dtype, rhs, note), file=sweep_csv)
+    print("--------------------------------------------------------------------------------")
+    print("thread control = %s, vCPUs = %d" % (thread_control, available_cpus()))
+    if (create_csv) == "yes":
+        sweep_csv.close()
+        print("Finished creating the CSV data file  ==>  %s" % (cwd + '/' + cluster_jobid + ".sweep.csv"))
+    sys.exit(0)
+
+# Batch mode (--matrix-sizes) solves every matrix size in this process so the
+# interpreter start and the numpy/scipy imports are only paid once.  For each
+# size, run the untimed warm-up solves and then the timed repetitions, keeping
+# the generation time, solve time, and process startup time in separate
+# columns.  One CSV row is written per (size, repetition) to JOBID.batch.csv.
+# Matrices are not dumped to the console or log files in batch mode.
+#
+# ru_maxrss is a process-wide high-water mark, so each size runs in a forked
+# child.  peak_rss_mb is then that size's own peak rather than the peak of the
+# largest size solved so far.  The child inherits the imported modules, so
+# the startup cost is still paid once.
+
+if args.matrix_sizes:
+    startup_time = round(imports_done_time - process_start_time(), 4)
+    batch_header = "execute_node,cluster_jobid,matrix_size,repetition,startup_time,generation_time,solve_time,factor_time,peak_rss_mb,solver,dtype,rhs,note"
+    if (create_csv) == "yes":
+        batch_csv = open(cluster_jobid + ".batch.csv", "w")
+        print(batch_header, file=batch_csv)
+    if (console_dump) == "yes":
+        print(batch_header)
+    for matrix_size in matrix_sizes:
+        if (create_csv) == "yes":
+            batch_csv.flush()
+        sys.stdout.flush()
+        pid = os.fork()
+        if pid == 0:
+            child_status = 1
+            try:
+                for i in range(warmup):
+                    sigma_A, sigma_b, A, b = generate_random_system(matrix_size)
+                    solve_system(A, b)
+                for repetition in range(1, repeat + 1):
+                    t0 = time.perf_counter()
+                    sigma_A, sigma_b, A, b = generate_random_system(matrix_size)
+                    t1 = time.perf_counter()
+                    x, factor_time, solve_time = solve_system(A, b)
+                    batch_row = "%s,%s,%d,%d,%.4f,%.4f,%.4f,%.4f,%.1f,%s,%s,%d,%s" % (exec_node, cluster_jobid, matrix_size, repetition, startup_time, t1 - t0, factor_time + solve_time, factor_time, peak_rss_mb(), solver, dtype, rhs, note)
+                    if (create_csv) == "yes":
+                        print(batch_row, file=batch_csv)
+                        batch_csv.flush()
+                    if (console_dump) == "yes":
+                        print(batch_row)
+                child_status = 0
+            except BaseException:
+                import traceback
+                traceback.print_exc()
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(child_status)
+        if os.waitpid(pid, 0)[1] != 0:
+            print("*** ERROR ***")
+            print("Batch solve of matrix size %d failed" % matrix_size)
+            print("Aborting...")
+            sys.exit(1)
+    if (create_csv) == "yes":
+        batch_csv.close()
+        if (console_dump) == "yes":
+            print("Finished creating the CSV data file  ==>  %s" % (cwd + '/' + cluster_jobid + ".batch.csv"))
+    sys.exit(0)
+
 # Configure Numpy to print all matrices without using scientific notation and
 # limit each element to 4 decimal points.
-# Set the origin (mu) to zero.
 # Generate A, b, and their standard deviations from the normal distribution.
 # Solve Ax=b using the Scipy linear algebra routines.
+# A is still needed after the solve when it is dumped, so --overwrite-a only
+# applies when console_dump and create_logs are both disabled.
 
 np.set_printoptions(threshold=np.inf,suppress=True,precision=4,formatter={'float': '{: 0.4f}'.format})
-mu = 0
-sigma_A = np.random.uniform(0, math.sqrt(10), 1)
-sigma_b = np.random.uniform(0, math.sqrt(10), 1)
-A = np.random.normal(mu, sigma_A, (matrix_size,matrix_size))
-b = np.random.normal(mu, sigma_b, matrix_size)
-x = solve(A, b)
+if overwrite_a and ((console_dump) == "yes" or (create_logs) == "yes"):
+    print("*** WARNING *** Ignoring --overwrite-a because A is dumped to the console or logs")
+    overwrite_a = False
+sigma_A, sigma_b, A, b = generate_random_system(matrix_size)
+x, factor_time, solve_time = solve_system(A, b)
 
 # Print A, b, x, and all sigma values to stdout if console_dump is enabled.
 
@@ -126,36 +405,61 @@ if (console_dump) == "yes":
 
 # Dump A, b, x, all sigma values, and a summary report containing timing data
 # to a text file (JOBID.log) if create_logs is enabled.
+#
+# With --log-format npy or npz, A, b, and x are saved in numpy's binary format
+# instead of being printed as text, and JOBID.log only holds a short header
+# with the sigma values and the job summary:
+#	npy	JOBID.A.npy, JOBID.b.npy, and JOBID.x.npy, which can be opened
+#		with numpy.load(path, mmap_mode='r') without reading them in full
+#	npz	JOBID.npz, compressed as it is written with numpy.savez_compressed
+# The text form can be rendered from these files later when it is needed.
 
 if (create_logs) == "yes":
-    print("", file=open(cluster_jobid + ".log", "w"))
-    print("                             --------------", file=open(cluster_jobid + ".log", "a"))
-    print("                             -  Matrix A  -", file=open(cluster_jobid + ".log", "a"))
-    print("                             --------------", file=open(cluster_jobid + ".log", "a"))
-    print("", file=open(cluster_jobid + ".log", "a"))
-    print(A, file=open(cluster_jobid + ".log", "a"))
-    print("", file=open(cluster_jobid + ".log", "a"))
-    print("Sigma value for matrix A =", format(*sigma_A,'.4f'), file=open(cluster_jobid + ".log", "a"))
-    print("", file=open(cluster_jobid + ".log", "a"))
-    print("                             --------------", file=open(cluster_jobid + ".log", "a"))
-    print("                             -  Matrix b  -", file=open(cluster_jobid + ".log", "a"))
-    print("                             --------------", file=open(cluster_jobid + ".log", "a"))
-    print("", file=open(cluster_jobid + ".log", "a"))
-    print(b, file=open(cluster_jobid + ".log", "a"))
-    print("", file=open(cluster_jobid + ".log", "a"))
-    print("Sigma value for matrix b =", format(*sigma_b,'.4f'), file=open(cluster_jobid + ".log", "a"))
-    print("", file=open(cluster_jobid + ".log", "a"))
-    print("                          -----------------------", file=open(cluster_jobid + ".log", "a"))
-    print("                          -  Solution matrix x  -", file=open(cluster_jobid + ".log", "a"))
-    print("                          -----------------------", file=open(cluster_jobid + ".log", "a"))
-    print("", file=open(cluster_jobid + ".log", "a"))
-    print(x, file=open(cluster_jobid + ".log", "a"))
-    print("", file=open(cluster_jobid + ".log", "a"))
+    with open(cluster_jobid + ".log", "w") as log_file:
+        if (log_format) == "text":
+            print("", file=log_file)
+            print("                             --------------", file=log_file)
+            print("                             -  Matrix A  -", file=log_file)
+            print("                             --------------", file=log_file)
+            print("", file=log_file)
+            print(A, file=log_file)
+            print("", file=log_file)
+            print("Sigma value for matrix A =", format(*sigma_A,'.4f'), file=log_file)
+            print("", file=log_file)
+            print("                             --------------", file=log_file)
+            print("                             -  Matrix b  -", file=log_file)
+            print("                             --------------", file=log_file)
+            print("", file=log_file)
+            print(b, file=log_file)
+            print("", file=log_file)
+            print("Sigma value for matrix b =", format(*sigma_b,'.4f'), file=log_file)
+            print("", file=log_file)
+            print("                          -----------------------", file=log_file)
+            print("                          -  Solution matrix x  -", file=log_file)
+            print("                          -----------------------", file=log_file)
+            print("", file=log_file)
+            print(x, file=log_file)
+            print("", file=log_file)
+        else:
+            if (log_format) == "npy":
+                matrix_files = [ cluster_jobid + ".A.npy", cluster_jobid + ".b.npy", cluster_jobid + ".x.npy" ]
+                for matrix_file, matrix in zip(matrix_files, [ A, b, x ]):
+                    np.save(matrix_file, matrix)
+            else:
+                matrix_files = [ cluster_jobid + ".npz" ]
+                np.savez_compressed(matrix_files[0], A=A, b=b, x=x, sigma_A=sigma_A, sigma_b=sigma_b)
+            print("", file=log_file)
+            print("Sigma value for matrix A =", format(*sigma_A,'.4f'), file=log_file)
+            print("Sigma value for matrix b =", format(*sigma_b,'.4f'), file=log_file)
+            for matrix_file in matrix_files:
+                print("Matrix Data File =  %s  " % str(cwd + '/' + matrix_file), file=log_file)
+            print("", file=log_file)
 
 # Stop the job timer.
 
 end_time=time.time()
 elapsed_time=round(end_time-start_time,4)
+peak_rss=peak_rss_mb()
 
 # Print the job summary to the console if console_dump is enabled.
 
@@ -172,37 +476,46 @@ if (console_dump == "yes"):
     if (create_csv) == "yes":
         print("  Data File Path   =  %s  " % str(cwd + '/' + cluster_jobid + ".csv"))
     print("  Matrix Size      =  %s x %s  " % (str(matrix_size), str(matrix_size)))
+    print("  Solver           =  %s, %s, %d right-hand side(s)  " % (solver, dtype, rhs))
     print("--------------------------------------------------------------------------")
     print("  Start Time       =  %s " % time.strftime("%a, %d %b %Y @ %H:%M:%S", time.localtime(start_time)))
     print("  End Time         =  %s " % time.strftime("%a, %d %b %Y @ %H:%M:%S", time.localtime(end_time)))
     print("  Time Elapsed     =  %.4f seconds  " % elapsed_time)
+    print("  Factor Time      =  %.4f seconds  " % factor_time)
+    print("  Solve Time       =  %.4f seconds  " % solve_time)
+    print("  Peak RSS         =  %.1f MB  " % peak_rss)
     print("--------------------------------------------------------------------------")
 
 # If a logfile was requested, include the path and append the job summary.
 
 if (create_logs) == "yes":
-    print("--------------------------------------------------------------------------", file=open(cluster_jobid + ".log", "a"))
-    print("                                Job Summary", file=open(cluster_jobid + ".log", "a"))
-    print("--------------------------------------------------------------------------", file=open(cluster_jobid + ".log", "a"))
-    print("  Execute Node     =  %s " % (str(exec_node)), file=open(cluster_jobid + ".log", "a"))
-    print("  Description      =  %s " % (str(note)), file=open(cluster_jobid + ".log", "a"))
-    if len(cluster_jobid) != 0:
-        print("  Cluster JobID    =  %s  " % str(cluster_jobid), file=open(cluster_jobid + ".log", "a"))
-    print("  Logfile Path     =  %s  " % str(cwd + '/' + cluster_jobid + ".log"), file=open(cluster_jobid + ".log", "a"))
-    if (create_csv) == "yes":
-        print("  Data File Path   =  %s  " % str(cwd + '/' + cluster_jobid + ".csv"), file=open(cluster_jobid + ".log", "a"))
-    print("  Matrix Size      =  %s x %s  " % (str(matrix_size), str(matrix_size)), file=open(cluster_jobid + ".log", "a"))
-    print("--------------------------------------------------------------------------", file=open(cluster_jobid + ".log", "a"))
-    print("  Start Time       =  %s " % time.strftime("%a, %d %b %Y @ %H:%M:%S", time.localtime(start_time)), file=open(cluster_jobid + ".log", "a"))
-    print("  End Time         =  %s " % time.strftime("%a, %d %b %Y @ %H:%M:%S", time.localtime(end_time)), file=open(cluster_jobid + ".log", "a"))
-    print("  Time Elapsed     =  %.4f seconds  " % elapsed_time, file=open(cluster_jobid + ".log", "a"))
-    print("--------------------------------------------------------------------------", file=open(cluster_jobid + ".log", "a"))
-    print("", file=open(cluster_jobid + ".log", "a"))
+    with open(cluster_jobid + ".log", "a") as log_file:
+        print("--------------------------------------------------------------------------", file=log_file)
+        print("                                Job Summary", file=log_file)
+        print("--------------------------------------------------------------------------", file=log_file)
+        print("  Execute Node     =  %s " % (str(exec_node)), file=log_file)
+        print("  Description      =  %s " % (str(note)), file=log_file)
+        if len(cluster_jobid) != 0:
+            print("  Cluster JobID    =  %s  " % str(cluster_jobid), file=log_file)
+        print("  Logfile Path     =  %s  " % str(cwd + '/' + cluster_jobid + ".log"), file=log_file)
+        if (create_csv) == "yes":
+            print("  Data File Path   =  %s  " % str(cwd + '/' + cluster_jobid + ".csv"), file=log_file)
+        print("  Matrix Size      =  %s x %s  " % (str(matrix_size), str(matrix_size)), file=log_file)
+        print("  Solver           =  %s, %s, %d right-hand side(s)  " % (solver, dtype, rhs), file=log_file)
+        print("--------------------------------------------------------------------------", file=log_file)
+        print("  Start Time       =  %s " % time.strftime("%a, %d %b %Y @ %H:%M:%S", time.localtime(start_time)), file=log_file)
+        print("  End Time         =  %s " % time.strftime("%a, %d %b %Y @ %H:%M:%S", time.localtime(end_time)), file=log_file)
+        print("  Time Elapsed     =  %.4f seconds  " % elapsed_time, file=log_file)
+        print("  Factor Time      =  %.4f seconds  " % factor_time, file=log_file)
+        print("  Solve Time       =  %.4f seconds  " % solve_time, file=log_file)
+        print("  Peak RSS         =  %.1f MB  " % peak_rss, file=log_file)
+        print("--------------------------------------------------------------------------", file=log_file)
+        print("", file=log_file)
     if (console_dump) == "yes":
         print("")
         print("Finished creating the log file.")
     if (create_csv) == "yes":
-        print(exec_node, ',', cluster_jobid, ',', matrix_size, ',', elapsed_time, ',', note, sep='', file=open(cluster_jobid + ".csv", "w"))
+        print(exec_node, ',', cluster_jobid, ',', matrix_size, ',', elapsed_time, ',', '%.1f' % peak_rss, ',', note, sep='', file=open(cluster_jobid + ".csv", "w"))
     if (console_dump) == "yes":
         print("Finished creating the CSV data file.")
 
@@ -220,12 +533,16 @@ if (console_dump) == "no" and (create_logs) == "no" and (create_csv) == "yes":
         print("  Cluster JobID    =  %s  " % str(cluster_jobid))
     print("  Data File Path   =  %s  " % str(cwd + '/' + cluster_jobid + ".csv"))
     print("  Matrix Size      =  %s x %s  " % (str(matrix_size), str(matrix_size)))
+    print("  Solver           =  %s, %s, %d right-hand side(s)  " % (solver, dtype, rhs))
     print("--------------------------------------------------------------------------")
     print("  Start Time       =  %s " % time.strftime("%a, %d %b %Y @ %H:%M:%S", time.localtime(start_time)))
     print("  End Time         =  %s " % time.strftime("%a, %d %b %Y @ %H:%M:%S", time.localtime(end_time)))
     print("  Time Elapsed     =  %.4f seconds  " % elapsed_time)
+    print("  Factor Time      =  %.4f seconds  " % factor_time)
+    print("  Solve Time       =  %.4f seconds  " % solve_time)
+    print("  Peak RSS         =  %.1f MB  " % peak_rss)
     print("--------------------------------------------------------------------------")
-    print(exec_node, ',', cluster_jobid, ',', matrix_size, ',', elapsed_time, ',', note, sep='', file=open(cluster_jobid + ".csv", "w"))
+    print(exec_node, ',', cluster_jobid, ',', matrix_size, ',', elapsed_time, ',', '%.1f' % peak_rss, ',', note, sep='', file=open(cluster_jobid + ".csv", "w"))
 
 # Cleanup and exit.
 
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+#
+################################################################################
+# Name:		bang.py
+# Author:	Rodney Marable <rodney.marable@gmail.com>
+# Created On:	October 17, 2026
+# Last Changed:	October 17, 2026
+# Purpose:	Benchmark driver that runs Axb_random.py for every matrix size,
+#		compresses the logs, and writes the summary CSV files
+################################################################################
+#
+# Usage:
+# $ bang.py [-h] --jobid JOBID [--cluster-name CLUSTER_NAME]
+#           [--matrix-sizes MATRIX_SIZES] [--timeout TIMEOUT]
+#           [--compression_type COMPRESSION_TYPE]
+#           [--compression_processes COMPRESSION_PROCESSES]
+#           [--console-dump CONSOLE_DUMP] [--create-logs CREATE_LOGS]
+#           [--log-format LOG_FORMAT] [--python PYTHON]
+#           [--results-db RESULTS_DB]
+#
+# Examples:
+# $ ./bang.py --jobid 1 --cluster-name rmarable-dev01
+# $ ./bang.py --jobid 2 --cluster-name t2-xlarge --matrix-sizes 1000,2000 --timeout 600
+#
+# bang.py replaces the bang.sh loop of Axb_random.py, compress_logfiles.py,
+# paste, cat, mv, and csv_summary_time_measurement.sh with one process that
+# writes the same files:
+#	csv/summary_raw/summary.CLUSTER_NAME.JOBID.csv	(raw job summary)
+#	csv/JOBID.CLUSTER_NAME.N.csv			(one row per matrix size)
+#	summary/summary.CLUSTER_NAME.JOBID.csv		(sorted job summary)
+# With --results-db, the raw job summary is also added to the SQLite results
+# store (see ingest_results.py) when the job finishes.
+# Only the compute phase runs Axb_random.py in a separate process so it can be
+# timed out and each matrix size starts with fresh memory.  Start and end
+# times for every phase are saved to csv/JOBID.CLUSTER_NAME.phases.csv.
+################################################################################
+
+# Start the job timer.
+
+import time
+start_time=time.time()
+
+# Import the rest of the required Python libraries.
+
+import argparse
+import contextlib
+import glob
+import os
+import subprocess
+import sys
+
+# Import the shared hpc_performance threaded gzip compressor.
+
+from parallel_gzip import archive_logfiles
+from parallel_gzip import compression_report
+
+# Import the shared hpc_performance results store.
+
+from results_store import ingest_summary_file
+from results_store import open_results_store
+
+# Function: read_matrix_sizes()
+# Purpose: Read MATRIX_SIZES from the MATRIX_SIZES.conf shell fragment that is
+# also sourced by bang.sh and the plotting scripts.
+
+def read_matrix_sizes(conf_file):
+    with open(conf_file) as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith('MATRIX_SIZES='):
+                return line.split('=', 1)[1].strip('"\'').split()
+    return []
+
+# Function: timestamp()
+# Purpose: Format an epoch time for the console and the phase CSV file.
+
+def timestamp(t):
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(t))
+
+# Function: record_phase()
+# Purpose: Append one phase row (matrix_size, phase, start, end, elapsed,
+# status) to the open phase CSV writer and echo it to the console.
+
+def record_phase(matrix_size, phase, phase_start, phase_end, status):
+    phase_elapsed = round(phase_end-phase_start,4)
+    print(matrix_size, phase, timestamp(phase_start), timestamp(phase_end), phase_elapsed, status, sep=',', file=phase_log)
+    phase_log.flush()
+    print("+ %s phase for N=%s: %s (%.4f seconds)" % (phase, matrix_size, status, phase_elapsed))
+
+# Function: remove_job_files()
+# Purpose: Delete the partial output left behind by an Axb_random.py run that
+# failed or timed out so it can't leak into the next matrix size.
+
+def remove_job_files(cluster_jobid):
+    for job_file in [ cluster_jobid + '.csv', cluster_jobid + '.log', cluster_jobid + '.npz' ] + glob.glob(cluster_jobid + '.*.npy'):
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(job_file)
+
+# Parse the command line.
+
+parser = argparse.ArgumentParser(description='Run Axb_random.py for every matrix size, compress the logs, and write the summary CSV files')
+parser.add_argument('--jobid', '-J', help='name of the job - passed to Axb_random.py and used in all output file names', required=True)
+parser.add_argument('--cluster-name', '-N', help='name of the cluster stack or standalone instance being tested - periods are replaced with dashes (default = none)', required=False, default='')
+parser.add_argument('--matrix-sizes', '-S', help='comma-separated list of matrix sizes to solve (default = MATRIX_SIZES from MATRIX_SIZES.conf)', required=False)
+parser.add_argument('--matrix-sizes-conf', help='path to MATRIX_SIZES.conf (default = ./MATRIX_SIZES.conf)', required=False, default='./MATRIX_SIZES.conf')
+parser.add_argument('--timeout', '-T', help='seconds to allow each Axb_random.py run before it is killed and the matrix size is skipped (default = no timeout)', required=False, type=float)
+parser.add_argument('--compression_type', '-C', help='set the file compression type to gzip (threaded, in-process) or pigz (alias for gzip)', required=False, default='gzip', choices=['gzip', 'pigz'])
+parser.add_argument('--compression_processes', '-P', help='set the number of CPUs to use for compression', required=False, type=int, default=8)
+parser.add_argument('--console-dump', '-D', help='print A, b, x, and all sigma values to stdout (default = no)', required=False, default='no', choices=['yes', 'no'])
+parser.add_argument('--create-logs', '-L', help='print console_dump output to a text file (default = yes)', required=False, default='yes', choices=['yes', 'no'])
+parser.add_argument('--log-format', '-F', help='format of the Axb_random.py matrix logs: text, npy, or npz (default = text)', required=False, default='text', choices=['text', 'npy', 'npz'])
+parser.add_argument('--python', help='Python interpreter used to run Axb_random.py (default = this interpreter)', required=False, default=sys.executable)
+parser.add_argument('--results-db', '-R', help='add the job summary to this SQLite results store (default = none)', required=False)
+
+args = parser.parse_args()
+cluster_jobid = args.jobid
+cluster_name = args.cluster_name.replace('.', '-')
+if args.matrix_sizes:
+    matrix_sizes = [ matrix_size.strip() for matrix_size in args.matrix_sizes.split(',') if matrix_size.strip() ]
+else:
+    matrix_sizes = read_matrix_sizes(args.matrix_sizes_conf)
+timeout = args.timeout
+compression_type = args.compression_type
+compression_processes = args.compression_processes
+console_dump = args.console_dump
+create_logs = args.create_logs
+log_format = args.log_format
+python3 = args.python
+results_db = args.results_db
+
+if not matrix_sizes:
+    print("*** ERROR *** No matrix sizes were found in", args.matrix_sizes_conf)
+    print("Aborting...")
+    sys.exit(1)
+
+# Set paths for the log, CSV, and job summary data files.
+# Create the directories if they are missing.
+
+log_dir = 'logs'
+raw_csv_dir = 'csv'
+raw_summary_dir = 'csv/summary_raw'
+summary_data_dir = 'summary'
+for directory in [ log_dir, raw_csv_dir, raw_summary_dir, summary_data_dir ]:
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+raw_summary_file = raw_summary_dir + '/summary.' + cluster_name + '.' + cluster_jobid + '.csv'
+summary_data_file = summary_data_dir + '/summary.' + cluster_name + '.' + cluster_jobid + '.csv'
+phase_log_file = raw_csv_dir + '/' + cluster_jobid + '.' + cluster_name + '.phases.csv'
+
+# Open the raw summary and phase CSV files once and keep them open while the
+# matrix sizes are processed.  Axb_random.py writes the peak RSS after the
+# elapsed time in JOBID.csv; it is moved to the end of the raw summary row so
+# the columns read by the sorted summary and the results store keep their
+# positions.
+
+raw_summary = open(raw_summary_file, 'w')
+print("execute_node,cluster_jobid,matrix_size,time_elapsed_sec,cluster_name,raw_log_size_bytes,gzip_log_size_bytes,fileproc_time,peak_rss_mb", file=raw_summary)
+phase_log = open(phase_log_file, 'w')
+print("matrix_size,phase,start_time,end_time,elapsed_sec,status", file=phase_log)
+
+# For each matrix size:
+#	compute		run Axb_random.py (killed after --timeout seconds)
+#	fileproc	compress the log and move it to logs/
+#	summary		append the combined row to the raw summary and write
+#			csv/JOBID.CLUSTER_NAME.N.csv
+# Rows that reach the summary phase are kept for the sorted summary file.
+
+axb_command = [ python3, 'Axb_random.py', '--jobid', cluster_jobid, '--console-dump', console_dump, '--create-csv', 'yes', '--create-logs', create_logs, '--log-format', log_format ]
+if cluster_name:
+    axb_command += [ '--note', cluster_name ]
+summary_rows = []
+
+print("")
+for matrix_size in matrix_sizes:
+    phase_start = time.time()
+    try:
+        result = subprocess.run(axb_command + [ '--matrix-size', matrix_size ], timeout=timeout)
+        status = 'ok' if result.returncode == 0 else 'exit_' + str(result.returncode)
+    except subprocess.TimeoutExpired:
+        status = 'timeout'
+    record_phase(matrix_size, 'compute', phase_start, time.time(), status)
+    if status != 'ok' or not os.path.isfile(cluster_jobid + '.csv'):
+        print("*** WARNING *** Skipping N=%s after the compute phase ended with status %s" % (matrix_size, status))
+        remove_job_files(cluster_jobid)
+        continue
+    with open(cluster_jobid + '.csv') as f:
+        compute_fields = f.read().strip().split(',')
+    os.remove(cluster_jobid + '.csv')
+    peak_rss = compute_fields.pop(4)
+    compute_row = ','.join(compute_fields)
+
+    phase_start = time.time()
+    if os.path.isfile(cluster_jobid + '.log'):
+        print("+ Initiated log file compression with", compression_type, "on %s " % time.strftime("%a %d %b %Y @ %H:%M:%S", time.localtime(phase_start)))
+        raw_log_size_bytes, compressed_log_size_bytes, raw_bytes, compressed_bytes, compression_time = archive_logfiles(cluster_jobid, matrix_size, log_dir, compression_processes)
+        print("+ Log file compression:", compression_report(raw_bytes, compressed_bytes, compression_time))
+    else:
+        raw_log_size_bytes, compressed_log_size_bytes = 0, 0
+    phase_end = time.time()
+    record_phase(matrix_size, 'fileproc', phase_start, phase_end, 'ok')
+    elapsed_fileproc_time = round(phase_end-phase_start,4)
+
+    phase_start = time.time()
+    summary_row = compute_row + ',' + str(raw_log_size_bytes) + ',' + str(compressed_log_size_bytes) + ',' + str(elapsed_fileproc_time) + ',' + peak_rss
+    print(summary_row, file=raw_summary)
+    raw_summary.flush()
+    with open(raw_csv_dir + '/' + cluster_jobid + '.' + cluster_name + '.' + matrix_size + '.csv', 'w') as f:
+        print(summary_row, file=f)
+    summary_rows.append(summary_row.split(','))
+    print("+ Printing CSV data file to stdout:")
+    print(summary_row)
+    print("--------------------------------------------------------------------------------")
+    print("")
+    record_phase(matrix_size, 'summary', phase_start, time.time(), 'ok')
+
+raw_summary.close()
+
+# Generate the summary CSV file the way csv_summary_time_measurement.sh does
+# for standalone jobs: drop execute_node and sort by job and matrix size.
+
+summary_rows.sort(key=lambda row: (row[1], int(row[2])))
+with open(summary_data_file, 'w') as f:
+    print("cluster_jobID,matrix_size,compute_time,cluster_name,raw_log_size_bytes,gzip_log_size_bytes,fileproc_time", file=f)
+    for row in summary_rows:
+        print(','.join(row[1:8]), file=f)
+print("Saved  ==>  %s/%s" % (os.getcwd(), summary_data_file))
+print("")
+
+# Add the raw job summary to the results store.
+
+if results_db:
+    conn = open_results_store(results_db)
+    print("Added %d data points to the results store  ==>  %s" % (ingest_summary_file(conn, raw_summary_file), results_db))
+    print("")
+    conn.close()
+
+# Record the total driver time as the last phase row.
+
+record_phase('all', 'total', start_time, time.time(), 'ok')
+phase_log.close()
+
+# Cleanup and exit.
+
+sys.exit(0)
@@ -4,7 +4,7 @@
 # Name:		bang.sh
 # Author:	Rodney Marable <rodney.marable@gmail.com>
 # Created On:	January 12, 2018
-# Last Changed: April 28, 2019
+# Last Changed: October 17, 2026
 # Purpose:	Wrapper script for running bang.sh and Axb_random.py
 # Notes:	This is *NOT* the cluster-friendly version!
 ################################################################################
@@ -114,15 +114,10 @@ then
 fi
 
 # Set the compression_type.
-# Supported options are pigz and gzip.
-# Default to gzip if pigz isn't found.
+# bang.py compresses the log files in-process with a threaded gzip compressor,
+# so pigz is no longer required.
 
-if test -e /usr/bin/pigz || test -e /usr/local/bin/pigz
-then
-	compression_type=pigz
-else
-	compression_type=gzip
-fi
+compression_type=gzip
 
 # Modify the log and data file arguments.
 # These settings should *NEVER* be changed.
@@ -138,7 +133,6 @@ fi
 # should never change this value.
 
 CONSOLE_DUMP=no
-CREATE_CSV=yes
 CREATE_LOGS=yes
 
 # Replace periods with dashes in CLUSTER_NAME to prevent issues with the
@@ -146,63 +140,19 @@ CREATE_LOGS=yes
 
 CLUSTER_NAME=`echo $CLUSTER_NAME | tr '.' '-'`
 
-# Set paths for the Axb_random log, Axb_random CSV, and job summary data
-# files.  Create the directories if they are missing.
-
-LOG_DIR="./logs"
-RAW_CSV_DIR="./csv"
-RAW_SUMMARY_DIR="./csv/summary_raw"
-for dir in $LOG_DIR $RAW_CSV_DIR $RAW_SUMMARY_DIR
-do
-	if [ ! -d $dir ]
-	then
-		mkdir -p $dir
-	fi
-done
-
-# Create the CSV file header.
+# Set TIMEOUT to the number of seconds that Axb_random.py may run for each
+# matrix size before it is killed and that size is skipped.  Leave it empty
+# to disable the timeout.
 
-echo "execute_node,cluster_jobid,matrix_size,time_elapsed_sec,cluster_name" > $RAW_SUMMARY_DIR/summary.$CLUSTER_NAME.$JOBID.csv
+TIMEOUT=
 
-# Invoke Axb_random.py with the arguments provided to bang.sh.
+# Invoke bang.py to solve Ax=b with Axb_random.py for each matrix size,
+# compress the log files, and write the CSV data and summary files in one
+# process.  Start and end times for each phase are saved to
+# csv/$JOBID.$CLUSTER_NAME.phases.csv.
 
 echo ""
-for N in $MATRIX_SIZES
-do
-	if [[ -z $CLUSTER_NAME ]]
-	then
-		$PYTHON3 Axb_random.py --jobid $JOBID --matrix-size $N --console-dump $CONSOLE_DUMP --create-csv $CREATE_CSV --create-logs $CREATE_LOGS
-	else
-		$PYTHON3 Axb_random.py --jobid $JOBID --matrix-size $N --console-dump $CONSOLE_DUMP --create-csv $CREATE_CSV --create-logs $CREATE_LOGS --note "$CLUSTER_NAME"
-	fi
-	case $compression_type in
-	pigz)
-		$PYTHON3 compress_logfiles.py --jobid $JOBID --matrix-size $N --compression_type pigz
-		;;
-	gzip)
-		$PYTHON3 compress_logfiles.py --jobid $JOBID --matrix-size $N --compression_type gzip
-		;;
-	*)
-		"Invalid compression type selected, defaulting to gzip."
-		compression_type=gzip
-		;;
-	esac
-	if [ -f $JOBID.csv ]
-	then
-		paste -d, $JOBID.csv $JOBID.time.csv > $JOBID.csv.scratch
-		rm $JOBID.csv $JOBID.time.csv
-		cat $JOBID.csv.scratch >> $RAW_SUMMARY_DIR/summary.$CLUSTER_NAME.$JOBID.csv
-		echo "+ Printing CSV data file to stdout:"
-		cat $JOBID.csv.scratch
-		echo "--------------------------------------------------------------------------------"
-		echo ""
-		mv $JOBID.csv.scratch $RAW_CSV_DIR/$JOBID.$CLUSTER_NAME.$N.csv
-	fi
-done
-
-# Generate the summary CSV files.
-
-sh csv_summary_time_measurement.sh $CLUSTER_NAME $JOBID
+$PYTHON3 bang.py --jobid $JOBID --cluster-name "$CLUSTER_NAME" --matrix-sizes `echo $MATRIX_SIZES | tr ' ' ','` --console-dump $CONSOLE_DUMP --create-logs $CREATE_LOGS --compression_type $compression_type ${TIMEOUT:+--timeout $TIMEOUT}
 
 echo "================================================================================"
 echo "  Please run this script to create summary CSV files for $CLUSTER_NAME:"
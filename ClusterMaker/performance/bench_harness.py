@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+#
+################################################################################
+# Name:		bench_harness.py
+# Author:	Rodney Marable <rodney.marable@gmail.com>
+# Created On:	October 17, 2026
+# Last Changed:	October 17, 2026
+# Purpose:	Run a benchmark kernel repeatedly, summarize its timings, and
+#		compare them with a stored baseline to detect regressions
+################################################################################
+#
+# Usage:
+# $ bench_harness.py [-h] --kernel {Axb_random,hashtest,fibonacci_hashtest}
+#                    [--kernel-args KERNEL_ARGS] [--warmup WARMUP]
+#                    [--repeat REPEAT] [--instance-type INSTANCE_TYPE]
+#                    [--ami-id AMI_ID] [--base-os BASE_OS]
+#                    [--baseline-store BASELINE_STORE]
+#                    [--save-baseline SAVE_BASELINE] [--compare COMPARE]
+#                    [--compare-instance-type COMPARE_INSTANCE_TYPE]
+#                    [--alpha ALPHA] [--min-effect MIN_EFFECT]
+#                    [--output OUTPUT]
+#
+# Examples:
+# $ ./bench_harness.py --kernel Axb_random --kernel-args "--matrix-sizes 4000" --repeat 15 --save-baseline golden
+# $ ./bench_harness.py --kernel hashtest --repeat 15 --compare golden --output bench.json
+# $ ./bench_harness.py --kernel Axb_random --compare golden --compare-instance-type c5.2xlarge
+#
+# The samples are the timings each kernel reports itself, so the interpreter
+# start and the imports are left out.  Axb_random runs once in batch mode
+# (--matrix-sizes with one size) and does its warm-up and timed solves in that
+# process; each sample is the generation plus solve time of one repetition.
+# hashtest and fibonacci_hashtest run once per sample and report compute_time,
+# and their warm-up runs are discarded.  A baseline and the runs compared with
+# it must use the same kernel arguments.  With --compare, the exit status is 3
+# when a statistically significant regression is found, so the harness can
+# gate an image rollout.
+################################################################################
+
+# Import the required Python libraries.
+
+import argparse
+import csv
+import json
+import os
+import re
+import shlex
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+# Import the shared hpc_performance statistics and baseline store.
+
+from bench_stats import ALPHA
+from bench_stats import BASELINE_STORE
+from bench_stats import MIN_EFFECT
+from bench_stats import compare_samples
+from bench_stats import get_baseline
+from bench_stats import load_baselines
+from bench_stats import save_baselines
+from bench_stats import set_baseline
+from bench_stats import summarize
+
+# Arguments that every run of each kernel gets, and the default arguments that
+# set the problem size.  All kernel output goes to a scratch directory or to
+# /dev/null so only the compute is measured.
+
+KERNEL_FIXED_ARGS = {
+    'Axb_random': [ '--jobid', 'bench_harness', '--console-dump', 'no', '--create-csv', 'yes', '--create-logs', 'no' ],
+    'hashtest': [],
+    'fibonacci_hashtest': [],
+}
+KERNEL_DEFAULT_ARGS = {
+    'Axb_random': '--matrix-sizes 2000',
+    'hashtest': '--count 10000 --compression-type none',
+    'fibonacci_hashtest': '--enable_index --index 10000',
+}
+
+# Line that hashtest and fibonacci_hashtest print with their compute time.
+
+COMPUTE_TIME_PATTERN = re.compile(r'^compute_time\s*=\s*([0-9.]+) seconds', re.MULTILINE)
+
+# Exit status returned when --compare finds a regression.
+
+REGRESSION_EXIT_STATUS = 3
+
+# Parse the command line.
+
+parser = argparse.ArgumentParser(description='Run a benchmark kernel repeatedly, summarize its timings, and compare them with a stored baseline to detect regressions')
+parser.add_argument('--kernel', '-k', help='benchmark kernel to run', required=True, choices=sorted(KERNEL_FIXED_ARGS))
+parser.add_argument('--kernel-args', '-a', help='arguments passed to the kernel, quoted as one string (default depends on the kernel)', required=False)
+parser.add_argument('--warmup', '-w', help='number of untimed runs, or untimed solves for Axb_random, before measuring (default = 1)', required=False, type=int, default=1)
+parser.add_argument('--repeat', '-r', help='number of timed runs (default = 10)', required=False, type=int, default=10)
+parser.add_argument('--instance-type', '-i', help='instance type the baseline is stored under (default = read from the EC2 instance metadata)', required=False)
+parser.add_argument('--ami-id', help='AMI ID recorded with the results (default = read from the EC2 instance metadata)', required=False)
+parser.add_argument('--base-os', help='base OS recorded with the results (default = read from /etc/os-release)', required=False)
+parser.add_argument('--baseline-store', '-b', help='path to the baseline store (default = %s)' % BASELINE_STORE, required=False, default=BASELINE_STORE)
+parser.add_argument('--save-baseline', '-s', help='store the timings as the named baseline for this instance type', required=False)
+parser.add_argument('--compare', '-c', help='compare the timings with the named baseline', required=False)
+parser.add_argument('--compare-instance-type', help='instance type of the baseline to compare with, e.g. when trying a new instance family (default = --instance-type)', required=False)
+parser.add_argument('--alpha', help='significance level of the regression test (default = %s)' % ALPHA, required=False, type=float, default=ALPHA)
+parser.add_argument('--min-effect', help='smallest slowdown of the median, as a fraction, that counts as a regression (default = %s)' % MIN_EFFECT, required=False, type=float, default=MIN_EFFECT)
+parser.add_argument('--output', '-o', help='write the results as JSON to this file, or - for stdout', required=False)
+
+args = parser.parse_args()
+if args.warmup < 0 or args.repeat < 2:
+    parser.error('--warmup must be at least 0 and --repeat at least 2')
+kernel_args = shlex.split(args.kernel_args if args.kernel_args is not None else KERNEL_DEFAULT_ARGS[args.kernel])
+kernel_key = ' '.join([ args.kernel ] + kernel_args)
+kernel_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), args.kernel + '.py')
+command = [ sys.executable, kernel_script ] + KERNEL_FIXED_ARGS[args.kernel] + kernel_args
+
+# Function: instance_metadata(path)
+# Purpose: Return one value from the EC2 instance metadata service, or None
+# when it can't be reached.  IMDSv2 is tried first, then IMDSv1.
+
+def instance_metadata(path):
+    import urllib.error
+    import urllib.request
+    headers = {}
+    try:
+        token_request = urllib.request.Request('http://169.254.169.254/latest/api/token', method='PUT', headers={ 'X-aws-ec2-metadata-token-ttl-seconds': '60' })
+        headers['X-aws-ec2-metadata-token'] = urllib.request.urlopen(token_request, timeout=0.5).read().decode()
+    except (urllib.error.URLError, OSError):
+        pass
+    try:
+        request = urllib.request.Request('http://169.254.169.254/latest/meta-data/' + path, headers=headers)
+        return urllib.request.urlopen(request, timeout=0.5).read().decode()
+    except (urllib.error.URLError, OSError):
+        return None
+
+# Function: detect_base_os()
+# Purpose: Return the base OS in the form used by ClusterMaker (centos7,
+# alinux2, ubuntu1804, ...) from /etc/os-release, or "unknown".
+
+def detect_base_os():
+    os_release = {}
+    try:
+        with open('/etc/os-release') as f:
+            for line in f:
+                if '=' in line:
+                    key, value = line.rstrip('\n').split('=', 1)
+                    os_release[key] = value.strip('"')
+    except OSError:
+        return 'unknown'
+    os_id = { 'amzn': 'alinux' }.get(os_release.get('ID'), os_release.get('ID', 'unknown'))
+    return os_id + os_release.get('VERSION_ID', '').replace('.', '')
+
+# Function: run_kernel(extra_args)
+# Purpose: Run the kernel once in a scratch directory and return the list of
+# timings in seconds that it reported.  Axb_random returns one timing per
+# repetition from its batch CSV file; the other kernels return their
+# compute_time.  Abort if the kernel fails or reports no timing.
+
+def run_kernel(extra_args):
+    with tempfile.TemporaryDirectory(prefix='bench_harness.') as scratch_dir:
+        result = subprocess.run(command + extra_args, cwd=scratch_dir, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        if result.returncode != 0:
+            print("*** ERROR ***")
+            print("%s exited with status %d:" % (args.kernel, result.returncode))
+            print(result.stderr.decode(errors='replace'))
+            print("Aborting...")
+            sys.exit(1)
+        if args.kernel == 'Axb_random':
+            batch_csv_file = os.path.join(scratch_dir, 'bench_harness.batch.csv')
+            rows = []
+            if os.path.isfile(batch_csv_file):
+                with open(batch_csv_file, newline='') as f:
+                    rows = list(csv.DictReader(f))
+            if len(set(row['matrix_size'] for row in rows)) != 1:
+                print("*** ERROR ***")
+                print("Axb_random must be run with --matrix-sizes and exactly one matrix size")
+                print("Aborting...")
+                sys.exit(1)
+            return [ float(row['generation_time']) + float(row['solve_time']) for row in rows ]
+    match = COMPUTE_TIME_PATTERN.search(result.stdout.decode(errors='replace'))
+    if match is None:
+        print("*** ERROR ***")
+        print("%s did not report its compute_time" % args.kernel)
+        print("Aborting...")
+        sys.exit(1)
+    return [ float(match.group(1)) ]
+
+# Collect the metadata recorded with the results.
+
+instance_type = args.instance_type or instance_metadata('instance-type') or 'unknown'
+metadata = {
+    'instance_type': instance_type,
+    'ami_id': args.ami_id or instance_metadata('ami-id') or 'unknown',
+    'base_os': args.base_os or detect_base_os(),
+    'hostname': socket.gethostname(),
+    'python': sys.version.split()[0],
+    'date': time.strftime("%Y-%m-%d %H:%M:%S", time.localtime()),
+    'warmup': args.warmup,
+    'repeat': args.repeat,
+}
+
+# Make sure the baseline to compare with exists before spending time on runs.
+
+store = load_baselines(args.baseline_store)
+compare_instance_type = args.compare_instance_type or instance_type
+if args.compare:
+    baseline = get_baseline(store, compare_instance_type, args.compare, kernel_key)
+    if baseline is None:
+        print("*** ERROR ***")
+        print("No baseline named %s was found for %s on %s in %s" % (args.compare, kernel_key, compare_instance_type, args.baseline_store))
+        print("Aborting...")
+        sys.exit(1)
+
+# Run the kernel.
+
+print("Running: %s" % ' '.join(command), file=sys.stderr)
+samples = []
+if args.kernel == 'Axb_random':
+    samples = run_kernel([ '--warmup', str(args.warmup), '--repeat', str(args.repeat) ])
+    for i, sample in enumerate(samples):
+        print("run    %d/%d: %.4f seconds" % (i + 1, args.repeat, sample), file=sys.stderr)
+else:
+    for i in range(args.warmup):
+        elapsed = run_kernel([])[0]
+        print("warmup %d/%d: %.4f seconds" % (i + 1, args.warmup, elapsed), file=sys.stderr)
+    for i in range(args.repeat):
+        samples += run_kernel([])
+        print("run    %d/%d: %.4f seconds" % (i + 1, args.repeat, samples[-1]), file=sys.stderr)
+
+# Summarize the timings and compare them with the baseline.
+
+results = {
+    'kernel': args.kernel,
+    'kernel_key': kernel_key,
+    'metadata': metadata,
+    'samples': samples,
+    'summary': summarize(samples),
+}
+summary = results['summary']
+print("median = %.4f seconds, IQR = %.4f, %d%% CI = [%.4f, %.4f], CV = %.1f%%" % (summary['median'], summary['iqr'], summary['confidence'] * 100, summary['median_ci_low'], summary['median_ci_high'], summary['cv'] * 100), file=sys.stderr)
+
+if args.compare:
+    comparison = compare_samples(baseline['samples'], samples, args.alpha, args.min_effect)
+    comparison.update({ 'baseline_name': args.compare, 'baseline_instance_type': compare_instance_type, 'baseline_metadata': baseline['metadata'], 'baseline_summary': baseline['summary'] })
+    results['comparison'] = comparison
+    print("%s vs. baseline %s (%s, %s): median ratio = %.3f, p = %.4f  ==>  %s" % (kernel_key, args.compare, compare_instance_type, baseline['metadata'].get('ami_id'), comparison['median_ratio'], comparison['p_value_slower'], comparison['verdict']), file=sys.stderr)
+
+if args.save_baseline:
+    set_baseline(store, instance_type, args.save_baseline, kernel_key, samples, metadata)
+    save_baselines(store, args.baseline_store)
+    print("Saved baseline %s for %s  ==>  %s" % (args.save_baseline, instance_type, args.baseline_store), file=sys.stderr)
+
+# Write the machine-readable results.
+
+if args.output == '-':
+    json.dump(results, sys.stdout, indent=2, sort_keys=True)
+    print('')
+elif args.output:
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+    print("Results  ==>  %s" % args.output, file=sys.stderr)
+
+# Cleanup and exit.
+
+if args.compare and results['comparison']['verdict'] == 'regression':
+    sys.exit(REGRESSION_EXIT_STATUS)
+sys.exit(0)
@@ -0,0 +1,191 @@
+################################################################################
+# Name:		bench_stats.py
+# Author:	Rodney Marable <rodney.marable@gmail.com>
+# Created On:	October 17, 2026
+# Last Changed:	October 17, 2026
+# Purpose:	Summary statistics, baselines, and regression tests for the
+#		repeated kernel timings collected by bench_harness.py
+################################################################################
+
+# Default path of the baseline store, relative to the performance directory.
+# The store is a JSON file laid out as:
+#	{ "baselines": { INSTANCE_TYPE: { BASELINE_NAME: { KERNEL_KEY: {
+#	  "samples": [ seconds, ... ], "summary": { ... },
+#	  "metadata": { "ami_id": ..., "base_os": ..., ... } } } } } }
+
+BASELINE_STORE = 'baselines.json'
+
+# A candidate is only flagged as a regression when its timings are slower than
+# the baseline at the ALPHA significance level (one-sided Mann-Whitney U test)
+# *and* its median is at least MIN_EFFECT slower, so tiny but consistent
+# differences don't block a rollout.
+
+ALPHA = 0.05
+CONFIDENCE = 0.95
+MIN_EFFECT = 0.05
+
+########################
+# Function definitions #
+########################
+
+# Function: percentile()
+# Purpose: Return the p-th percentile (0-100) of samples using linear
+# interpolation between the closest ranks, as numpy.percentile() does.
+
+def percentile(samples, p):
+    values = sorted(samples)
+    if len(values) == 1:
+        return values[0]
+    rank = (len(values) - 1) * p / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (rank - lower)
+
+# Function: median_ci()
+# Purpose: Return a distribution-free confidence interval for the median of
+# samples from the order statistics: the narrowest symmetric pair of ranks
+# whose binomial coverage is at least confidence.  With fewer than six samples
+# no pair reaches 95% coverage and the sample range is returned.
+
+def median_ci(samples, confidence=CONFIDENCE):
+    import math
+    values = sorted(samples)
+    n = len(values)
+    binomial = [ math.factorial(n) // (math.factorial(k) * math.factorial(n - k)) / 2.0 ** n for k in range(n + 1) ]
+    lower = 0
+    for k in range(n // 2):
+        if sum(binomial[k + 1:n - k]) >= confidence:
+            lower = k + 1
+        else:
+            break
+    return values[max(lower - 1, 0)], values[min(n - lower, n - 1)]
+
+# Function: summarize()
+# Purpose: Return a dict of summary statistics of samples (seconds): count,
+# min, max, mean, standard deviation, median, quartiles, IQR, coefficient of
+# variation, and the confidence interval of the median.
+
+def summarize(samples, confidence=CONFIDENCE):
+    import statistics
+    median = statistics.median(samples)
+    q1 = percentile(samples, 25)
+    q3 = percentile(samples, 75)
+    mean = statistics.mean(samples)
+    stdev = statistics.stdev(samples) if len(samples) > 1 else 0.0
+    ci_low, ci_high = median_ci(samples, confidence)
+    return {
+        'count': len(samples),
+        'min': min(samples),
+        'max': max(samples),
+        'mean': mean,
+        'stdev': stdev,
+        'cv': stdev / mean if mean else 0.0,
+        'median': median,
+        'q1': q1,
+        'q3': q3,
+        'iqr': q3 - q1,
+        'confidence': confidence,
+        'median_ci_low': ci_low,
+        'median_ci_high': ci_high,
+    }
+
+# Function: mann_whitney_u()
+# Purpose: One-sided Mann-Whitney U test that the candidate timings tend to be
+# larger (slower) than the baseline timings.  Uses the normal approximation
+# with a tie correction and continuity correction, which is adequate from
+# about five samples per side.  Returns (U, p-value).
+
+def mann_whitney_u(baseline, candidate):
+    import math
+    pooled = sorted([ (value, 0) for value in baseline ] + [ (value, 1) for value in candidate ])
+    ranks = [ 0.0 ] * len(pooled)
+    tie_term = 0.0
+    i = 0
+    while i < len(pooled):
+        j = i
+        while j + 1 < len(pooled) and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2.0 + 1
+        tie_term += (j - i + 1) ** 3 - (j - i + 1)
+        i = j + 1
+    n1, n2 = len(baseline), len(candidate)
+    n = n1 + n2
+    rank_sum = sum(rank for rank, (value, group) in zip(ranks, pooled) if group == 1)
+    u = rank_sum - n2 * (n2 + 1) / 2.0
+    mean_u = n1 * n2 / 2.0
+    var_u = n1 * n2 / 12.0 * ((n + 1) - tie_term / (n * (n - 1)))
+    if var_u <= 0:
+        return u, 1.0
+    z = (u - mean_u - 0.5) / math.sqrt(var_u)
+    return u, 0.5 * math.erfc(z / math.sqrt(2))
+
+# Function: compare_samples()
+# Purpose: Compare candidate timings with baseline timings.  Returns a dict
+# with the median ratio (candidate / baseline), the U statistic and p-value,
+# and a verdict: "regression" when the candidate is significantly slower by at
+# least min_effect, "improvement" when the baseline is significantly slower by
+# at least min_effect, and "no_change" otherwise.
+
+def compare_samples(baseline, candidate, alpha=ALPHA, min_effect=MIN_EFFECT):
+    import statistics
+    ratio = statistics.median(candidate) / statistics.median(baseline)
+    u, p_slower = mann_whitney_u(baseline, candidate)
+    p_faster = mann_whitney_u(candidate, baseline)[1]
+    if p_slower < alpha and ratio >= 1 + min_effect:
+        verdict = 'regression'
+    elif p_faster < alpha and ratio <= 1 / (1 + min_effect):
+        verdict = 'improvement'
+    else:
+        verdict = 'no_change'
+    return {
+        'median_ratio': ratio,
+        'u_statistic': u,
+        'p_value_slower': p_slower,
+        'p_value_faster': p_faster,
+        'alpha': alpha,
+        'min_effect': min_effect,
+        'verdict': verdict,
+    }
+
+# Function: load_baselines()
+# Purpose: Return the baseline store at path, or an empty store if the file
+# does not exist yet.
+
+def load_baselines(path=BASELINE_STORE):
+    import json
+    try:
+        with open(path) as f:
+            store = json.load(f)
+    except FileNotFoundError:
+        store = {}
+    store.setdefault('baselines', {})
+    return store
+
+# Function: save_baselines()
+# Purpose: Write the baseline store to path, replacing it atomically.
+
+def save_baselines(store, path=BASELINE_STORE):
+    import json
+    import os
+    with open(path + '.tmp', 'w') as f:
+        json.dump(store, f, indent=2, sort_keys=True)
+    os.replace(path + '.tmp', path)
+
+# Function: get_baseline()
+# Purpose: Return the stored baseline entry for kernel_key under name and
+# instance_type, or None if there isn't one.
+
+def get_baseline(store, instance_type, name, kernel_key):
+    return store['baselines'].get(instance_type, {}).get(name, {}).get(kernel_key)
+
+# Function: set_baseline()
+# Purpose: Store samples, their summary, and metadata as the baseline entry for
+# kernel_key under name and instance_type, replacing any earlier entry.
+
+def set_baseline(store, instance_type, name, kernel_key, samples, metadata):
+    store['baselines'].setdefault(instance_type, {}).setdefault(name, {})[kernel_key] = {
+        'samples': list(samples),
+        'summary': summarize(samples),
+        'metadata': metadata,
+    }
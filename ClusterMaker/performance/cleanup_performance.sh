@@ -2,7 +2,7 @@
 # Name:		cleanup_performance.sh
 # Author:	Rodney Marable <rodney.marable@gmail.com>
 # Created On:	February 7, 2018
-# Last Updated:	May 11, 2018
+# Last Updated:	October 17, 2026
 # Purpose:	Cleanup data and log files generated by Rmarable_* scripts
 ################################################################################
 #
@@ -16,7 +16,7 @@ echo ""
 read -p '    Please type YES to confirm: ' confirm
 if [[ $confirm == "YES" || $confirm == "yes" ]]
 then
-	for dir in csv logs plots sge_data sge_job_data summary summary_final archive_hashtest archive_fibonacci_hash
+	for dir in csv logs plots sge_data sge_job_data slurm_job_data summary summary_final archive_hashtest archive_fibonacci_hash
 	do
 		if [ -d $dir ]
 		then
@@ -27,7 +27,7 @@ then
 			rm -rfv $dir
 		fi
 	done
-	for file in job_Axb_random.o* job_Axb_random.[0-9]*.csv job_Axb_random.[0-9]*log job_Axb_random.[0-9]*log.gz [0-9]*.csv [0-9]*.log [0-9]*.log.gz job_hashtest.job[0-9]*.log* job_fibonacci_hashtest.job[0-9]*.log*
+	for file in job_Axb_random.o* job_Axb_random.[0-9]*.csv job_Axb_random.[0-9]*log job_Axb_random.[0-9]*log.gz [0-9]*.csv [0-9]*.log [0-9]*.log.gz job_hashtest.job[0-9]*.log* job_fibonacci_hashtest.job[0-9]*.log* slurm_Axb_random.job[0-9]*.out slurm_Axb_random.job[0-9]*.err results.db results.db-wal results.db-shm
 	do
 		if [ -f $file ]
 		then
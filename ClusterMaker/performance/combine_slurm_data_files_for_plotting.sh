@@ -0,0 +1,94 @@
+################################################################################
+# Name:		combine_slurm_data_files_for_plotting.sh
+# Author:	Rodney Marable <rodney.marable@gmail.com>
+# Created On:	October 17, 2026
+# Last Changed:	October 17, 2026
+# Purpose:	Generate summary CSV files from Slurm job/task data created by
+#		bang.sh running on Slurm clusters suitable for plotting
+################################################################################
+
+#!/bin/sh
+
+# Get the name of the cluster.  Abort if a valid CLUSTER_NAME is not provided.
+# This parameter *must* be set to match CLUSTER_NAME as defined in bang.sh.
+
+if [ -z $1 ]
+then
+	echo ""
+	echo "Usage: combine_slurm_data_files_for_plotting.sh [ CLUSTER_NAME ]"
+	exit 1
+fi
+CLUSTER_NAME=$1
+
+# Set PYTHON3.
+
+if [ ! -f /etc/centos-release ]
+then
+        PYTHON3=python3
+else
+        if [[ `cat /etc/centos-release | awk '{print $4}' | grep -c "^7.*"` -gt 0 ]]
+        then
+                PYTHON3=python3.6
+        elif [[ `cat /etc/centos-release | awk '{print $4}' | grep -c "^6.*"` -gt 0 ]]
+        then
+                PYTHON3=python3
+        else
+                echo "You are running an unrecognized version of centos."
+                echo "This might not work."
+        fi
+fi
+echo "Setting PYTHON3=$PYTHON3..."
+
+# Create a TIMESTAMP and set up some critical file and directory paths.
+
+TIMESTAMP=`date +%d-%b-%Y-%H:%M:%S`
+SLURM_JOB_DATA_DIR=`pwd`/slurm_job_data
+SLURM_TASK_DATA_DIR=$SLURM_JOB_DATA_DIR/tasks
+SLURM_MASTER_JOB_DATA_FILE="$CLUSTER_NAME.$TIMESTAMP.csv"
+for dir in $SLURM_JOB_DATA_DIR $SLURM_TASK_DATA_DIR
+do
+	if [ ! -d $dir ]
+	then
+		mkdir -p $dir
+	fi
+done
+
+# Generate a list of cluster jobs to process.
+# By default, poll for jobs with existing Slurm output logs written by the
+# sbatch-Axb_random scripts (slurm_Axb_random.jobJOB_ID.taskTASK_ID.out).
+#
+# To generate combined log files for a specific list of jobs, uncomment this
+# line and append the cluster_job_IDs of interest.
+# CLUSTER_JOB_IDS="1 2 3 4 5 6 7 8 9 10"
+
+CLUSTER_JOB_IDS=`ls slurm_Axb_random.job*.out | awk -F. '{print $2}' | sed 's/^job//' | sort -n | uniq`
+if [ -z "$CLUSTER_JOB_IDS" ]
+then
+	echo "No slurm_Axb_random output logs were found."
+	echo "Exiting..."
+	exit 1
+fi
+
+# Pull the accounting data for every job with a single sacct call and build
+# the CSV data file sorted by job.  The per-task submit/start/end times, CPUs,
+# cpu, and maxvmem are saved to SLURM_TASK_DATA_DIR.
+
+echo "Reading the Slurm accounting data for jobs:" $CLUSTER_JOB_IDS
+$PYTHON3 parse_slurm_accounting.py --cluster-name $CLUSTER_NAME --job-ids `echo $CLUSTER_JOB_IDS | tr ' ' ','` --output $SLURM_JOB_DATA_DIR/$SLURM_MASTER_JOB_DATA_FILE --task-output $SLURM_TASK_DATA_DIR/$SLURM_MASTER_JOB_DATA_FILE || exit 1
+for cluster_job_ID in $CLUSTER_JOB_IDS
+do
+	echo "Removing Slurm output logs for cluster_job_ID $cluster_job_ID..."
+	rm -f slurm_Axb_random.job$cluster_job_ID.*
+done
+
+# Print a summary to the console.
+
+echo "================================================================================="
+echo ""
+echo "To save and view the plots locally, please run this command:"
+echo ""
+echo "   ===>   $PYTHON3 make_sge_cluster_plots.py"
+echo ""
+echo "Exiting..."
+echo ""
+exit 0
@@ -4,7 +4,7 @@
 # Name:         compress_logfiles.py
 # Author:       Rodney Marable <rodney.marable@gmail.com>
 # Created On:   April 20, 2018
-# Last Changed: April 24, 2018
+# Last Changed: October 17, 2026
 # Deployed On:  {{ lookup('pipe','date \"+%B %-d, %Y\"') }}
 # Purpose:      Compress log files generated by Axb_random.py
 #
@@ -20,14 +20,15 @@ start_time=time.time()
 # Import the rest of the required Python libraries.
 
 import argparse
-import contextlib
-import gzip 
 import os
 import platform
-import shutil
-import subprocess
 import sys
 
+# Import the shared hpc_performance threaded gzip compressor.
+
+from parallel_gzip import archive_logfiles
+from parallel_gzip import compression_report
+
 # Get the testing instance hostname and the current working directory.
 
 exec_node = platform.uname()[1]
@@ -38,8 +39,8 @@ cwd = os.getcwd()
 parser = argparse.ArgumentParser(description='Compress log files generated by Axb_random.py')
 parser.add_argument('--jobid', '-J', help='name of the job - used to determine CONSOLE_DUMP, CONSOLE_LOG, and CSV_DATA file names', required=True)
 parser.add_argument('--matrix-size', '-M', help='set dimensions of the square matrix A', required=True, type=int)
-parser.add_argument('--compression_type', '-C', help='set the file compression type', required=False, default='gzip')
-parser.add_argument('--compression_processes', '-P', help='set the number of CPUs to use for compression', required=False, default='8')
+parser.add_argument('--compression_type', '-C', help='set the file compression type to gzip (threaded, in-process) or pigz (alias for gzip)', required=False, default='gzip', choices=['gzip', 'pigz'])
+parser.add_argument('--compression_processes', '-P', help='set the number of CPUs to use for compression', required=False, type=int, default=8)
 
 args = parser.parse_args()
 cluster_jobid = args.jobid
@@ -51,29 +52,15 @@ compression_processes = args.compression_processes
 
 start_fileproc_time=time.time()
 
-# Capture the size of the uncompressed logfile.
-
-raw_log_size_bytes = os.path.getsize(cluster_jobid + ".log")
-
-# Compress the logfile with gzip or pigz.
+# Compress the logfile in parallel blocks with compression_processes threads.
+# The output is a standard gzip file, so pigz does not need to be installed.
+# Move the compressed logfile and any binary matrix data files written by
+# Axb_random.py --log-format to the logs/ directory.  The raw and compressed
+# sizes include the matrix data files.
 
 print("+ Initiated log file compression with", compression_type, "on %s " % time.strftime("%a %d %b %Y @ %H:%M:%S", time.localtime(start_fileproc_time)))
-if (compression_type) == "gzip":
-    f_in=open(cluster_jobid + '.log', 'rb')
-    f_out=gzip.open(cluster_jobid + '.log.gz', 'wb')
-    shutil.copyfileobj(f_in, f_out)
-if (compression_type) == "pigz":
-    subprocess.run(["pigz", "-f", "--processes", compression_processes, cluster_jobid + '.log'])
-
-
-# Record the size of the compressed logfile.
-# Move the compressed logfile to the logs/ directory.
-# Delete the uncompressed logfile.
-
-compressed_log_size_bytes = os.path.getsize(cluster_jobid + ".log.gz")
-shutil.move(cluster_jobid + '.log.gz', 'logs/' + cluster_jobid + '.' + str(matrix_size) + '.log.gz')
-with contextlib.suppress(FileNotFoundError):
-    os.remove(cluster_jobid + '.log')
+raw_log_size_bytes, compressed_log_size_bytes, raw_bytes, compressed_bytes, compression_time = archive_logfiles(cluster_jobid, matrix_size, 'logs', compression_processes)
+print("+ Log file compression:", compression_report(raw_bytes, compressed_bytes, compression_time))
 
 # Stop the file compression timer.
 
@@ -0,0 +1,154 @@
+################################################################################
+# Name:		fibonacci_engine.py
+# Author:	Rodney Marable <rodney.marable@gmail.com>
+# Created On:	October 17, 2026
+# Last Changed:	October 17, 2026
+# Purpose:	Shared Fibonacci number generation for the hpc_performance
+#		toolkit scripts
+################################################################################
+
+import functools
+
+########################
+# Function definitions #
+########################
+
+# Function: fibonacci_fast_doubling()
+# Purpose: Return (F(k), F(k+1)) in O(log k) big-int multiplications using
+# F(2j) = F(j) * (2*F(j+1) - F(j)) and F(2j+1) = F(j)^2 + F(j+1)^2.
+
+def fibonacci_fast_doubling(k):
+    a, b = 0, 1
+    for bit in bin(k)[2:]:
+        c = a * (2*b - a)
+        d = a*a + b*b
+        if bit == '1':
+            a, b = d, c + d
+        else:
+            a, b = c, d
+    return a, b
+
+# Function: fibonacci_sequence()
+# Purpose: Yield (n, F(n)) for n = first_index..last_index (or forever when
+# last_index is None) using F(1) = F(2) = 1.  The sequence is seeded at
+# first_index with fibonacci_fast_doubling(), then only (F(n-1), F(n)) is
+# carried forward, so each value costs one big-int addition and memory stays
+# flat.
+
+def fibonacci_sequence(first_index=1, last_index=None):
+    index = max(first_index, 1)
+    m, n = fibonacci_fast_doubling(index - 1)
+    while last_index is None or index <= last_index:
+        yield index, n
+        m, n = n, m+n
+        index += 1
+
+# Function: power_of_ten()
+# Purpose: Return 10**d, caching the last few powers since consecutive
+# Fibonacci numbers usually share the same digit count.
+
+@functools.lru_cache(maxsize=8)
+def power_of_ten(d):
+    return 10**d
+
+# Function: decimal_digits()
+# Purpose: Count the decimal digits in value without converting it to a
+# string.  The bit_length() estimate is never too large and at most one digit
+# short, so a single comparison against 10**d corrects it.
+
+def decimal_digits(value):
+    value = abs(value)
+    if value == 0:
+        return 1
+    d = int((value.bit_length() - 1) * 0.30102999566398120) + 1
+    if value >= power_of_ten(d):
+        d += 1
+    return d
+
+# Function: first_index_with_digits()
+# Purpose: Return the smallest n for which F(n) has at least D decimal digits.
+# Binet's formula gives log10(F(n)) ~ n*log10(phi) - log10(sqrt(5)), which
+# estimates n directly; fast doubling then confirms the estimate and nudges it
+# by a step if floating point rounding put it on the wrong side.
+
+def first_index_with_digits(D):
+    import math
+    if D <= 1:
+        return 1
+    log10_phi = math.log10((1 + math.sqrt(5)) / 2)
+    log10_sqrt5 = math.log10(math.sqrt(5))
+    n = max(1, int(math.ceil((D - 1 + log10_sqrt5) / log10_phi)))
+    while True:
+        a, b = fibonacci_fast_doubling(n - 1)
+        if decimal_digits(b) < D:
+            n += 1
+        elif n > 1 and decimal_digits(a) >= D:
+            n -= 1
+        else:
+            return n
+
+# Function: select_conversion_backend()
+# Purpose: Resolve the decimal conversion backend used by int_to_decimal().
+#	auto	gmpy2 when it is installed, otherwise dc
+#	str	CPython str() with the 3.11+ int_max_str_digits limit lifted
+#	dc	divide-and-conquer conversion in pure Python
+#	gmpy2	GMP mpz.digits()
+#	binary	skip decimal conversion and hash the raw big-endian bytes
+
+def select_conversion_backend(backend='auto'):
+    import sys
+    if backend in ('auto', 'gmpy2'):
+        try:
+            import gmpy2
+            return 'gmpy2'
+        except ImportError:
+            if backend == 'gmpy2':
+                print('*** WARNING *** gmpy2 is not installed, falling back to the dc conversion backend')
+            return 'dc'
+    if backend == 'str' and hasattr(sys, 'set_int_max_str_digits'):
+        sys.set_int_max_str_digits(0)
+    return backend
+
+# Function: decimal_dc()
+# Purpose: Convert value to decimal by recursively splitting it around
+# 10**(leaf_digits * 2**k).  Only leaves below 10**leaf_digits go through
+# str(), so the conversion never hits int_max_str_digits.
+
+def decimal_dc(value, leaf_digits=1024):
+    if value < 0:
+        return '-' + decimal_dc(-value, leaf_digits)
+    powers = [ power_of_ten(leaf_digits) ]
+    while powers[-1] * powers[-1] <= value:
+        powers.append(powers[-1] * powers[-1])
+    pieces = []
+    def convert(n, k, pad):
+        if k < 0:
+            pieces.append(str(n).zfill(leaf_digits) if pad else str(n))
+            return
+        q, r = divmod(n, powers[k])
+        if pad or q:
+            convert(q, k - 1, pad)
+            convert(r, k - 1, True)
+        else:
+            convert(r, k - 1, False)
+    convert(value, len(powers) - 1, False)
+    return ''.join(pieces)
+
+# Function: int_to_decimal()
+# Purpose: Convert value to a decimal string with a backend resolved by
+# select_conversion_backend().
+
+def int_to_decimal(value, backend='dc'):
+    if backend == 'gmpy2':
+        import gmpy2
+        return gmpy2.mpz(value).digits(10)
+    if backend == 'str':
+        return str(value)
+    return decimal_dc(value)
+
+# Function: int_to_bytes()
+# Purpose: Return the big-endian binary form of a non-negative value for the
+# binary conversion backend.
+
+def int_to_bytes(value):
+    return value.to_bytes(max(1, (value.bit_length() + 7) // 8), 'big')
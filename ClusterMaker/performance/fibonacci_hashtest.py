@@ -4,7 +4,7 @@
 # Name:		fibonacci_hashtest.py
 # Author:	Rodney Marable <rodney.marable@gmail.com>
 # Created On:	April 25, 2018
-# Last Changed:	August 8, 2018
+# Last Changed:	October 17, 2026
 # Purpose:	Generate Fibonacci numbers and hash them against randomly
 #		generated salts
 ################################################################################
@@ -19,14 +19,36 @@ datestamp = time.strftime("%S%M%H%d%m%Y")
 
 import argparse
 import binascii
-import gzip
 import hashlib
+import io
+import multiprocessing
 import os
 import shutil
 import string
-import subprocess
+import sys
 import uuid
 
+# Import the shared Fibonacci number generator.
+
+from fibonacci_engine import decimal_digits
+from fibonacci_engine import fibonacci_sequence
+from fibonacci_engine import int_to_bytes
+from fibonacci_engine import int_to_decimal
+from fibonacci_engine import select_conversion_backend
+from output_streams import concatenate_output_files
+from parallel_gzip import compress_file
+from parallel_gzip import compression_report
+from record_container import RECORD_SUFFIX
+from record_container import close_record_file
+from record_container import merge_record_files
+from record_container import open_record_file
+from record_container import write_record
+
+# Record when the imports finished so compute_time leaves out the interpreter
+# start and the imports.
+
+imports_done_time = time.time()
+
 # Configure the parser.
 
 parser = argparse.ArgumentParser(description='Generate Fibonacci numbers and hash them against randomly generated salts')
@@ -38,11 +60,14 @@ group.add_argument('--enable_index', action='store_true')
 
 parser.add_argument('--archive_path', '-A', help='Path to the archive directory for storing compressed output files (default = ./archive_fibonacci_hash)', required=False, default='./archive_fibonacci_hash')
 parser.add_argument('--compression_processes', '-P', help='Number of CPUs to use for compression', required=False, type=int, default=8)
-parser.add_argument('--compression_prog', '-C', help='Set the compression program to gzip or pigz (default = pigz)', required=False, default='pigz')
+parser.add_argument('--compression_prog', '-C', help='Set the compression program to gzip (threaded, in-process) or pigz (alias for gzip) (default = pigz)', required=False, default='pigz', choices=['gzip', 'pigz'])
 parser.add_argument('--outfile', '-O', help='Name of the output file (default = stdout)', required=False)
+parser.add_argument('--output-format', '-F', help='Write --outfile as a compressed text dump or as an indexed binary record file that stores F(n) in binary and that read_records.py can seek, verify, and export to text (default = text)', required=False, default='text', choices=['text', 'records'])
 
 parser.add_argument('--digits', '-D', help='Compute hashes for Fibonacci numbers up to D digits long (default = 1000)', required=False, type=int, default=1000)
 parser.add_argument('--index', '-I', help='Compute hashes for Fibonacci numbers from 1 to index (default = 10000)', required=False, type=int, default=10000)
+parser.add_argument('--conversion', '-V', help='Backend that converts F(n) for hashing: auto (gmpy2 if installed, else dc), str, dc (divide-and-conquer), gmpy2, or binary (hash the raw bytes) (default = auto)', required=False, default='auto', choices=['auto', 'str', 'dc', 'gmpy2', 'binary'])
+parser.add_argument('--workers', '-W', help='Number of worker processes that hash slices of the index range with --enable_index (default = 1)', required=False, type=int, default=1)
 
 # Set values for critical parameters based on command line input.
 
@@ -56,6 +81,10 @@ enable_index = args.enable_index
 enable_digits = args.enable_digits
 digits = args.digits
 index = args.index
+workers = max(1, min(args.workers, index))
+conversion = select_conversion_backend(args.conversion)
+output_format = args.output_format
+record_writer = None
 
 # Function: compute_test_time(t)
 # Purpose: define a function to compute the elapsed test time.
@@ -63,74 +92,123 @@ index = args.index
 def compute_test_time(t):
     end_time=t
     elapsed_time=round(end_time-start_time,4)
-    if args.outfile:
-        print("--------------------------------------------------------------------------------", file=open(outfile + '.fibonacci_dump', "a"))
-        print('',  file=open(outfile + '.fibonacci_dump', "a"))
-        print('archive_path = ' + archive_path + '/' + outfile + '.fibonacci_dump.gz', file=open(outfile  + '.fibonacci_dump', "a"))
-        print("time_elapsed = %.4f seconds  " % elapsed_time, file=open(outfile  + '.fibonacci_dump', "a"))
+    compute_time=round(end_time-imports_done_time,4)
+    if args.outfile and output_format == 'text':
+        print("--------------------------------------------------------------------------------", file=fibonacci_dump)
+        print('',  file=fibonacci_dump)
+        print('archive_path = ' + archive_path + '/' + outfile + '.fibonacci_dump.gz', file=fibonacci_dump)
+        print("time_elapsed = %.4f seconds  " % elapsed_time, file=fibonacci_dump)
+        print("compute_time = %.4f seconds  " % compute_time, file=fibonacci_dump)
+        fibonacci_dump.close()
     else:
         print('')
         print("time_elapsed  = %.4f seconds  " % elapsed_time)
-
-# Function: compute_fibonacci(p)
-# Purpose: define a function to compute Fibonacci numbers.
-
-def compute_fibonacci(p):
-    fibonacci_array = []
-    m = 0
-    n = 1
-    for i in range(p):
-        fibonacci_array.append(n)
-        m, n = n, m+n
-    return fibonacci_array
+        print("compute_time  = %.4f seconds  " % compute_time)
 
 # Function: handle_number_one()
-# Purpose: properly handle the case of N=1.
+# Purpose: properly handle the case of N=1.  Record files hash F(1) like any
+# other value so it verifies with the same encoding.
 
 def handle_number_one():
+    if record_writer is not None:
+        hash_fibonacci_number(1, 1)
+        return
     salt = uuid.uuid4().hex
     FibNumOne = str.encode(str(1))
     hash_string = hashlib.blake2b(salt.encode() + FibNumOne).hexdigest()
-    if args.outfile:
-        print ('  n         = 1', file=open(outfile + '.fibonacci_dump', "a"))
-        print ('F(n) digits = 1', file=open(outfile + '.fibonacci_dump', "a"))
-        print ("random salt =", "{", salt, "}", file=open(outfile + '.fibonacci_dump', "a"))
-        print ("hash string =", "{", hash_string, "}", file=open(outfile + '.fibonacci_dump', "a"))
-        print ("F(n) value  = 1", file=open(outfile + '.fibonacci_dump', "a"))
-        print ("--------------------------------------------------------------------------------", file=open(outfile + '.fibonacci_dump', "a"))
-    else:
-        print ('  n         = 1')
-        print ('F(n) digits = 1')
-        print ("random salt =", "{", salt, "}")
-        print ("hash string =", "{", hash_string, "}")
-        print ('F(n) value  = 1')
-        print ("--------------------------------------------------------------------------------")
-
-# Function: print_output()
+    print ('  n         = 1', file=output_stream)
+    print ('F(n) digits = 1', file=output_stream)
+    print ("random salt =", "{", salt, "}", file=output_stream)
+    print ("hash string =", "{", hash_string, "}", file=output_stream)
+    print ("F(n) value  = 1", file=output_stream)
+    print ("--------------------------------------------------------------------------------", file=output_stream)
+
+# Function: print_output(n, FibNum_digits, FibNum_text, salt, hash_string)
 # Purpose: print output to console and/or outfile.
 
-def print_output():
-    if args.outfile:
-        print ("  n         =", index, file=open(outfile + '.fibonacci_dump', "a"))
-        print ("F(n) digits =", len(FibNum), "digits", file=open(outfile + '.fibonacci_dump', "a"))
-        print ("random salt =", "{", salt, "}", file=open(outfile + '.fibonacci_dump', "a"))
-        print ("hash string =", "{", hash_string, "}", file=open(outfile + '.fibonacci_dump', "a"))
-        print ("F(n) value  =", FibNum.decode('utf-8'), file=open(outfile + '.fibonacci_dump', "a"))
-        print ("--------------------------------------------------------------------------------", file=open(outfile + '.fibonacci_dump', "a"))
+def print_output(n, FibNum_digits, FibNum_text, salt, hash_string):
+    print ("  n         =", n, file=output_stream)
+    print ("F(n) digits =", FibNum_digits, "digits", file=output_stream)
+    print ("random salt =", "{", salt, "}", file=output_stream)
+    print ("hash string =", "{", hash_string, "}", file=output_stream)
+    print ("F(n) value  =", FibNum_text, file=output_stream)
+    print ("--------------------------------------------------------------------------------", file=output_stream)
+
+# Function: hash_fibonacci_number(n, value)
+# Purpose: hash F(n) against a randomly generated salt and print the result.
+# The digit count comes from decimal_digits() rather than a string conversion.
+# The binary conversion backend hashes the raw bytes of F(n) and prints it in
+# hexadecimal.  Returns the number of decimal digits in F(n).
+
+def hash_fibonacci_number(n, value):
+    FibNum_digits = decimal_digits(value)
+    if conversion == 'binary':
+        FibNum = int_to_bytes(value)
+        FibNum_text = hex(value)
+    else:
+        FibNum_text = int_to_decimal(value, conversion)
+        FibNum = str.encode(FibNum_text)
+    salt = uuid.uuid4().hex
+    digest = hashlib.blake2b(salt.encode() + FibNum).digest()
+    if record_writer is not None:
+        write_record(record_writer, n, salt, digest, FibNum if conversion == 'binary' else int_to_bytes(value))
     else:
-        print ("  n         =", index)
-        print ("F(n) digits =", len(FibNum), "digits")
-        print ("random salt =", "{", salt, "}")
-        print ("hash string =", "{", hash_string, "}")
-        print ("F(n) value  =", FibNum.decode('utf-8'))
-        print ("--------------------------------------------------------------------------------")
+        print_output(n, FibNum_digits, FibNum_text, salt, digest.hex())
+    return FibNum_digits
+
+# Function: hash_fibonacci_slice(chunk)
+# Purpose: Worker process entry point for --workers mode.  Seed the sequence at
+# the start of this slice of the index range with fast doubling, hash every
+# value in the slice, and write the results to a per-slice file (or return them
+# as a string when writing to stdout).
+
+def hash_fibonacci_slice(chunk):
+    global output_stream
+    global record_writer
+    chunk_number, first, last = chunk
+    chunk_start_time = time.perf_counter()
+    if args.outfile and output_format == 'records':
+        record_writer = open_record_file(records_path + '.chunk' + str(chunk_number), record_metadata)
+        output_stream = io.StringIO()
+    elif args.outfile:
+        output_stream = open(outfile + '.fibonacci_dump.chunk' + str(chunk_number), 'w')
+    else:
+        output_stream = io.StringIO()
+    for n, value in fibonacci_sequence(first, last):
+        hash_fibonacci_number(n, value)
+    if args.outfile and output_format == 'records':
+        close_record_file(record_writer)
+        console_text = ''
+    elif args.outfile:
+        output_stream.close()
+        console_text = ''
+    else:
+        console_text = output_stream.getvalue()
+    return chunk_number, first, last, time.perf_counter() - chunk_start_time, console_text
 
 # Delete any pre-existing output files to prevent clashing.
+# Open the output file once and keep it open while the hashes are computed.
+# With --output-format records, write one uncompressed, seekable record file
+# straight into archive_path instead.
 
-if args.outfile:
+if args.outfile and output_format == 'records':
+    import socket
+    if not os.path.isdir(archive_path):
+        os.makedirs(archive_path)
+    records_path = archive_path + '/' + outfile + RECORD_SUFFIX
+    if os.path.isfile(records_path):
+        os.remove(records_path)
+    record_metadata = { 'kind': 'fibonacci_hashtest', 'hash': 'blake2b', 'encoding': 'binary' if conversion == 'binary' else 'decimal', 'hostname': socket.gethostname(), 'datestamp': datestamp }
+    if workers == 1 or not enable_index:
+        record_writer = open_record_file(records_path, record_metadata)
+    output_stream = sys.stdout
+elif args.outfile:
     if os.path.isfile(archive_path + '/' + outfile + '.fibonacci_dump.gz'):
         os.remove(archive_path + '/' + outfile + '.fibonacci_dump.gz')
-        open(outfile + '.fibonacci_dump', 'w')
+    fibonacci_dump = open(outfile + '.fibonacci_dump', 'w')
+    output_stream = fibonacci_dump
+else:
+    output_stream = sys.stdout
 
 # Compute a Fibonacci number and hash against a randomly generated salt.
 # Allow the operator to select between:
@@ -139,35 +217,48 @@ if args.outfile:
 # Print the index, computed Fibonacci number, number of digits in the computed
 # Fibonacci number, random salt, and hash result to the console.
 # Dump the results to outfile if "--outfile" is enabled.
+#
+# fibonacci_sequence() carries (F(n-1), F(n)) forward so each value is hashed
+# as soon as it is generated, keeping the test O(n) with flat memory use.
+#
+# With --workers N, --enable_index splits [1, index] into N slices that are
+# hashed by a pool of forked worker processes.  Each worker seeds its slice in
+# O(log n) with fast doubling, and the slices are merged back in index order.
 
 if enable_index:
     if index == 1:
         handle_number_one()
+    elif workers == 1:
+        for n, value in fibonacci_sequence(1, index):
+            hash_fibonacci_number(n, value)
     else:
-        for index in range(1, index+1):
-            result = compute_fibonacci(index)[-1:]
-            result_string = ','.join( str(result) for e in result ).replace('[', '').replace(']', '')
-            FibNum = str.encode(result_string)
-            salt = uuid.uuid4().hex
-            hash_string = hashlib.blake2b(salt.encode() + FibNum).hexdigest()
-            print_output()
+        chunk_size, remainder = divmod(index, workers)
+        chunks = []
+        first = 1
+        for chunk_number in range(workers):
+            last = first + chunk_size - 1 + (1 if chunk_number < remainder else 0)
+            chunks.append((chunk_number, first, last))
+            first = last + 1
+        with multiprocessing.get_context('fork').Pool(workers) as pool:
+            chunk_results = pool.map(hash_fibonacci_slice, chunks)
+        if args.outfile and output_format == 'records':
+            merge_record_files(records_path, [ records_path + '.chunk' + str(chunk[0]) for chunk in chunks ])
+        elif args.outfile:
+            fibonacci_dump.close()
+            concatenate_output_files(outfile + '.fibonacci_dump', [ outfile + '.fibonacci_dump.chunk' + str(chunk[0]) for chunk in chunks ])
+            fibonacci_dump = open(outfile + '.fibonacci_dump', 'a')
+        for chunk_number, first, last, chunk_elapsed_time, console_text in chunk_results:
+            sys.stdout.write(console_text)
+        for chunk_number, first, last, chunk_elapsed_time, console_text in chunk_results:
+            print("worker %d: F(%d)..F(%d) hashed in %.4f seconds" % (chunk_number, first, last, chunk_elapsed_time))
 
 if enable_digits:
-    index = 1
-    result_string = 1
-    if digits == 1:
+    if digits >= 1:
         handle_number_one()
-    while len(str(result_string)) < digits:
-        if index == 1:
-            handle_number_one()
-        else:
-            result = compute_fibonacci(index)[-1:]
-            result_string = ','.join( str(result) for e in result ).replace('[', '').replace(']', '')
-            FibNum = str.encode(result_string)
-            salt = uuid.uuid4().hex
-            hash_string = hashlib.blake2b(salt.encode() + FibNum).hexdigest()
-            print_output()
-        index += 1
+    if digits > 1:
+        for n, value in fibonacci_sequence(2):
+            if hash_fibonacci_number(n, value) >= digits:
+                break
 
 # Compute the elapsed test time.
 # Print the result to the console and append to outfile (if defined).
@@ -175,21 +266,19 @@ if enable_digits:
 compute_test_time(time.time())
 
 # Compress and move the output file to archive_path.
+# compression_processes threads compress the dump in parallel blocks, so pigz
+# does not need to be installed.
 
-if args.outfile:
+if args.outfile and output_format == 'records':
+    if record_writer is not None:
+        close_record_file(record_writer)
+    print("records_file = %s (%d bytes)" % (records_path, os.path.getsize(records_path)))
+elif args.outfile:
     if not os.path.isdir(archive_path):
         os.makedirs(archive_path)
     files_to_compress = [ outfile + '.fibonacci_dump' ]
     for compfile in files_to_compress:
-        try:
-            with open(compfile) as file:
-                if (compression_prog) == "pigz":
-                    subprocess.run(["pigz", "-f", "--processes", str(compression_processes), compfile])
-                if (compression_prog) == "gzip":
-                    f_in=open(compfile, 'rb')
-                    f_out=gzip.open(compfile + '.gz', 'wb')
-                    shutil.copyfileobj(f_in, f_out)
-        except IOError:
-            pass
-    for compfile in files_to_compress:
-        shutil.move(compfile + '.gz', archive_path + '/' + compfile + '.gz')
+        if os.path.isfile(compfile):
+            raw_bytes, compressed_bytes, compression_time = compress_file(compfile, threads=compression_processes)
+            print("compression  = %s" % compression_report(raw_bytes, compressed_bytes, compression_time))
+            shutil.move(compfile + '.gz', archive_path + '/' + compfile + '.gz')
@@ -0,0 +1,94 @@
+################################################################################
+# Name:		hash_throughput.py
+# Author:	Rodney Marable <rodney.marable@gmail.com>
+# Created On:	October 17, 2026
+# Last Changed:	October 17, 2026
+# Purpose:	Hash algorithm and block size throughput matrix for hashtest.py
+################################################################################
+
+# Algorithms and block sizes swept by hashtest.py --throughput by default.
+# The block sizes run from 64 bytes to 64 MiB in powers of four.
+
+THROUGHPUT_ALGORITHMS = [ 'blake2b', 'blake2s', 'sha256', 'sha512', 'sha3_256', 'md5' ]
+THROUGHPUT_BLOCK_SIZES = [ 64 * 4 ** i for i in range(11) ]
+
+# Column headers of the CSV file written by hashtest.py --throughput-csv.
+
+THROUGHPUT_HEADER = "hostname,algorithm,block_size,threads,bytes_hashed,elapsed_time,mb_per_sec"
+
+########################
+# Function definitions #
+########################
+
+# Function: parse_size()
+# Purpose: Convert a size such as 64, 4K, 1M, or 64MiB to bytes.
+
+def parse_size(value):
+    units = { 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3 }
+    value = value.strip().upper()
+    for suffix in ('IB', 'B'):
+        if value.endswith(suffix) and len(value) > len(suffix):
+            value = value[:-len(suffix)]
+            break
+    if value and value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
+
+# Function: format_size()
+# Purpose: Return a block size in bytes as a short label (64B, 4K, 1M, ...).
+
+def format_size(size):
+    for unit, scale in (('G', 1024 ** 3), ('M', 1024 ** 2), ('K', 1024)):
+        if size >= scale and size % scale == 0:
+            return '%d%s' % (size // scale, unit)
+    return '%dB' % size
+
+# Function: hash_blocks()
+# Purpose: Hash consecutive block_size slices of view, one digest per block,
+# cycling through the buffer until at least min_time seconds have passed.
+# The slices are memoryviews, so no block is copied or allocated.  The clock
+# is read about once per MiB so the timer doesn't dominate small blocks.
+# Returns (bytes hashed, elapsed seconds).
+
+def hash_blocks(view, constructor, block_size, min_time):
+    import time
+    offsets = range(0, len(view) - block_size + 1, block_size)
+    batch = max(1, (1 << 20) // block_size)
+    blocks = 0
+    i = 0
+    start = time.perf_counter()
+    while True:
+        for offset in offsets[i:i + batch]:
+            constructor(view[offset:offset + block_size]).digest()
+        blocks += len(offsets[i:i + batch])
+        i = (i + batch) % len(offsets)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return blocks * block_size, elapsed
+
+# Function: measure_throughput()
+# Purpose: Measure the hashing throughput of one algorithm and block size over
+# buffer with threads threads hashing it concurrently.  hashlib releases the
+# GIL for inputs larger than 2 KiB, so large blocks scale across cores.  The
+# threads are started together by a barrier and the aggregate rate is the
+# total bytes over the slowest thread's time.
+# Returns (bytes hashed, elapsed seconds, MB/s).
+
+def measure_throughput(buffer, algorithm, block_size, threads=1, min_time=0.5):
+    import concurrent.futures
+    import hashlib
+    import threading
+    constructor = getattr(hashlib, algorithm)
+    view = memoryview(buffer)
+    barrier = threading.Barrier(threads)
+    def worker():
+        barrier.wait()
+        return hash_blocks(view, constructor, block_size, min_time)
+    if threads == 1:
+        results = [ hash_blocks(view, constructor, block_size, min_time) ]
+    else:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
+            results = list(executor.map(lambda _: worker(), range(threads)))
+    bytes_hashed = sum(result[0] for result in results)
+    elapsed = max(result[1] for result in results)
+    return bytes_hashed, elapsed, bytes_hashed / elapsed / 1e6
@@ -4,7 +4,7 @@
 # Name:		hashtest.py
 # Author:	Rodney Marable <rodney.marable@gmail.com>
 # Created On:	May 11, 2018
-# Last Changed:	August 8, 2018
+# Last Changed:	October 17, 2026
 # Purpose:	Generate hashes of randomly generated byte streams
 ################################################################################
 
@@ -19,12 +19,40 @@ datestamp = time.strftime("%S%M%H%d%m%Y")
 import argparse
 import binascii
 import hashlib
+import io
+import multiprocessing
 import os
-import random
-import shutil
-import string
-import subprocess
-import uuid
+import sys
+
+# Import the shared hpc_performance output stream functions.
+
+from output_streams import close_output_stream
+from output_streams import compressed_file_suffix
+from output_streams import concatenate_output_files
+from output_streams import open_output_stream
+from parallel_gzip import compression_report
+from random_source import check_seeded_source
+from random_source import random_block
+from random_source import record_source
+from record_container import RECORD_SUFFIX
+from record_container import close_record_file
+from record_container import merge_record_files
+from record_container import open_record_file
+from record_container import write_record
+
+# Import the shared hpc_performance hash throughput functions.
+
+from hash_throughput import THROUGHPUT_ALGORITHMS
+from hash_throughput import THROUGHPUT_BLOCK_SIZES
+from hash_throughput import THROUGHPUT_HEADER
+from hash_throughput import format_size
+from hash_throughput import measure_throughput
+from hash_throughput import parse_size
+
+# Record when the imports finished so compute_time leaves out the interpreter
+# start and the imports.
+
+imports_done_time = time.time()
 
 # Configure the parser.
 
@@ -33,8 +61,18 @@ parser.add_argument('--count', '-c', help='Number of hashes to compute (default
 parser.add_argument('--byte_size', '-S', help='Size in bytes of the string to hash (default = 8192)', required=False, default=8192, type=int)
 parser.add_argument('--outfile', '-O', help='Name of the hash output dump file (default = stdout)', required=False)
 parser.add_argument('--archive_path', '-A', help='Path to the archive directory for storing compressed hash output dump files (default = ./archive_hashtest)', required=False, default='./archive_hashtest')
-parser.add_argument('--compression-type', '-C', help='Set the compression type (default = pigz)', required=False, default='pigz')
+parser.add_argument('--compression-type', '-C', help='Set the compression type to gzip (threaded, in-process), pigz (alias for gzip), or none (default = pigz)', required=False, default='pigz', choices=['pigz', 'gzip', 'none'])
 parser.add_argument('--compression_processes', '-P', help='set the number of CPUs to use for compression', required=False, type=int, default=8)
+parser.add_argument('--buffer_size', '-B', help='Size in bytes of the output stream buffers (default = 1048576)', required=False, type=int, default=1048576)
+parser.add_argument('--workers', '-W', help='Number of worker processes that hash shards of the record range (default = 1)', required=False, type=int, default=1)
+parser.add_argument('--output-format', '-F', help='Write --outfile as compressed text dumps (hashdata_dump and summary_data) or as a single indexed binary record file that read_records.py can seek, verify, and export to text (default = text)', required=False, default='text', choices=['text', 'records'])
+parser.add_argument('--seed', help='Seed the random data and salts so runs hash byte-for-byte identical records on every node (default = unseeded, bulk os.urandom)', required=False, type=int)
+parser.add_argument('--throughput', '-T', help='Measure raw hashing throughput in MB/s for each algorithm, block size, and thread count instead of hashing salted random records', required=False, action='store_true')
+parser.add_argument('--algorithms', help='Comma-separated list of hashlib algorithms for --throughput (default = %s)' % ','.join(THROUGHPUT_ALGORITHMS), required=False, default=','.join(THROUGHPUT_ALGORITHMS))
+parser.add_argument('--block-sizes', help='Comma-separated list of block sizes for --throughput, e.g. 64,4K,1M (default = 64B..64M in powers of 4)', required=False, default=','.join(format_size(size) for size in THROUGHPUT_BLOCK_SIZES))
+parser.add_argument('--threads', help='Comma-separated list of thread counts for --throughput (default = 1)', required=False, default='1')
+parser.add_argument('--min-time', help='Minimum number of seconds to hash each --throughput cell (default = 0.5)', required=False, type=float, default=0.5)
+parser.add_argument('--throughput-csv', help='Write the --throughput results to this CSV file', required=False)
 
 # Set values for critical parameters based on command line input.
 
@@ -46,6 +84,67 @@ if args.outfile:
 archive_path = args.archive_path
 compression_type = args.compression_type
 compression_processes = args.compression_processes
+buffer_size = args.buffer_size
+output_format = args.output_format
+workers = max(1, min(args.workers, count))
+seed = args.seed
+if seed is not None and check_seeded_source():
+    parser.error(check_seeded_source())
+separator = "--------------------------------------------------------------------------------\n"
+
+# With --throughput, hash one pre-generated random buffer in place through
+# memoryview slices for every algorithm, block size, and thread count, report
+# MB/s per cell, and exit.  Nothing is allocated per block, and the salt,
+# base64 formatting, and output files of the record test are skipped, so the
+# numbers compare the CPU hashing throughput of instance types directly.
+
+if args.throughput:
+    import socket
+    try:
+        algorithms = [ algorithm.strip() for algorithm in args.algorithms.split(',') if algorithm.strip() ]
+        block_sizes = [ parse_size(size) for size in args.block_sizes.split(',') if size.strip() ]
+        thread_counts = [ int(threads) for threads in args.threads.split(',') if threads.strip() ]
+    except ValueError as e:
+        parser.error('invalid --block-sizes or --threads: %s' % e)
+    for algorithm in algorithms:
+        if algorithm not in hashlib.algorithms_available or not hasattr(hashlib, algorithm):
+            parser.error('unsupported hash algorithm: %s' % algorithm)
+    if min(block_sizes) < 1 or min(thread_counts) < 1:
+        parser.error('--block-sizes and --threads must be positive')
+    hostname = socket.gethostname()
+    t0 = time.perf_counter()
+    buffer = random_block(max(block_sizes), seed)
+    print("buffer        = %s of random data generated in %.4f seconds" % (format_size(len(buffer)), time.perf_counter() - t0))
+    throughput_csv = open(args.throughput_csv, 'w') if args.throughput_csv else None
+    if throughput_csv:
+        print(THROUGHPUT_HEADER, file=throughput_csv)
+    for threads in thread_counts:
+        print(separator, end='')
+        print("MB/s with %d thread%s" % (threads, '' if threads == 1 else 's'))
+        print("%-10s" % 'block' + ''.join("%12s" % algorithm for algorithm in algorithms))
+        for block_size in block_sizes:
+            row = "%-10s" % format_size(block_size)
+            for algorithm in algorithms:
+                bytes_hashed, elapsed, mb_per_sec = measure_throughput(buffer, algorithm, block_size, threads, args.min_time)
+                row += "%12.1f" % mb_per_sec
+                if throughput_csv:
+                    print("%s,%s,%d,%d,%d,%.6f,%.3f" % (hostname, algorithm, block_size, threads, bytes_hashed, elapsed, mb_per_sec), file=throughput_csv)
+            print(row)
+            sys.stdout.flush()
+    if throughput_csv:
+        throughput_csv.close()
+        print("Saved  ==>  %s" % args.throughput_csv)
+    print("time_elapsed  = %.4f seconds  " % round(time.time()-start_time,4))
+    sys.exit(0)
+
+# Track the time spent generating data, hashing, formatting, and writing output
+# separately so the test measures CPU work rather than file handling.  When
+# --workers is greater than one these are summed across all of the workers.
+
+datagen_time = 0.0
+hash_time = 0.0
+format_time = 0.0
+io_time = 0.0
 
 # Function: compute_test_time(t)
 # Purpose: define a function to compute the elapsed test time.
@@ -53,73 +152,232 @@ compression_processes = args.compression_processes
 def compute_test_time(t):
     end_time=t
     elapsed_time=round(end_time-start_time,4)
-    if args.outfile:
-        print("--------------------------------------------------------------------------------", file=open(outfile + '.hashdata_dump', "a"))
-        print('',  file=open(outfile + '.hashdata_dump', "a"))
-        print('archive_path = ' + archive_path + '/' + outfile + '.summary_data.gz', file=open(outfile  + '.hashdata_dump', "a"))
-        print("time_elapsed = %.4f seconds  " % elapsed_time, file=open(outfile  + '.hashdata_dump', "a"))
+    compute_time=round(end_time-imports_done_time,4)
+    if args.outfile and output_format == 'text':
+        hashdata_dump.write(separator)
+        hashdata_dump.write('\n')
+        hashdata_dump.write('archive_path = ' + archive_path + '/' + outfile + '.summary_data' + compressed_file_suffix(compression_type) + '\n')
+        hashdata_dump.write("time_elapsed = %.4f seconds  \n" % elapsed_time)
+        hashdata_dump.write("compute_time = %.4f seconds  \n" % compute_time)
+        hashdata_dump.write("datagen_time = %.4f seconds  \n" % datagen_time)
+        hashdata_dump.write("hash_time    = %.4f seconds  \n" % hash_time)
+        hashdata_dump.write("format_time  = %.4f seconds  \n" % format_time)
+        hashdata_dump.write("io_time      = %.4f seconds  \n" % io_time)
+        if seed is not None:
+            hashdata_dump.write("seed         = %d  \n" % seed)
+        if workers > 1:
+            hashdata_dump.write("workers      = %d  \n" % workers)
+            hashdata_dump.write("records/sec  = %.1f  \n" % records_per_sec)
     else:
         print('')
         print("time_elapsed  = %.4f seconds  " % elapsed_time)
+        print("compute_time  = %.4f seconds  " % compute_time)
+        print("datagen_time  = %.4f seconds  " % datagen_time)
+        print("hash_time     = %.4f seconds  " % hash_time)
+        print("format_time   = %.4f seconds  " % format_time)
+        print("io_time       = %.4f seconds  " % io_time)
+        if seed is not None:
+            print("seed          = %d  " % seed)
+
+# Function: hash_record_range(first, last, hashdata_stream, summary_stream, record_writer)
+# Purpose: Generate and hash records first..last (inclusive), writing them to
+# the hashdata and summary streams.  Without --outfile, hashdata_stream is None
+# and the console format is written to summary_stream instead.  With
+# --output-format records, the raw data, salt, and digest of each record go to
+# record_writer and nothing is formatted.  The random data
+# and salts come from record_source() in bulk blocks, so generating a record
+# is a zero-copy slice, and with --seed record i is the same on every node.
+# Returns the datagen, hash, format, and I/O times.
+
+def hash_record_range(first, last, hashdata_stream, summary_stream, record_writer=None):
+    datagen_time = hash_time = format_time = io_time = 0.0
+    records = record_source(first, last, byte_size, seed)
+    for i in range(first, last + 1):
+        t0 = time.perf_counter()
+        a, salt = next(records)
+        t1 = time.perf_counter()
+        hasher = hashlib.blake2b(salt.encode())
+        hasher.update(a)
+        digest = hasher.digest()
+        t2 = time.perf_counter()
+        if record_writer is not None:
+            t3 = time.perf_counter()
+            write_record(record_writer, i, salt, digest, a)
+        elif hashdata_stream is not None:
+            hash_string = digest.hex()
+            hashdata_record = "count = %d\ninput size = %d bytes\n[START_DATA_BLOCK]\n%s\n[END_DATA_BLOCK]\n%s" % (i, byte_size, binascii.b2a_base64(a), separator)
+            summary_record = "count = %d\ninput data size = %d bytes\nsalt:  { %s }\nhash:  { %s }\n%s" % (i, byte_size, salt, hash_string, separator)
+            t3 = time.perf_counter()
+            hashdata_stream.write(hashdata_record)
+            summary_stream.write(summary_record)
+        else:
+            hash_string = digest.hex()
+            summary_record = "record count #  = %d\ninput file size = %d bytes\nsalt:  { %s }\nhash:  { %s }\n%s" % (i, byte_size, salt, hash_string, separator)
+            t3 = time.perf_counter()
+            summary_stream.write(summary_record)
+        t4 = time.perf_counter()
+        datagen_time += t1 - t0
+        hash_time += t2 - t1
+        format_time += t3 - t2
+        io_time += t4 - t3
+    return datagen_time, hash_time, format_time, io_time
+
+# Function: hash_shard(shard)
+# Purpose: Worker process entry point for --workers mode.  Hash one contiguous
+# shard of the record range into its own shard output files (or into a string
+# returned to the parent when writing to stdout) and report its throughput.
+
+def hash_shard(shard):
+    shard_number, first, last = shard
+    shard_start_time = time.perf_counter()
+    if args.outfile and output_format == 'records':
+        shard_writer = open_record_file(records_path + '.shard' + str(shard_number), record_metadata, buffer_size)
+        timings = hash_record_range(first, last, None, None, shard_writer)
+        t0 = time.perf_counter()
+        close_record_file(shard_writer)
+        timings = timings[:3] + (timings[3] + time.perf_counter() - t0,)
+        console_text = ''
+        shard_compression_stats = []
+    elif args.outfile:
+        shard_processes = max(1, compression_processes // workers)
+        hashdata_stream, hashdata_proc = open_output_stream(hashdata_dump_path + '.shard' + str(shard_number), compression_type, shard_processes, buffer_size)
+        summary_stream, summary_proc = open_output_stream(summary_data_path + '.shard' + str(shard_number), compression_type, shard_processes, buffer_size)
+        timings = hash_record_range(first, last, hashdata_stream, summary_stream)
+        t0 = time.perf_counter()
+        shard_compression_stats = [ close_output_stream(hashdata_stream, hashdata_proc), close_output_stream(summary_stream, summary_proc) ]
+        timings = timings[:3] + (timings[3] + time.perf_counter() - t0,)
+        console_text = ''
+    else:
+        summary_stream = io.StringIO()
+        timings = hash_record_range(first, last, None, summary_stream)
+        console_text = summary_stream.getvalue()
+        shard_compression_stats = []
+    shard_elapsed_time = time.perf_counter() - shard_start_time
+    return shard_number, first, last, shard_elapsed_time, timings, console_text, shard_compression_stats
 
 # Delete any pre-existing output files to prevent clashing.
+# Open one buffered stream per output file that compresses inline and writes
+# straight into archive_path.  With --output-format records, open a single
+# uncompressed record file instead: the random data doesn't compress, and the
+# file has to stay seekable.
 
-if args.outfile:
-    if os.path.isfile(archive_path + '/' + outfile + '.summary_data.gz'):
-        os.remove(archive_path + '/' + outfile + '.summary_data.gz')
-    if os.path.isfile(archive_path + '/' + outfile + '.hashdata_dump.gz'):
-        os.remove(archive_path + '/' + outfile + '.hashdata_dump.gz')
-    open(outfile + '.hashdata_dump', 'w')
-    open(outfile + '.summary_data', 'w')
+if args.outfile and output_format == 'records':
+    import socket
+    t0 = time.perf_counter()
+    if not os.path.isdir(archive_path):
+        os.makedirs(archive_path)
+    records_path = archive_path + '/' + outfile + RECORD_SUFFIX
+    if os.path.isfile(records_path):
+        os.remove(records_path)
+    record_metadata = { 'kind': 'hashtest', 'hash': 'blake2b', 'encoding': 'raw', 'byte_size': byte_size, 'count': count, 'seed': seed, 'hostname': socket.gethostname(), 'datestamp': datestamp }
+    if workers == 1:
+        record_writer = open_record_file(records_path, record_metadata, buffer_size)
+    io_time += time.perf_counter() - t0
+elif args.outfile:
+    t0 = time.perf_counter()
+    if not os.path.isdir(archive_path):
+        os.makedirs(archive_path)
+    hashdata_dump_path = archive_path + '/' + outfile + '.hashdata_dump' + compressed_file_suffix(compression_type)
+    summary_data_path = archive_path + '/' + outfile + '.summary_data' + compressed_file_suffix(compression_type)
+    for stale_file in [ hashdata_dump_path, summary_data_path ]:
+        if os.path.isfile(stale_file):
+            os.remove(stale_file)
+    if workers == 1:
+        hashdata_dump, hashdata_dump_proc = open_output_stream(hashdata_dump_path, compression_type, compression_processes, buffer_size)
+        summary_data, summary_data_proc = open_output_stream(summary_data_path, compression_type, compression_processes, buffer_size)
+    io_time += time.perf_counter() - t0
 
 # Generate a random string and hash it with a randomly generated salt.
 # Append the salt, hash, and the random data string to output files if --outfile
 # was invoked.
+#
+# With --workers N, split the record range into N contiguous shards, hash them
+# in a pool of forked worker processes, and merge the shard outputs in record
+# order so the numbering matches the serial output.
 
-for i in range(1, count + 1):
-    a = os.urandom(byte_size)
-    salt = uuid.uuid4().hex
-    if args.outfile:
-        print ("count =", i, file=open(outfile + '.hashdata_dump', "a"))
-        print ("input size =", byte_size, "bytes", file=open(outfile + '.hashdata_dump', "a"))
-        print ("[START_DATA_BLOCK]", file=open(outfile + '.hashdata_dump', "a"))
-        print (binascii.b2a_base64(a), file=open(outfile + '.hashdata_dump', "a"))
-        print ("[END_DATA_BLOCK]", file=open(outfile + '.hashdata_dump', "a"))
-        print ("--------------------------------------------------------------------------------", file=open(outfile + '.hashdata_dump', "a"))
-        print ("count =", i, file=open(outfile + '.summary_data', "a"))
-        print ("input data size =", byte_size, "bytes", file=open(outfile + '.summary_data', "a"))
-        print ("salt: ", "{", salt, "}", file=open(outfile + '.summary_data', "a"))
-        print ("hash: ", "{", hashlib.blake2b(salt.encode() + a).hexdigest(), "}", file=open(outfile + '.summary_data', "a"))
-        print ("--------------------------------------------------------------------------------", file=open(outfile + '.summary_data', "a"))
+hashing_start_time = time.perf_counter()
+compression_stats = []
+if workers == 1:
+    if args.outfile and output_format == 'records':
+        timings = hash_record_range(1, count, None, None, record_writer)
+    elif args.outfile:
+        timings = hash_record_range(1, count, hashdata_dump, summary_data)
     else:
-        print ("record count #  =", i)
-        print ("input file size =", byte_size, "bytes")
-        print ("salt: ", "{", salt, "}")
-        print ("hash: ", "{", hashlib.blake2b(salt.encode() + a).hexdigest(), "}")
-        print ("--------------------------------------------------------------------------------")
+        timings = hash_record_range(1, count, None, sys.stdout)
+    datagen_time, hash_time, format_time, io_time = timings[0], timings[1], timings[2], io_time + timings[3]
+else:
+    shard_size, remainder = divmod(count, workers)
+    shards = []
+    first = 1
+    for shard_number in range(workers):
+        last = first + shard_size - 1 + (1 if shard_number < remainder else 0)
+        shards.append((shard_number, first, last))
+        first = last + 1
+    with multiprocessing.get_context('fork').Pool(workers) as pool:
+        shard_results = pool.map(hash_shard, shards)
+    for shard_number, first, last, shard_elapsed_time, timings, console_text, shard_compression_stats in shard_results:
+        compression_stats.extend(shard_compression_stats)
+        datagen_time += timings[0]
+        hash_time += timings[1]
+        format_time += timings[2]
+        io_time += timings[3]
+        if console_text:
+            sys.stdout.write(console_text)
+    if args.outfile and output_format == 'records':
+        t0 = time.perf_counter()
+        merge_record_files(records_path, [ records_path + '.shard' + str(shard[0]) for shard in shards ], buffer_size)
+        io_time += time.perf_counter() - t0
+    elif args.outfile:
+        t0 = time.perf_counter()
+        concatenate_output_files(hashdata_dump_path, [ hashdata_dump_path + '.shard' + str(shard[0]) for shard in shards ], buffer_size)
+        concatenate_output_files(summary_data_path, [ summary_data_path + '.shard' + str(shard[0]) for shard in shards ], buffer_size)
+        hashdata_dump, hashdata_dump_proc = open_output_stream(hashdata_dump_path, compression_type, compression_processes, buffer_size, append=True)
+        io_time += time.perf_counter() - t0
+hashing_elapsed_time = time.perf_counter() - hashing_start_time
+records_per_sec = count / hashing_elapsed_time if hashing_elapsed_time > 0 else 0.0
 
 # Compute the elapsed test time.
 # Print the result to the console and append to outfile (if defined).
 
 compute_test_time(time.time())
 
-# Compress the output files and move them to archive_path.
+# Flush and close the output streams, which finishes compressing them in place.
+# Report the final I/O time including the compression flush to the console,
+# along with the raw and compressed sizes and the compression throughput.
+# Streams compress concurrently, so the slowest one sets the throughput.
 
-if args.outfile:
-    if not os.path.isdir(archive_path):
-        os.makedirs(archive_path)
-    files_to_compress = [ outfile + '.summary_data', outfile + '.hashdata_dump' ]
-    for compfile in files_to_compress:
-        try:
-            with open(compfile) as file:
-                if (compression_type) == "pigz":
-                    cmd_string = 'pigz -f --processes ' + str(compression_processes)  + ' ' + compfile
-                    subprocess.run(str(cmd_string), shell=True)
-                if (compression_type) == "gzip":
-                    f_in=open(compfile, 'rb')
-                    f_out=gzip.open(compfile + '.gz', 'wb')
-                    shutil.copyfileobj(f_in, f_out)
-        except IOError:
-            pass
-    for compfile in files_to_compress:
-        shutil.move(compfile + '.gz', archive_path + '/' + compfile + '.gz')
+if args.outfile and output_format == 'records':
+    t0 = time.perf_counter()
+    if workers == 1:
+        close_record_file(record_writer)
+    io_time += time.perf_counter() - t0
+    print("records_file  = %s (%d bytes)" % (records_path, os.path.getsize(records_path)))
+    print("time_elapsed  = %.4f seconds  " % round(time.time()-start_time,4))
+    print("hash_time     = %.4f seconds  " % hash_time)
+    print("format_time   = %.4f seconds  " % format_time)
+    print("io_time       = %.4f seconds  " % io_time)
+elif args.outfile:
+    t0 = time.perf_counter()
+    compression_stats.append(close_output_stream(hashdata_dump, hashdata_dump_proc))
+    if workers == 1:
+        compression_stats.append(close_output_stream(summary_data, summary_data_proc))
+    io_time += time.perf_counter() - t0
+    compression_stats = [ stats for stats in compression_stats if stats is not None ]
+    print("hashdata_dump = %s" % hashdata_dump_path)
+    print("summary_data  = %s" % summary_data_path)
+    print("time_elapsed  = %.4f seconds  " % round(time.time()-start_time,4))
+    print("hash_time     = %.4f seconds  " % hash_time)
+    print("format_time   = %.4f seconds  " % format_time)
+    print("io_time       = %.4f seconds  " % io_time)
+    if compression_stats:
+        print("compression   = %s" % compression_report(sum(stats[0] for stats in compression_stats), sum(stats[1] for stats in compression_stats), max(stats[2] for stats in compression_stats)))
+
+# Report the hashing throughput for each worker and for the whole job so
+# scaling can be compared across instance types.
+
+if workers > 1:
+    print("--------------------------------------------------------------------------------")
+    print("worker  records            time (sec)   records/sec")
+    for shard_number, first, last, shard_elapsed_time, timings, console_text, shard_compression_stats in shard_results:
+        print("%6d  %8d-%-8d  %10.4f   %11.1f" % (shard_number, first, last, shard_elapsed_time, (last - first + 1) / shard_elapsed_time))
+    print("total   %8d-%-8d  %10.4f   %11.1f" % (1, count, hashing_elapsed_time, records_per_sec))
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+#
+################################################################################
+# Name:		ingest_results.py
+# Author:	Rodney Marable <rodney.marable@gmail.com>
+# Created On:	October 17, 2026
+# Last Changed:	October 17, 2026
+# Purpose:	Incrementally load bang.sh and bang.py summary CSV files into the
+#		SQLite results store
+################################################################################
+#
+# Usage:
+# $ ingest_results.py [-h] [--cluster-name CLUSTER_NAME] [--results-db RESULTS_DB]
+#                     [--raw-summary-dir RAW_SUMMARY_DIR]
+#                     [--instance-type INSTANCE_TYPE]
+#                     [--export EXPORT] [--export-format {standalone,sge}]
+#
+# Examples:
+# $ ./ingest_results.py
+# $ ./ingest_results.py --cluster-name t2-xlarge --instance-type t2.xlarge
+# $ ./ingest_results.py --cluster-name rmarable-dev01 --export sge_job_data/rmarable-dev01.csv --export-format sge
+#
+# Only raw summary files that are new or have changed since the last run are
+# read, and only data points that are not already in the store are added, so
+# it is safe to run this after every job.
+################################################################################
+
+# Import the required Python libraries.
+
+import argparse
+import csv
+import os
+import sys
+
+# Import the shared hpc_performance results store.
+
+from results_store import RESULTS_DB
+from results_store import ingest_results
+from results_store import open_results_store
+from results_store import query_summary
+
+# Parse the command line.
+
+parser = argparse.ArgumentParser(description='Incrementally load bang.sh and bang.py summary CSV files into the SQLite results store')
+parser.add_argument('--cluster-name', '-N', help='only ingest and export data for this cluster stack or standalone instance (default = all)', required=False)
+parser.add_argument('--results-db', '-R', help='path to the results store (default = %s)' % RESULTS_DB, required=False, default=RESULTS_DB)
+parser.add_argument('--raw-summary-dir', help='directory holding the raw summary CSV files (default = csv/summary_raw)', required=False, default='csv/summary_raw')
+parser.add_argument('--instance-type', '-I', help='EC2 instance type to record for newly seen clusters (default = none)', required=False)
+parser.add_argument('--export', '-E', help='write the data points in the store to this CSV file after ingesting', required=False)
+parser.add_argument('--export-format', help='column layout of the exported CSV file: standalone (summary_final/) or sge (sge_job_data/) (default = standalone)', required=False, default='standalone', choices=['standalone', 'sge'])
+
+args = parser.parse_args()
+cluster_name = args.cluster_name.replace('.', '-') if args.cluster_name else None
+
+if not os.path.isdir(args.raw_summary_dir):
+    print("*** ERROR *** Raw summary directory not found:", args.raw_summary_dir)
+    print("Aborting...")
+    sys.exit(1)
+
+# Ingest the raw summary files.
+
+conn = open_results_store(args.results_db)
+files_found, files_read, added = ingest_results(conn, args.raw_summary_dir, cluster_name, args.instance_type)
+print("Found %d raw summary files, read %d new or changed files, and added %d data points to %s" % (files_found, files_read, added, args.results_db))
+
+# Export the data points in the column order of the summary_final/ files read
+# by make_standalone_plots.py, or of the sge_job_data/ files written by
+# rebuild_sge_csv.sh.
+
+if args.export:
+    rows = query_summary(conn, [ cluster_name ] if cluster_name else None)
+    with open(args.export, 'w', newline='') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        if args.export_format == 'standalone':
+            writer.writerow([ 'cluster_name', 'cluster_jobID', 'matrix_size', 'compute_time', 'raw_log_size_bytes', 'gzip_log_size_bytes', 'fileproc_time' ])
+            for row in rows:
+                writer.writerow([ '' if value is None else value for value in row[:7] ])
+        else:
+            writer.writerow([ 'cluster_jobID', 'task_id', 'matrix_size', 'compute_time', 'cluster_name' ])
+            for row in rows:
+                writer.writerow([ row[1], row[7], row[2], row[3], row[0] ])
+    print("Saved  ==>  %s" % args.export)
+conn.close()
+
+# Cleanup and exit.
+
+sys.exit(0)
@@ -4,9 +4,9 @@
 # Name:		make_sge_cluster_plots.py
 # Author:	Rodney Marable <rodney.marable@gmail.com>
 # Created On:	February 23, 2018
-# Last Changed: April 23, 2018
+# Last Changed: October 17, 2026
 # Purpose:	Make PNG plots using performance data gathered from bang.sh
-#		jobs running on Grid Engine-based cluster stacks
+#		jobs running on Grid Engine and Slurm cluster stacks
 ################################################################################
 #
 # Generate a timestamp to give the plot a unique filename.
@@ -17,31 +17,18 @@ plotfile = 'plot_sge_job_data.' + timestamp + '.png'
 
 # Import some required Python libraries.
 
-import argparse
 import glob
-import matplotlib as mpl
-import numpy as np
 import os
-import pandas as pd
 import pathlib
-import requests
 import sys
 
-# Determine if we are running on an EC2 instance to ensure the Python
-# libraries required for plotting the graphs are loaded with the correct
-# backend.
-
-try:
-    r = requests.get('http://169.254.169.254/latest/meta-data/instance-id', timeout = 2)
-    ec2_instance_status = 'True'
-    mpl.use('Agg')
-except requests.exceptions.RequestException as e:
-    ec2_instance_status = 'False'
-
-# Import the Python libraries required to plot the graphs.
+# Determine whether the plot can be displayed or only saved (EC2 instances
+# are headless by default) so matplotlib is loaded with the correct backend.
+# This uses environment variables and /sys rather than a network probe, so
+# it adds almost nothing to the startup time.
 
-import matplotlib.pyplot as plt
-import seaborn as sns
+from plot_engine import detect_headless
+headless = detect_headless()
 
 # Create a directory to store the plots.
 
@@ -54,33 +41,64 @@ pathlib.Path('plots').mkdir(parents=True, exist_ok=True)
 for line in open("MATRIX_SIZES.conf"):
     if "MATRIX_SIZES=\"" in line:
         MATRIX_SIZES = line
-             
+
+# Collect the Grid Engine job data files from sge_job_data/ and the Slurm job
+# data files from slurm_job_data/.  Only the per-job files written by the
+# combine_*_data_files_for_plotting.sh scripts (JOB_HEADER) are plotted; the
+# per-matrix-size files that rebuild_sge_csv.sh also writes to sge_job_data/
+# have a different layout and are skipped.  Exit before loading the plotting
+# libraries if there is nothing to plot.
+
+from sge_accounting import JOB_HEADER
+
+datafiles = []
+for datafile in sorted(glob.glob('sge_job_data/*.csv')) + sorted(glob.glob('slurm_job_data/*.csv')):
+    with open(datafile) as f:
+        header = f.readline().strip()
+    if header == JOB_HEADER:
+        datafiles.append(datafile)
+    else:
+        print("Skipping %s (not a job data file)" % datafile)
+if not datafiles:
+    print("No job data files were found in sge_job_data/ or slurm_job_data/.")
+    print("Exiting...")
+    sys.exit(1)
+
+# Import the Python libraries required to plot the graphs.
+
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import seaborn as sns
+
 # Create Pandas data frames from the CSV summary file.
 # Generate x-y regression plots from the data frames.
 # Set the x- and y-axis maximum values based on the data to be plotted.
 # Use dynamic markers.
+# Both job data directories have the columns written by parse_sge_accounting.py
+# and parse_slurm_accounting.py, so the clusters can be compared on one plot.
 
-os.chdir('sge_job_data/')
 plt.figure(figsize=(11.5,8))
 valid_markers = mpl.markers.MarkerStyle.filled_markers
 x_axis_max = []
 y_axis_max = []
 
-for datafile in glob.iglob("*.csv"):
+for datafile in datafiles:
     df = pd.read_csv(datafile, delimiter=',')
-    df['task_array_size'] = df[df.columns[3:4]]
-    df['sge_queue_wait_time'] = df[df.columns[4:5]]/3600
-    df['sge_job_execute_time'] = df[df.columns[5:6]]/3600
-    df['total_compute_time'] = df[df.columns[6:7]]/3600
+    df['sge_queue_wait_time'] = df['sge_queue_wait_time']/3600
+    df['sge_job_execute_time'] = df['sge_job_execute_time']/3600
+    df['total_compute_time'] = df['total_run_time']/3600
     x_axis_max.append(max(df['total_compute_time']))
     y_axis_max.append(max(df['task_array_size']))
-    datafile=datafile.replace('.job_Axb_random.',', jobID = ').replace('.csv', '').split(".",1 )[0]
+    scheduler = 'slurm' if datafile.startswith('slurm_job_data/') else 'sge'
+    datafile=os.path.basename(datafile).replace('.job_Axb_random.',', jobID = ').replace('.csv', '').split(".",1 )[0] + ' (' + scheduler + ')'
     markers = np.random.choice(valid_markers, df.shape[1], replace=False)
-    sns.regplot('total_compute_time', 'task_array_size', data=df, order=2, fit_reg=True, truncate=True, ci=None, label=datafile, marker=markers[1], scatter_kws={'s':15})
+    sns.regplot(x='total_compute_time', y='task_array_size', data=df, order=2, fit_reg=True, truncate=True, ci=None, label=datafile, marker=markers[1], scatter_kws={'s':15})
 
 # Format the plot title, legend, and axes.
 
-os.chdir('../plots/')
+os.chdir('plots/')
 plt.title('HPC Cluster Performance Data Generated With bang.sh and Axb_random.py \n%s' % (MATRIX_SIZES), weight='bold')
 407
 #plt.legend(loc='best', fontsize='small', markerscale=0.75, title=datafile)
@@ -104,7 +122,7 @@ plt.minorticks_on()
 
 plt.savefig(plotfile, format='png')
 print("")
-if ec2_instance_status == 'False':
+if not headless:
     print("Now displaying  ===>   plots/%s" % plotfile)
     print("")
     print("Please close the Python window to regain control of ths shell.")
@@ -4,111 +4,41 @@
 # Name:		make_standalone_plots.py
 # Author:	Rodney Marable <rodney.marable@gmail.com>
 # Created On:	February 21, 2018
-# Last Changed: April 22, 2018
+# Last Changed: October 17, 2026
 # Purpose:	Make plots with bang.sh data generated on standalone instances
 #		unifying compute_time and fileproc_time as a single line
 ################################################################################
 
-# Generate a timestamp to give the plot a unique filename.
+# Start the job timer.
 
 import time
-timestamp = time.strftime("%d-%b-%Y-%H:%M:%S", time.localtime())
-plotfile = 'plot_unified_standalone.' + timestamp + '.png'
+start_time=time.time()
 
-# Import some required Python libraries.
+# Parse the plot variants to render from the command line.  All variants are
+# rendered from a single load of the summary_final/ CSV files, or of the
+# results store built by ingest_results.py when --results-db is given.
 
 import argparse
-import glob
-import matplotlib as mpl
-import numpy as np
-import os
-import pandas as pd
-import pathlib
-import requests
-import sys
-
-# Determine if we are running on an EC2 instance to ensure the Python libraries
-# required for plotting the graphs are loaded with the correct backend.
-
-try:
-    r = requests.get('http://169.254.169.254/latest/meta-data/instance-id', timeout = 2)
-    ec2_instance_status = 'True'
-    mpl.use('Agg')
-except requests.exceptions.RequestException as e:
-    ec2_instance_status = 'False'
-
-# Import the Python libraries required for graph plotting.
-
-import matplotlib.pyplot as plt
-import seaborn as sns
-
-# Create a directory to hold the plots.
-
-print("")
-print("Generating graphs of the CSV data files generated from bang.sh...")
-pathlib.Path('plots').mkdir(parents=True, exist_ok=True)
-
-# Parse the sizes of the tested matrices for the plot title.
-
-for line in open("MATRIX_SIZES.conf"):
-   if "MATRIX_SIZES=\"" in line:
-       MATRIX_SIZES = line
-
-# Create Pandas data frames from the CSV input file.
-# Generate x-y regression plots from the data frames using random markers.
-# Time is measured in minutes.  Adjust as needed when running longer tests.
-
-os.chdir('summary_final/')
-plt.figure(figsize=(11.5,8))
-valid_markers = mpl.markers.MarkerStyle.filled_markers
-x_axis_max = []
-y_axis_max = []
-
-for datafile in glob.iglob("*.csv"):
-    df = pd.read_csv(datafile, delimiter=',')
-    df['task_array_size'] = df[df.columns[2:3]]
-    df['compute_time'] = df[df.columns[3:4]]/3600
-    df['fileproc_time'] = df[df.columns[6:7]]/3600
-    df['total_compute_time'] = df['compute_time'] + df['fileproc_time']
-    datafile=datafile.replace('summary.','').split(".",1 )[0]
-    x_axis_max.append(max(df['total_compute_time']))
-    y_axis_max.append(max(df['task_array_size']))
-    markers = np.random.choice(valid_markers, df.shape[1], replace=False)
-    plt.plot('total_compute_time', 'task_array_size', data=df, label=datafile, marker=markers[1], markersize=5, linestyle='None')
-
-# Format the plot.
-
-os.chdir('../plots/')
-plt.title('Standalone Instance Random Matrix Computation and Data File Processing Performance\nGenerated Using bang.sh and Axb_random.py\n%s' % (MATRIX_SIZES), weight='bold')
-plt.legend(loc='best', fontsize='small', markerscale=0.8, title='DataSource_InstanceType')
-plt.xlabel('Total Compute Time (Hours)', fontweight='bold')
-plt.ylabel('Matrix Dimensions (N x N)', fontweight='bold')
-plt.xlim(xmin=0)
-plt.ylim(ymin=0)
-plt.tight_layout()
-
-# Set the axes ticks based on the max values of N and total_compute_time.
-# Adjust as needed when more or less resolution is required.
-
-plt.xticks(np.arange(0, max(x_axis_max)+0.25, 0.25))
-plt.yticks(np.arange(0, max(y_axis_max)+1000, 1000))
-plt.minorticks_on()
+from plot_engine import PLOT_VARIANTS
+from plot_engine import make_standalone_plots
+
+parser = argparse.ArgumentParser(description='Make plots with bang.sh data generated on standalone instances')
+parser.add_argument('--variants', '-V', help='comma-separated list of plots to render: %s, or all (default = unified)' % ', '.join(PLOT_VARIANTS), required=False, default='unified')
+parser.add_argument('--hourly-rate', '-H', help='instance price in $/hour for the cost plots when an instance type is not in the price cache (default = 0.085)', required=False, type=float, default=0.085)
+parser.add_argument('--price-cache', '-P', help='price cache maintained by update_price_cache.py (default = prices.json)', required=False, default='prices.json')
+parser.add_argument('--market', '-M', help='price the cost plots with ondemand or spot prices (default = ondemand)', required=False, default='ondemand', choices=['ondemand', 'spot'])
+parser.add_argument('--region', help='AWS Region whose prices are used for the cost plots (default = first cached Region with a price)', required=False)
+parser.add_argument('--startup-budget', '-B', help='warn when detecting the display and loading the data takes longer than this many seconds (default = 1.0)', required=False, type=float, default=1.0)
+parser.add_argument('--results-db', '-R', help='read the data points from this results store instead of the summary_final/ CSV files', required=False)
+args = parser.parse_args()
+if args.variants == 'all':
+    variants = list(PLOT_VARIANTS)
+else:
+    variants = [ variant for variant in args.variants.split(',') if variant ]
+for variant in variants:
+    if variant not in PLOT_VARIANTS:
+        parser.error('unknown plot variant: %s' % variant)
 
-# Save the plot as a PNG file to the plots/ subdirectory.
-# Display the plot in a popup window if this isn't an EC2 instance (which will
-# be headless by default).
+# Load the summary data and render the plots to the plots/ subdirectory.
 
-plt.savefig(plotfile, format='png')
-print("")
-if ec2_instance_status == 'False':
-    print("Now displaying  ===>   plots/%s" % plotfile)
-    print("")
-    print("Please close the Python window to regain control of ths shell.")
-    plt.show()
-else:
-    print("Creating and saving  ==>  plots/%s" % plotfile)
-    print("")
-    print("Copy this file onto your local machine to view.")
-    print("Exiting...")
-    print("")
-    sys.exit("")
+make_standalone_plots(variants, args.hourly_rate, results_db=args.results_db, start_time=start_time, startup_budget=args.startup_budget, price_cache=args.price_cache, market=args.market, region=args.region)
@@ -0,0 +1,63 @@
+################################################################################
+# Name:		output_streams.py
+# Author:	Rodney Marable <rodney.marable@gmail.com>
+# Created On:	October 17, 2026
+# Last Changed:	October 17, 2026
+# Purpose:	Buffered, optionally compressed output streams shared by the
+#		hpc_performance toolkit scripts
+################################################################################
+
+########################
+# Function definitions #
+########################
+
+# Function: open_output_stream()
+# Purpose: Open a single buffered text stream that writes to path, compressing
+# inline with the threaded parallel_gzip compressor as data arrives.  pigz is
+# accepted as an alias for gzip so existing job scripts keep working without
+# pigz installed.  Returns the stream and the compressor future (None when
+# compression_type is none).
+# With append=True, compressed output is added to path as new gzip members.
+
+def open_output_stream(path, compression_type='gzip', compression_processes=8, buffer_size=1048576, append=False):
+    import io
+    from parallel_gzip import open_compressed_stream
+    if compression_type in ('gzip', 'pigz'):
+        f_out, compressor = open_compressed_stream(path, compression_processes, buffer_size, append=append)
+        return io.TextIOWrapper(f_out, encoding='utf-8'), compressor
+    return open(path, 'a' if append else 'w', buffering=buffer_size, encoding='utf-8'), None
+
+# Function: close_output_stream()
+# Purpose: Flush and close a stream returned by open_output_stream() and wait
+# for the compressor to finish writing the compressed file.
+# Returns (raw_bytes, compressed_bytes, elapsed_seconds) for compressed streams
+# and None otherwise.
+
+def close_output_stream(stream, proc=None):
+    stream.close()
+    if proc is not None:
+        return proc.result()
+    return None
+
+# Function: concatenate_output_files()
+# Purpose: Merge shard files written by open_output_stream() into path in the
+# order given and delete the shards.  Concatenated gzip members form a valid
+# gzip file, so compressed shards are merged without recompressing them.
+
+def concatenate_output_files(path, shard_paths, buffer_size=1048576):
+    import os
+    import shutil
+    with open(path, 'wb') as f_out:
+        for shard_path in shard_paths:
+            with open(shard_path, 'rb') as f_in:
+                shutil.copyfileobj(f_in, f_out, buffer_size)
+            os.remove(shard_path)
+
+# Function: compressed_file_suffix()
+# Purpose: Return the file suffix written by open_output_stream() for the
+# selected compression type.
+
+def compressed_file_suffix(compression_type):
+    if compression_type in ('gzip', 'pigz'):
+        return '.gz'
+    return ''
@@ -0,0 +1,123 @@
+################################################################################
+# Name:		parallel_gzip.py
+# Author:	Rodney Marable <rodney.marable@gmail.com>
+# Created On:	October 17, 2026
+# Last Changed:	October 17, 2026
+# Purpose:	Threaded, block-parallel gzip compression for the hpc_performance
+#		toolkit scripts
+################################################################################
+
+########################
+# Function definitions #
+########################
+
+# Function: compress_block()
+# Purpose: Compress one block into a complete gzip member.  zlib releases the
+# GIL while it compresses, so blocks submitted to a thread pool are compressed
+# on separate CPUs.
+
+def compress_block(block, level=6):
+    import zlib
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress(block) + compressor.flush()
+
+# Function: compress_stream()
+# Purpose: Read f_in in block_size blocks until EOF, compress the blocks on a
+# pool of threads, and write them to f_out in input order.  Each block becomes
+# its own gzip member; concatenated members form a standard gzip file that
+# gunzip, zcat, and Python's gzip module read as one stream.  At most two
+# blocks per thread are in flight, so memory use stays flat for any input size.
+# Returns (raw_bytes, compressed_bytes, elapsed_seconds).
+
+def compress_stream(f_in, f_out, threads=8, block_size=1048576, level=6):
+    import collections
+    import concurrent.futures
+    import time
+    start_time = time.perf_counter()
+    raw_bytes = 0
+    compressed_bytes = 0
+    pending = collections.deque()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, threads)) as pool:
+        while True:
+            block = f_in.read(block_size)
+            if block:
+                raw_bytes += len(block)
+                pending.append(pool.submit(compress_block, block, level))
+            while pending and (len(pending) >= 2 * max(1, threads) or not block):
+                member = pending.popleft().result()
+                f_out.write(member)
+                compressed_bytes += len(member)
+            if not block:
+                break
+    if raw_bytes == 0:
+        member = compress_block(b'', level)
+        f_out.write(member)
+        compressed_bytes += len(member)
+    f_out.flush()
+    return raw_bytes, compressed_bytes, time.perf_counter() - start_time
+
+# Function: compress_file()
+# Purpose: Compress path to gz_path (default path + '.gz') like "gzip -f",
+# removing path afterwards unless keep=True.
+# Returns (raw_bytes, compressed_bytes, elapsed_seconds).
+
+def compress_file(path, gz_path=None, threads=8, block_size=1048576, level=6, keep=False):
+    import os
+    if gz_path is None:
+        gz_path = path + '.gz'
+    with open(path, 'rb') as f_in, open(gz_path, 'wb') as f_out:
+        stats = compress_stream(f_in, f_out, threads, block_size, level)
+    if not keep:
+        os.remove(path)
+    return stats
+
+# Function: open_compressed_stream()
+# Purpose: Return a binary file object that compresses everything written to
+# it into path, together with a future for the background compressor.  Data
+# flows through an OS pipe to compress_stream() running on its own thread.
+# Close the file object, then call future.result() to wait for the compressor
+# and get (raw_bytes, compressed_bytes, elapsed_seconds).
+# With append=True, the compressed output is added to path as new members.
+
+def open_compressed_stream(path, threads=8, block_size=1048576, level=6, append=False):
+    import concurrent.futures
+    import os
+    read_fd, write_fd = os.pipe()
+    f_out = open(path, 'ab' if append else 'wb')
+    def run_compressor():
+        with os.fdopen(read_fd, 'rb') as f_in, f_out:
+            return compress_stream(f_in, f_out, threads, block_size, level)
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(run_compressor)
+    executor.shutdown(wait=False)
+    return os.fdopen(write_fd, 'wb', buffering=block_size), future
+
+# Function: compression_report()
+# Purpose: Format raw and compressed sizes, the compression ratio, and the
+# throughput in MB/s of raw input for console and log output.
+
+def compression_report(raw_bytes, compressed_bytes, elapsed_seconds):
+    ratio = raw_bytes / compressed_bytes if compressed_bytes > 0 else 0.0
+    rate = raw_bytes / 1048576 / elapsed_seconds if elapsed_seconds > 0 else 0.0
+    return "raw = %d bytes, compressed = %d bytes, ratio = %.2f, rate = %.1f MB/s" % (raw_bytes, compressed_bytes, ratio, rate)
+
+# Function: archive_logfiles()
+# Purpose: Compress the Axb_random.py logfile JOBID.log into
+# log_dir/JOBID.N.log.gz and move any binary matrix data files written with
+# --log-format (JOBID.*.npy, JOBID.npz) alongside it.  The data files are
+# already binary (npz is compressed as it is written), so they are moved as-is
+# and count toward both sizes.
+# Returns (raw_log_size_bytes, compressed_log_size_bytes, raw, compressed,
+# elapsed) where the last three describe the logfile compression alone.
+
+def archive_logfiles(cluster_jobid, matrix_size, log_dir='logs', threads=8):
+    import glob
+    import os
+    import shutil
+    matrix_data_files = sorted(glob.glob(cluster_jobid + ".*.npy")) + sorted(glob.glob(cluster_jobid + ".npz"))
+    matrix_data_size_bytes = sum(os.path.getsize(matrix_data_file) for matrix_data_file in matrix_data_files)
+    raw_bytes, compressed_bytes, compression_time = compress_file(cluster_jobid + '.log', threads=threads)
+    shutil.move(cluster_jobid + '.log.gz', log_dir + '/' + cluster_jobid + '.' + str(matrix_size) + '.log.gz')
+    for matrix_data_file in matrix_data_files:
+        shutil.move(matrix_data_file, log_dir + '/' + cluster_jobid + '.' + str(matrix_size) + matrix_data_file[len(cluster_jobid):])
+    return raw_bytes + matrix_data_size_bytes, compressed_bytes + matrix_data_size_bytes, raw_bytes, compressed_bytes, compression_time
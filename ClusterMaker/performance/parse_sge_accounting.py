@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+#
+################################################################################
+# Name:		parse_sge_accounting.py
+# Author:	Rodney Marable <rodney.marable@gmail.com>
+# Created On:	October 17, 2026
+# Last Changed:	October 17, 2026
+# Purpose:	Generate the sge_job_data CSV files for make_sge_cluster_plots.py
+#		from a single pass over the Grid Engine accounting file
+################################################################################
+#
+# Usage:
+# $ parse_sge_accounting.py [-h] --cluster-name CLUSTER_NAME --output OUTPUT
+#                           [--job-ids JOB_IDS] [--job-name JOB_NAME]
+#                           [--accounting ACCOUNTING] [--task-output TASK_OUTPUT]
+#
+# Examples:
+# $ ./parse_sge_accounting.py --cluster-name rmarable-dev01 --job-ids 12,13 --output sge_job_data/rmarable-dev01.csv
+# $ ./parse_sge_accounting.py --cluster-name rmarable-dev01 --job-name job_Axb_random --output all_jobs.csv
+#
+# This replaces one "qacct -j JOB_ID" call per job, each of which rescans the
+# whole accounting file, with a single streaming read that aggregates every
+# requested job and task.
+################################################################################
+
+# Import the required Python libraries.
+
+import argparse
+import os
+import sys
+
+# Import the shared hpc_performance Grid Engine accounting parser.
+
+from sge_accounting import JOB_HEADER
+from sge_accounting import TASK_HEADER
+from sge_accounting import job_rows
+from sge_accounting import read_accounting
+from sge_accounting import task_rows
+
+# Parse the command line.
+# The accounting file defaults to $SGE_ROOT/$SGE_CELL/common/accounting.
+
+default_accounting = os.path.join(os.environ.get('SGE_ROOT', '/opt/sge'), os.environ.get('SGE_CELL', 'default'), 'common', 'accounting')
+parser = argparse.ArgumentParser(description='Generate the sge_job_data CSV files from a single pass over the Grid Engine accounting file')
+parser.add_argument('--cluster-name', '-N', help='name of the cluster - must match CLUSTER_NAME as defined in bang.sh', required=True)
+parser.add_argument('--output', '-o', help='per-job CSV file to write', required=True)
+parser.add_argument('--job-ids', '-j', help='comma-separated list of job IDs to include (default = all jobs matching --job-name)', required=False)
+parser.add_argument('--job-name', '-n', help='only include jobs with this name (default = job_Axb_random unless --job-ids is given)', required=False)
+parser.add_argument('--accounting', '-A', help='path to the Grid Engine accounting file (default = %s)' % default_accounting, required=False, default=default_accounting)
+parser.add_argument('--task-output', '-t', help='also write one row per array task (qsub, start, and end times, slots, cpu, maxvmem) to this CSV file', required=False)
+
+args = parser.parse_args()
+cluster_name = args.cluster_name
+job_ids = set(job_id.strip() for job_id in args.job_ids.split(',') if job_id.strip()) if args.job_ids else None
+job_name = args.job_name if args.job_name or job_ids else 'job_Axb_random'
+
+if not os.path.isfile(args.accounting):
+    print("*** ERROR *** Grid Engine accounting file not found:", args.accounting)
+    print("Aborting...")
+    sys.exit(1)
+
+# Read the accounting file once and aggregate the requested jobs.
+# Warn about job IDs that have no accounting records yet (still running).
+
+with open(args.accounting, errors='replace') as f:
+    jobs = read_accounting(f, job_ids, job_name)
+for job_id in sorted(job_ids or [], key=int):
+    if job_id not in jobs:
+        print("*** WARNING *** No accounting records found for job %s" % job_id)
+
+# Write the per-job CSV file and, if requested, the per-task CSV file.
+
+with open(args.output, 'w') as f:
+    print(JOB_HEADER, file=f)
+    for row in job_rows(jobs, cluster_name):
+        print(row, file=f)
+print("Saved  ===>  %s (%d jobs)" % (args.output, len(jobs)))
+if args.task_output:
+    rows = task_rows(jobs, cluster_name)
+    with open(args.task_output, 'w') as f:
+        print(TASK_HEADER, file=f)
+        for row in rows:
+            print(row, file=f)
+    print("Saved  ===>  %s (%d tasks)" % (args.task_output, len(rows)))
+
+# Cleanup and exit.
+
+sys.exit(0)
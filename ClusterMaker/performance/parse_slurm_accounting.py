@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+#
+################################################################################
+# Name:		parse_slurm_accounting.py
+# Author:	Rodney Marable <rodney.marable@gmail.com>
+# Created On:	October 17, 2026
+# Last Changed:	October 17, 2026
+# Purpose:	Generate job data CSV files for make_sge_cluster_plots.py from
+#		Slurm sacct accounting data
+################################################################################
+#
+# Usage:
+# $ parse_slurm_accounting.py [-h] --cluster-name CLUSTER_NAME --output OUTPUT
+#                             [--job-ids JOB_IDS] [--job-name JOB_NAME]
+#                             [--starttime STARTTIME] [--sacct-dump SACCT_DUMP]
+#                             [--task-output TASK_OUTPUT]
+#
+# Examples:
+# $ ./parse_slurm_accounting.py --cluster-name rmarable-slurm01 --job-ids 12,13 --output slurm_job_data/rmarable-slurm01.csv
+# $ ./parse_slurm_accounting.py --cluster-name rmarable-slurm01 --sacct-dump sacct.txt --output slurm_job_data/rmarable-slurm01.csv
+#
+# All jobs and job steps are pulled with a single sacct --parsable2 call, or
+# read from a file saved earlier with:
+# $ sacct --parsable2 --noheader --format=JobID,JobName,State,Submit,Start,End,AllocCPUS,TotalCPU,MaxVMSize,ExitCode,NodeList > sacct.txt
+# The per-job CSV file has the same columns as the Grid Engine files written
+# by parse_sge_accounting.py, so both schedulers can be compared on one plot.
+################################################################################
+
+# Import the required Python libraries.
+
+import argparse
+import subprocess
+import sys
+
+# Import the shared hpc_performance scheduler accounting parsers.
+
+from sge_accounting import JOB_HEADER
+from sge_accounting import TASK_HEADER
+from sge_accounting import job_rows
+from sge_accounting import task_rows
+from slurm_accounting import read_sacct
+from slurm_accounting import sacct_command
+
+# Parse the command line.
+
+parser = argparse.ArgumentParser(description='Generate job data CSV files from Slurm sacct accounting data')
+parser.add_argument('--cluster-name', '-N', help='name of the cluster - must match CLUSTER_NAME as defined in bang.sh', required=True)
+parser.add_argument('--output', '-o', help='per-job CSV file to write', required=True)
+parser.add_argument('--job-ids', '-j', help='comma-separated list of job IDs to include (default = all jobs matching --job-name)', required=False)
+parser.add_argument('--job-name', '-n', help='only include jobs with this name (default = slurm_Axb_random unless --job-ids is given)', required=False)
+parser.add_argument('--starttime', '-S', help='passed to sacct --starttime to include jobs older than today when --job-ids is not given (default = sacct default)', required=False)
+parser.add_argument('--sacct-dump', '-d', help='read saved sacct --parsable2 --noheader output from this file instead of running sacct', required=False)
+parser.add_argument('--task-output', '-t', help='also write one row per array task (submit, start, and end times, CPUs, cpu, maxvmem) to this CSV file', required=False)
+
+args = parser.parse_args()
+cluster_name = args.cluster_name
+job_ids = set(job_id.strip() for job_id in args.job_ids.split(',') if job_id.strip()) if args.job_ids else None
+job_name = args.job_name if args.job_name or job_ids else 'slurm_Axb_random'
+
+# Read the saved sacct output, or stream the output of a single sacct call
+# covering every requested job, and aggregate it by job and array task.
+
+if args.sacct_dump:
+    with open(args.sacct_dump, errors='replace') as f:
+        jobs = read_sacct(f, job_ids, job_name)
+else:
+    try:
+        sacct = subprocess.Popen(sacct_command(job_ids, job_name, args.starttime), stdout=subprocess.PIPE, universal_newlines=True)
+    except FileNotFoundError:
+        print("*** ERROR *** sacct was not found.  Is this a Slurm cluster with accounting enabled?")
+        print("Aborting...")
+        sys.exit(1)
+    jobs = read_sacct(sacct.stdout, job_ids, job_name)
+    if sacct.wait() != 0:
+        print("*** ERROR *** sacct exited with status", sacct.returncode)
+        print("Aborting...")
+        sys.exit(1)
+for job_id in sorted(job_ids or [], key=int):
+    if job_id not in jobs:
+        print("*** WARNING *** No accounting records found for job %s" % job_id)
+
+# Write the per-job CSV file and, if requested, the per-task CSV file.
+
+with open(args.output, 'w') as f:
+    print(JOB_HEADER, file=f)
+    for row in job_rows(jobs, cluster_name):
+        print(row, file=f)
+print("Saved  ===>  %s (%d jobs)" % (args.output, len(jobs)))
+if args.task_output:
+    rows = task_rows(jobs, cluster_name)
+    with open(args.task_output, 'w') as f:
+        print(TASK_HEADER, file=f)
+        for row in rows:
+            print(row, file=f)
+    print("Saved  ===>  %s (%d tasks)" % (args.task_output, len(rows)))
+
+# Cleanup and exit.
+
+sys.exit(0)
@@ -0,0 +1,443 @@
+################################################################################
+# Name:		plot_engine.py
+# Author:	Rodney Marable <rodney.marable@gmail.com>
+# Created On:	October 17, 2026
+# Last Changed:	October 17, 2026
+# Purpose:	Shared plotting engine for the make_standalone_*_plots.py family
+################################################################################
+
+# Columns of the summary_final/ CSV files written by
+# combine_csv_summary_files_for_plotting.sh, with the type of each column.
+
+SUMMARY_COLUMNS = [
+    ('cluster_name', 'str'),
+    ('cluster_jobID', 'str'),
+    ('matrix_size', 'int64'),
+    ('compute_time', 'float64'),
+    ('raw_log_size_bytes', 'int64'),
+    ('gzip_log_size_bytes', 'int64'),
+    ('fileproc_time', 'float64'),
+]
+
+# Plot variants rendered by make_standalone_plots().  Each variant plots one
+# or more (column, label suffix) series against matrix_size, with the x values
+# divided by x_divisor (3600 for hours, 60 for minutes).  The cost variants
+# price each data point with its instance type's entry in the price cache.
+
+PLOT_VARIANTS = {
+    'unified': {
+        'plotfile': 'plot_unified_standalone',
+        'series': [ ('total_time', '') ],
+        'x_divisor': 3600,
+        'xlabel': 'Total Compute Time (Hours)',
+        'ylabel': 'Matrix Dimensions (N x N)',
+        'title': 'Standalone Instance Random Matrix Computation and Data File Processing Performance\nGenerated Using bang.sh and Axb_random.py\n%s',
+        'x_step': 0.25,
+        'y_step': 1000,
+    },
+    'compute': {
+        'plotfile': 'plot_standalone_compute',
+        'series': [ ('compute_time', '') ],
+        'x_divisor': 60,
+        'xlabel': 'Total Compute Time (Minutes)',
+        'ylabel': 'Matrix Dimensions (N x N)',
+        'title': 'Standalone Instance Random Matrix Computation Performance\nGenerated Using bang.sh and Axb_random.py\n%s',
+        'x_step': 0.5,
+        'y_step': 500,
+    },
+    'fileproc': {
+        'plotfile': 'plot_standalone_fileproc',
+        'series': [ ('fileproc_time', '') ],
+        'x_divisor': 60,
+        'xlabel': 'Total Compute Time (Minutes)',
+        'ylabel': 'Matrix Dimensions (N x N)',
+        'title': 'Standalone Instance Data File Processing Performance\nGenerated Using bang.sh and Axb_random.py Logs\n%s',
+        'x_step': 0.5,
+        'y_step': 500,
+    },
+    'separated': {
+        'plotfile': 'plot_standalone_separated',
+        'series': [ ('compute_time', '.compute'), ('fileproc_time', '.fileproc') ],
+        'x_divisor': 60,
+        'xlabel': 'Total Compute Time (Minutes)',
+        'ylabel': 'Matrix Dimensions (N x N)',
+        'title': 'Standalone Instance Random Matrix Computation and Data File Processing Performance\nGenerated Using bang.sh and Axb_random.py and Displayed as Separate Data Sets\n%s',
+        'x_step': 0.5,
+        'y_step': 500,
+    },
+    'cost': {
+        'plotfile': 'plot_standalone_cost',
+        'series': [ ('cost', '') ],
+        'x_divisor': 1,
+        'xlabel': 'Cost ($)',
+        'ylabel': 'Matrix Dimension N (for N x N matrix)',
+        'title': 'Standalone Instance Random Matrix Computation and Data File Processing Performance\nGenerated Using bang.sh and Axb_random.py\n%s',
+        'x_step': None,
+        'y_step': None,
+    },
+    'cost_per_gflop': {
+        'plotfile': 'plot_standalone_cost_per_gflop',
+        'series': [ ('cost_per_gflop', '') ],
+        'x_divisor': 1,
+        'xlabel': 'Cost per GFLOP ($)',
+        'ylabel': 'Matrix Dimension N (for N x N matrix)',
+        'title': 'Standalone Instance Cost per GFLOP of Random Matrix Computation\nGenerated Using bang.sh and Axb_random.py\n%s',
+        'x_step': None,
+        'y_step': None,
+    },
+}
+
+# Plot variants that need the cost columns added by add_cost_columns().
+
+COST_VARIANTS = [ 'cost', 'cost_per_gflop' ]
+
+# Cache of the EC2 instance metadata probe made by detect_ec2_instance() on
+# hosts without /sys DMI data (relative to $XDG_CACHE_HOME, default ~/.cache),
+# how long in seconds a cached answer is kept, and the probe timeout.
+
+PROBE_CACHE_FILE = 'hpc_performance/ec2_probe.json'
+PROBE_CACHE_TTL = 86400
+PROBE_TIMEOUT = 0.5
+
+########################
+# Function definitions #
+########################
+
+# Function: detect_ec2_instance()
+# Purpose: Return True when running on an EC2 instance.  On Linux this is read
+# from the DMI and hypervisor identifiers in /sys, which costs nothing.
+# Elsewhere the instance metadata service is probed once and the answer is
+# cached per host in PROBE_CACHE_FILE for PROBE_CACHE_TTL seconds, so laptops
+# and jumphosts don't wait on the probe timeout every time a plot is made.
+
+def detect_ec2_instance():
+    import json
+    import os
+    import platform
+    import time
+    for sys_file, prefix in [ ('/sys/devices/virtual/dmi/id/sys_vendor', 'Amazon EC2'), ('/sys/devices/virtual/dmi/id/bios_vendor', 'Amazon EC2'), ('/sys/hypervisor/uuid', 'ec2') ]:
+        try:
+            with open(sys_file) as f:
+                if f.read().strip().startswith(prefix):
+                    return True
+        except OSError:
+            pass
+    if os.path.isdir('/sys/devices/virtual/dmi/id'):
+        return False
+    hostname = platform.node()
+    cache_file = os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')), PROBE_CACHE_FILE)
+    try:
+        with open(cache_file) as f:
+            cached = json.load(f)[hostname]
+        if time.time() - cached['time'] < PROBE_CACHE_TTL:
+            return cached['ec2_instance']
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    import urllib.error
+    import urllib.request
+    try:
+        urllib.request.urlopen('http://169.254.169.254/latest/meta-data/instance-id', timeout = PROBE_TIMEOUT)
+        ec2_instance = True
+    except urllib.error.HTTPError:
+        ec2_instance = True
+    except (urllib.error.URLError, OSError):
+        ec2_instance = False
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        try:
+            with open(cache_file) as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            cache = {}
+        cache[hostname] = { 'ec2_instance': ec2_instance, 'time': time.time() }
+        with open(cache_file, 'w') as f:
+            json.dump(cache, f)
+    except OSError:
+        pass
+    return ec2_instance
+
+# Function: detect_headless()
+# Purpose: Return True when plots should only be saved, not displayed, and
+# select the non-interactive Agg backend through MPLBACKEND so matplotlib
+# picks it up when it is first imported.  Checks, cheapest first:
+#	PLOT_HEADLESS=yes or no in the environment
+#	MPLBACKEND already set to a non-interactive backend
+#	Linux without DISPLAY or WAYLAND_DISPLAY (nowhere to show the plots)
+#	detect_ec2_instance() (EC2 instances are headless by default)
+
+def detect_headless():
+    import os
+    import sys
+    headless = os.environ.get('PLOT_HEADLESS', '').lower()
+    if headless in ('yes', 'no'):
+        headless = headless == 'yes'
+    elif os.environ.get('MPLBACKEND'):
+        headless = os.environ['MPLBACKEND'].lower() in ('agg', 'pdf', 'ps', 'svg', 'cairo', 'template')
+    elif sys.platform.startswith('linux') and not os.environ.get('DISPLAY') and not os.environ.get('WAYLAND_DISPLAY'):
+        headless = True
+    else:
+        headless = detect_ec2_instance()
+    if headless and not os.environ.get('MPLBACKEND'):
+        os.environ['MPLBACKEND'] = 'Agg'
+    return headless
+
+# Function: read_matrix_sizes_title()
+# Purpose: Return the MATRIX_SIZES line from MATRIX_SIZES.conf for the plot
+# titles.
+
+def read_matrix_sizes_title(conf_file='MATRIX_SIZES.conf'):
+    matrix_sizes = ''
+    for line in open(conf_file):
+        if "MATRIX_SIZES=\"" in line:
+            matrix_sizes = line
+    return matrix_sizes
+
+# Function: summary_signature()
+# Purpose: Describe the summary CSV files by name, size, and modification time
+# so the cache can tell when any of them has been added, removed, or changed.
+
+def summary_signature(csv_files):
+    import os
+    signature = []
+    for csv_file in csv_files:
+        st = os.stat(csv_file)
+        signature.append([ os.path.basename(csv_file), st.st_size, st.st_mtime_ns ])
+    return signature
+
+# Function: read_summary_file()
+# Purpose: Parse one summary CSV file into a DataFrame with the columns and
+# types in SUMMARY_COLUMNS, selecting columns by name rather than position.
+# data_source is the cluster or instance name taken from the file name, which
+# labels the file's data points in the plots.
+
+def read_summary_file(csv_file):
+    import os
+    import pandas as pd
+    names = [ name for name, dtype in SUMMARY_COLUMNS ]
+    with open(csv_file) as f:
+        has_header = f.readline().startswith(names[0] + ',')
+    df = pd.read_csv(csv_file, header=0 if has_header else None, names=None if has_header else names, dtype=dict(SUMMARY_COLUMNS))
+    df = df[names]
+    df['data_source'] = os.path.basename(csv_file).replace('summary.', '').split('.', 1)[0]
+    return df
+
+# Function: load_summary_data()
+# Purpose: Load every summary CSV file in summary_dir into one typed DataFrame
+# with a single parse per file.  The result is cached in summary_dir as a
+# Feather file (or a pickle when pyarrow is not installed) along with the
+# signature of the CSV files it was built from, and the cache is reused until
+# a CSV file is added, removed, or modified.
+# Adds total_time (compute_time + fileproc_time, in seconds).
+
+def load_summary_data(summary_dir='summary_final'):
+    import glob
+    import json
+    import os
+    import pandas as pd
+    csv_files = sorted(glob.glob(os.path.join(summary_dir, '*.csv')))
+    signature = summary_signature(csv_files)
+    signature_file = os.path.join(summary_dir, '.plot_cache.json')
+    try:
+        import pyarrow
+        cache_file = os.path.join(summary_dir, '.plot_cache.feather')
+        read_cache, write_cache = pd.read_feather, lambda df, path: df.to_feather(path)
+    except ImportError:
+        cache_file = os.path.join(summary_dir, '.plot_cache.pkl')
+        read_cache, write_cache = pd.read_pickle, lambda df, path: df.to_pickle(path)
+    try:
+        with open(signature_file) as f:
+            if json.load(f) == signature:
+                df = read_cache(cache_file)
+                print("Loaded %d rows from %d cached summary files" % (len(df), len(csv_files)))
+                return df
+    except (OSError, ValueError):
+        pass
+    if csv_files:
+        df = pd.concat([ read_summary_file(csv_file) for csv_file in csv_files ], ignore_index=True)
+    else:
+        df = pd.DataFrame({ name: pd.Series(dtype=dtype if dtype != 'str' else 'object') for name, dtype in SUMMARY_COLUMNS + [ ('data_source', 'str') ] })
+    df['data_source'] = df['data_source'].astype('category')
+    df['total_time'] = df['compute_time'] + df['fileproc_time']
+    write_cache(df, cache_file)
+    with open(signature_file, 'w') as f:
+        json.dump(signature, f)
+    print("Parsed %d rows from %d summary files" % (len(df), len(csv_files)))
+    return df
+
+# Function: load_results_store()
+# Purpose: Load the data points in the SQLite results store at db_path (see
+# results_store.py and ingest_results.py) into the same typed DataFrame that
+# load_summary_data() returns, optionally limited to the given cluster names.
+# The instance type recorded for each cluster is kept for the cost plots.
+
+def load_results_store(db_path, cluster_names=None):
+    import pandas as pd
+    from results_store import open_results_store
+    from results_store import summary_query
+    conn = open_results_store(db_path)
+    query, params = summary_query(cluster_names)
+    df = pd.read_sql_query(query, conn, params=params)
+    conn.close()
+    instance_types = df['instance_type']
+    df = df[[ name for name, dtype in SUMMARY_COLUMNS ]].fillna({ 'raw_log_size_bytes': 0, 'gzip_log_size_bytes': 0, 'fileproc_time': 0.0 })
+    df = df.astype(dict(SUMMARY_COLUMNS))
+    df['instance_type'] = instance_types
+    df['data_source'] = df['cluster_name'].astype('category')
+    df['total_time'] = df['compute_time'] + df['fileproc_time']
+    print("Loaded %d rows from the results store %s" % (len(df), db_path))
+    return df
+
+# Function: instance_type_of()
+# Purpose: Guess the EC2 instance type of a data source that has none recorded.
+# Standalone instances are usually named after their instance type, with the
+# period replaced by a dash (t2-xlarge for t2.xlarge).
+
+def instance_type_of(data_source):
+    return data_source.replace('-', '.', 1)
+
+# Function: add_cost_columns()
+# Purpose: Join every data point to the hourly price of its instance type in
+# the price cache (see price_cache.py) for market and region, and add the
+# columns instance_type, hourly_price, cost (dollars per solve, including
+# file processing), gflop (2/3 N^3 floating point operations to solve Ax=b,
+# in billions), and cost_per_gflop.  Instance types missing from the cache
+# are priced at hourly_rate, with a warning.
+
+def add_cost_columns(df, price_cache='prices.json', market='ondemand', region=None, hourly_rate=0.085):
+    from price_cache import load_price_cache
+    from price_cache import lookup_price
+    cache = load_price_cache(price_cache)
+    if 'instance_type' not in df:
+        df = df.assign(instance_type=None)
+    instance_types = {}
+    hourly_prices = {}
+    for data_source, instance_type in df[['data_source', 'instance_type']].drop_duplicates().itertuples(index=False):
+        if not isinstance(instance_type, str) or not instance_type:
+            instance_type = instance_type_of(data_source)
+        price = lookup_price(cache, instance_type, market, region)
+        if price is None:
+            print("*** WARNING *** No cached %s price for %s (%s), using $%.4f per hour" % (market, instance_type, data_source, hourly_rate))
+            price = hourly_rate
+        instance_types[data_source] = instance_type
+        hourly_prices[data_source] = price
+    data_source = df['data_source'].astype(str)
+    df = df.assign(instance_type=data_source.map(instance_types), hourly_price=data_source.map(hourly_prices))
+    df = df.assign(cost=df['total_time'] / 3600 * df['hourly_price'], gflop=2.0 / 3.0 * df['matrix_size'].astype('float64') ** 3 / 1e9)
+    return df.assign(cost_per_gflop=df['cost'] / df['gflop'])
+
+# Function: cost_report()
+# Purpose: Save the mean cost per solve and cost per GFLOP of every data
+# source and matrix size to plot_dir/cost_report.timestamp.csv, and print the
+# data sources ranked by cost per GFLOP at their largest matrix size, which
+# is the number to compare when choosing compute_instance_type.
+# Returns the path of the saved report.
+
+def cost_report(df, market, timestamp, plot_dir='plots'):
+    report = df.groupby([ 'data_source', 'instance_type', 'matrix_size' ], observed=True, sort=True).agg(hourly_price=('hourly_price', 'first'), solves=('cost', 'size'), cost_per_solve=('cost', 'mean'), cost_per_gflop=('cost_per_gflop', 'mean')).reset_index()
+    report.insert(2, 'market', market)
+    report_file = plot_dir + '/cost_report.' + timestamp + '.csv'
+    report.to_csv(report_file, index=False)
+    largest = report.loc[report.groupby('data_source', observed=True)['matrix_size'].idxmax()].sort_values('cost_per_gflop')
+    print("")
+    print("Cost per GFLOP at the largest matrix size (%s prices):" % market)
+    for row in largest.itertuples(index=False):
+        print("  %-24s %-14s $%.4f/hour  N=%-6d $%.6f per solve  $%.3e per GFLOP" % (row.data_source, row.instance_type, row.hourly_price, row.matrix_size, row.cost_per_solve, row.cost_per_gflop))
+    print("Saved  ==>  %s" % report_file)
+    return report_file
+
+# Function: render_plot()
+# Purpose: Render one plot variant from the summary DataFrame into a new figure
+# and save it as plot_dir/PLOTFILE.timestamp.png.  Every data source keeps the
+# same marker in every variant.  Returns the path of the saved plot.
+
+def render_plot(df, variant, matrix_sizes_title, timestamp, plot_dir='plots'):
+    import matplotlib as mpl
+    import matplotlib.pyplot as plt
+    import numpy as np
+    spec = PLOT_VARIANTS[variant]
+    valid_markers = mpl.markers.MarkerStyle.filled_markers
+    plt.figure(figsize=(11.5,8))
+    x_axis_max = [ 0 ]
+    y_axis_max = [ 0 ]
+    for i, (data_source, source_df) in enumerate(df.groupby('data_source', observed=True, sort=True)):
+        marker = valid_markers[i % len(valid_markers)]
+        for column, label_suffix in spec['series']:
+            x_values = source_df[column] / spec['x_divisor']
+            x_axis_max.append(x_values.max())
+            y_axis_max.append(source_df['matrix_size'].max())
+            plt.plot(x_values, source_df['matrix_size'], label=data_source + label_suffix, marker=marker, markersize=5, linestyle='None')
+
+    # Format the plot.
+    # Set the axes ticks based on the max values of N and the plotted time.
+
+    plt.title(spec['title'] % (matrix_sizes_title), weight='bold')
+    plt.legend(loc='best', fontsize='small', markerscale=0.8, title='DataSource_InstanceType')
+    plt.xlabel(spec['xlabel'], fontweight='bold')
+    plt.ylabel(spec['ylabel'], fontweight='bold')
+    plt.xlim(left=0)
+    plt.ylim(bottom=0)
+    plt.tight_layout()
+    if spec['x_step']:
+        plt.xticks(np.arange(0, max(x_axis_max)+spec['x_step'], spec['x_step']))
+    if spec['y_step']:
+        plt.yticks(np.arange(0, max(y_axis_max)+spec['y_step'], spec['y_step']))
+    plt.minorticks_on()
+    plotfile = plot_dir + '/' + spec['plotfile'] + '.' + timestamp + '.png'
+    plt.savefig(plotfile, format='png')
+    return plotfile
+
+# Function: make_standalone_plots()
+# Purpose: Load the summary_final/ CSV data (or the results store, when
+# results_db is given) once and render each requested plot variant from it.
+# Display the plots in popup windows unless detect_headless() finds there is
+# nowhere to show them, in which case each figure is closed as soon as it is
+# saved.  The startup time (environment detection and data loading, measured
+# from start_time when the caller provides it) is reported and compared with
+# startup_budget seconds.  The cost variants are priced from price_cache for
+# market and region (see add_cost_columns()), and a cost report is saved with
+# them.
+
+def make_standalone_plots(variants, hourly_rate=0.085, summary_dir='summary_final', plot_dir='plots', matrix_sizes_conf='MATRIX_SIZES.conf', results_db=None, start_time=None, startup_budget=1.0, price_cache='prices.json', market='ondemand', region=None):
+    import pathlib
+    import time
+    if start_time is None:
+        start_time = time.time()
+    headless = detect_headless()
+    timestamp = time.strftime("%d-%b-%Y-%H:%M:%S", time.localtime())
+    print("")
+    print("Generating graphs of the CSV data files generated from bang.sh...")
+    pathlib.Path(plot_dir).mkdir(parents=True, exist_ok=True)
+    matrix_sizes_title = read_matrix_sizes_title(matrix_sizes_conf)
+    if results_db:
+        df = load_results_store(results_db)
+    else:
+        df = load_summary_data(summary_dir)
+    startup_time = time.time() - start_time
+    print("Startup time = %.3f seconds (budget = %.3f seconds)" % (startup_time, startup_budget))
+    if startup_time > startup_budget:
+        print("*** WARNING *** Startup took longer than the budget - set PLOT_HEADLESS=yes or no to skip environment detection")
+    if set(variants) & set(COST_VARIANTS):
+        df = add_cost_columns(df, price_cache, market, region, hourly_rate)
+        cost_report(df, market, timestamp, plot_dir)
+    render_start = time.time()
+    import matplotlib.pyplot as plt
+    plotfiles = []
+    for variant in variants:
+        plotfiles.append(render_plot(df, variant, matrix_sizes_title, timestamp, plot_dir))
+        if headless:
+            plt.close()
+    print("Rendered %d plots in %.3f seconds" % (len(plotfiles), time.time() - render_start))
+    print("")
+    if not headless:
+        for plotfile in plotfiles:
+            print("Now displaying  ===>   %s" % plotfile)
+        print("")
+        print("Please close the Python windows to regain control of ths shell.")
+        plt.show()
+    else:
+        for plotfile in plotfiles:
+            print("Creating and saving  ==>  %s" % plotfile)
+        print("")
+        print("Copy these files onto your local machine to view.")
+        print("Exiting...")
+        print("")
@@ -0,0 +1,118 @@
+################################################################################
+# Name:		price_cache.py
+# Author:	Rodney Marable <rodney.marable@gmail.com>
+# Created On:	October 17, 2026
+# Last Changed:	October 17, 2026
+# Purpose:	Local snapshot of EC2 on-demand and spot prices used to cost
+#		the benchmark results offline
+################################################################################
+
+# Default path of the price cache, relative to the performance directory.
+# The cache is a JSON file laid out as:
+#	{ "prices": { REGION: { INSTANCE_TYPE: { "ondemand": $/hour,
+#	  "ondemand_updated": "YYYY-MM-DD HH:MM:SS", "spot": $/hour,
+#	  "spot_updated": "YYYY-MM-DD HH:MM:SS" } } } }
+
+PRICE_CACHE = 'prices.json'
+PRICE_MARKETS = [ 'ondemand', 'spot' ]
+
+########################
+# Function definitions #
+########################
+
+# Function: load_price_cache()
+# Purpose: Return the price cache at path, or an empty cache if the file does
+# not exist yet.
+
+def load_price_cache(path=PRICE_CACHE):
+    import json
+    try:
+        with open(path) as f:
+            cache = json.load(f)
+    except FileNotFoundError:
+        cache = {}
+    cache.setdefault('prices', {})
+    return cache
+
+# Function: save_price_cache()
+# Purpose: Write the price cache to path.  The file is replaced atomically so
+# a plot reading it never sees a partial snapshot.
+
+def save_price_cache(cache, path=PRICE_CACHE):
+    import json
+    import os
+    with open(path + '.tmp', 'w') as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+    os.replace(path + '.tmp', path)
+
+# Function: set_price()
+# Purpose: Record the hourly price of instance_type in region for market
+# (ondemand or spot) in the cache, stamped with the current time.
+
+def set_price(cache, region, instance_type, market, price):
+    import time
+    entry = cache['prices'].setdefault(region, {}).setdefault(instance_type, {})
+    entry[market] = float(price)
+    entry[market + '_updated'] = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
+
+# Function: lookup_price()
+# Purpose: Return the cached hourly price of instance_type in region for
+# market, or None if it has not been cached.  With region=None, the first
+# region in the cache that has a price is used.
+
+def lookup_price(cache, instance_type, market='ondemand', region=None):
+    regions = [ region ] if region else sorted(cache['prices'])
+    for region in regions:
+        price = cache['prices'].get(region, {}).get(instance_type, {}).get(market)
+        if price is not None:
+            return price
+    return None
+
+# Function: fetch_ondemand_price()
+# Purpose: Look up the Linux on-demand hourly price of instance_type in region
+# with the AWS Price List API.  The API is only served from us-east-1.
+# Returns None if no matching product is found.
+
+def fetch_ondemand_price(instance_type, region):
+    import boto3
+    import json
+    pricing = boto3.client('pricing', region_name='us-east-1')
+    filters = [ ('instanceType', instance_type), ('regionCode', region), ('operatingSystem', 'Linux'), ('tenancy', 'Shared'), ('preInstalledSw', 'NA'), ('capacitystatus', 'Used') ]
+    response = pricing.get_products(ServiceCode='AmazonEC2', Filters=[ { 'Type': 'TERM_MATCH', 'Field': field, 'Value': value } for field, value in filters ], MaxResults=10)
+    for price_item in response['PriceList']:
+        for term in json.loads(price_item)['terms'].get('OnDemand', {}).values():
+            for dimension in term['priceDimensions'].values():
+                price = float(dimension['pricePerUnit'].get('USD', 0))
+                if price > 0:
+                    return price
+    return None
+
+# Function: fetch_spot_price()
+# Purpose: Return the lowest current Linux spot price of instance_type across
+# the Availability Zones of region from describe_spot_price_history, or None
+# if the instance type is not offered on the spot market there.
+
+def fetch_spot_price(instance_type, region):
+    import boto3
+    import datetime
+    ec2client = boto3.client('ec2', region_name=region)
+    prices = ec2client.describe_spot_price_history(InstanceTypes=[instance_type], ProductDescriptions=['Linux/UNIX (Amazon VPC)'], StartTime=datetime.datetime.utcnow())
+    spot_prices = [ float(price['SpotPrice']) for price in prices['SpotPriceHistory'] ]
+    return min(spot_prices) if spot_prices else None
+
+# Function: refresh_price_cache()
+# Purpose: Fetch the current prices of instance_types in region for each of
+# markets and store them in the cache.  Prices that can't be fetched keep
+# their cached values.  Returns a list of (instance_type, market, price or
+# None) for the console.
+
+def refresh_price_cache(cache, region, instance_types, markets=PRICE_MARKETS):
+    fetchers = { 'ondemand': fetch_ondemand_price, 'spot': fetch_spot_price }
+    results = []
+    for instance_type in instance_types:
+        for market in markets:
+            price = fetchers[market](instance_type, region)
+            if price is not None:
+                set_price(cache, region, instance_type, market, price)
+            results.append((instance_type, market, price))
+    return results
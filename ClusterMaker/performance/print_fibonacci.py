@@ -4,7 +4,7 @@
 # Name:         print_fibonacci.py
 # Author:       Rodney Marable <rodney.marable@gmail.com>
 # Created On:   May 6, 2018
-# Last Changed: August 8, 2018
+# Last Changed: October 17, 2026
 # Purpose:      Print Fibonacci numbers to stdout using index (from 1 to N) or
 #		the length in digits of the computed value
 # Notes:	Using the shell to filter brackets from the script output is
@@ -13,27 +13,27 @@
 ################################################################################
 
 import argparse
+import io
 import re
 import sys
 
-# Define a function to compute Fibonacci numbers.
+# Import the shared Fibonacci number and decimal conversion functions.
 
-def compute_fibonacci(p):
-    fibonacci_array = []
-    m = 0
-    n = 1
-    for i in range(1, p):
-        fibonacci_array.append(n)
-        m, n = n, m+n
-    return fibonacci_array
+from fibonacci_engine import decimal_digits
+from fibonacci_engine import fibonacci_sequence
+from fibonacci_engine import first_index_with_digits
+from fibonacci_engine import int_to_decimal
+from fibonacci_engine import select_conversion_backend
+
+# Define a function to print one Fibonacci number through the buffered writer.
+
+def print_fibonacci_number(n, value):
+    output.write("Current Index: %d\nNumber of Digits: %d\nComputed Value: %s\n\n" % (n, decimal_digits(value), int_to_decimal(value, conversion)))
 
 # Define a function to properly handle the case of N=1.
 
 def handle_number_one():
-    print('Current Index: 1')
-    print('Number of Digits: 1')
-    print('Computed Value: 1')
-    print('')
+    output.write('Current Index: 1\nNumber of Digits: 1\nComputed Value: 1\n\n')
 
 # Start the main script here.
 
@@ -48,38 +48,50 @@ group.add_argument('--enable_digits', action='store_true')
 
 parser.add_argument('--index', '-I', help='Compute Fibonacci numbers from 1 to index (default = 10000)', required=False, type=int, default=10000)
 parser.add_argument('--digits', '-D', help='Compute Fibonacci numbers up to D digits long (default = 1000)', required=False, type=int, default=1000)
+parser.add_argument('--jump', '-J', help='With --enable_digits, jump straight to the first Fibonacci number with D digits instead of walking up to it', required=False, action='store_true')
+parser.add_argument('--window', '-W', help='With --jump, number of consecutive Fibonacci numbers to print starting at the first one with D digits (default = 1)', required=False, type=int, default=1)
+parser.add_argument('--conversion', '-V', help='Backend that converts F(n) to decimal: auto (gmpy2 if installed, else dc), str, dc (divide-and-conquer), or gmpy2 (default = auto)', required=False, default='auto', choices=['auto', 'str', 'dc', 'gmpy2'])
 
 args = parser.parse_args()
 enable_index = args.enable_index
 enable_digits = args.enable_digits
 digits = args.digits
 index = args.index
+conversion = select_conversion_backend(args.conversion)
+jump = args.jump
+window = args.window
+
+# Send all output through a single buffered writer on stdout.
+
+output = io.TextIOWrapper(io.BufferedWriter(io.FileIO(sys.stdout.fileno(), 'w', closefd=False), buffer_size=1048576), encoding='utf-8')
+
+# Count digits with decimal_digits() and convert values with int_to_decimal()
+# so very large values avoid quadratic str() conversion and the Python 3.11+
+# int_max_str_digits limit.
 
 if enable_index:
     if index == 1:
         handle_number_one()
     else:
-        for index in range(2, index+2):
-            print("Current Index:", index-1)
-            result = compute_fibonacci(index)[-1:]
-            FibNum = ','.join( str(result) for e in result ).replace('[', '').replace(']', '')
-            print("Number of Digits:", len(FibNum))
-            print("Computed Value:", FibNum)
-            print('')
+        for n, value in fibonacci_sequence(1, index):
+            print_fibonacci_number(n, value)
+
+# --jump estimates the first index with D digits from Binet's formula, confirms
+# it with fast doubling, and streams only the requested window of values from
+# there.  Without --jump, every value up to the first one with D digits is
+# printed.
 
 if enable_digits:
-    index = 1
-    FibNum = 1
-    if digits == 1:
+    if jump:
+        first_index = first_index_with_digits(digits)
+        for n, value in fibonacci_sequence(first_index, first_index + window - 1):
+            print_fibonacci_number(n, value)
+    elif digits <= 1:
         handle_number_one()
-    while len(str(FibNum)) < digits:
-        if index == 1:
-            handle_number_one()
-        else:
-            print("Current Index:", index)
-            result = compute_fibonacci(index)[-1:]
-            FibNum = ','.join( str(result) for e in result ).replace('[', '').replace(']', '')
-            print("Number of Digits:", len(FibNum))
-            print("Computed Value:", FibNum)
-            print('')
-        index += 1
+    else:
+        for n, value in fibonacci_sequence(1):
+            print_fibonacci_number(n, value)
+            if decimal_digits(value) >= digits:
+                break
+
+output.flush()
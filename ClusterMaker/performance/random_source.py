@@ -0,0 +1,67 @@
+################################################################################
+# Name:		random_source.py
+# Author:	Rodney Marable <rodney.marable@gmail.com>
+# Created On:	October 17, 2026
+# Last Changed:	October 17, 2026
+# Purpose:	Bulk, optionally seeded, random data source for the hashing
+#		benchmarks
+################################################################################
+
+# Random data is generated RANDOM_BLOCK_BYTES at a time, rounded to whole
+# records, and every record gets SALT_BYTES of salt from the same block.  The
+# block layout depends only on the record size, so a seeded run produces the
+# same records no matter how the record range is split across workers.
+
+RANDOM_BLOCK_BYTES = 8 * 1024 * 1024
+SALT_BYTES = 16
+
+########################
+# Function definitions #
+########################
+
+# Function: random_block()
+# Purpose: Return size random bytes in one call.  With a seed, the bytes come
+# from a NumPy PCG64 stream keyed on (seed, block_index), so any block can be
+# regenerated on its own on any node.  Without one, they come from a single
+# os.urandom() call.
+
+def random_block(size, seed=None, block_index=0):
+    import os
+    if seed is None:
+        return os.urandom(size)
+    import numpy
+    return numpy.random.Generator(numpy.random.PCG64([ seed, block_index ])).bytes(size)
+
+# Function: check_seeded_source()
+# Purpose: Return None if seeded random data can be generated here, or an error
+# message if NumPy (1.17 or later, for numpy.random.Generator) is missing.
+
+def check_seeded_source():
+    try:
+        import numpy
+    except ImportError:
+        return 'NumPy is required for --seed'
+    if not hasattr(numpy.random, 'Generator'):
+        return 'NumPy 1.17 or later is required for --seed (found %s)' % numpy.__version__
+    return None
+
+# Function: record_source()
+# Purpose: Yield (data, salt) for records first..last (inclusive, counting from
+# 1) of byte_size bytes each.  data is a zero-copy memoryview into the current
+# bulk block and salt is the record's salt as a hex string.  A new block is
+# generated every RANDOM_BLOCK_BYTES, so the per-record cost is a slice rather
+# than a getrandom() syscall and an allocation.  Unseeded blocks are trimmed to
+# the records still needed, since their layout doesn't have to be replayed.
+
+def record_source(first, last, byte_size, seed=None):
+    records_per_block = max(1, RANDOM_BLOCK_BYTES // (byte_size + SALT_BYTES))
+    record = first
+    while record <= last:
+        block_index, offset = divmod(record - 1, records_per_block)
+        block_records = records_per_block if seed is not None else min(records_per_block, offset + last - record + 1)
+        block = random_block(block_records * (byte_size + SALT_BYTES), seed, block_index)
+        data = memoryview(block)[:block_records * byte_size]
+        salts = block[block_records * byte_size:].hex()
+        for i in range(offset, min(block_records, offset + last - record + 1)):
+            yield data[i * byte_size:(i + 1) * byte_size], salts[i * 2 * SALT_BYTES:(i + 1) * 2 * SALT_BYTES]
+        record += records_per_block - offset
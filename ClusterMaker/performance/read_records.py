@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+#
+################################################################################
+# Name:		read_records.py
+# Author:	Rodney Marable <rodney.marable@gmail.com>
+# Created On:	October 17, 2026
+# Last Changed:	October 17, 2026
+# Purpose:	Inspect, verify, and export the binary record files written by
+#		hashtest.py and fibonacci_hashtest.py
+################################################################################
+#
+# Usage:
+# $ read_records.py [-h] --records-file RECORDS_FILE [--info]
+#                   [--record RECORD] [--verify] [--sample SAMPLE]
+#                   [--workers WORKERS] [--export EXPORT]
+#                   [--export-style {hashdata,summary}]
+#
+# Examples:
+# $ ./read_records.py -f archive_hashtest/run1.36151217102026.records --info
+# $ ./read_records.py -f archive_hashtest/run1.36151217102026.records --record 0 --record 9999
+# $ ./read_records.py -f archive_hashtest/run1.36151217102026.records --sample 1000 --workers 8
+# $ ./read_records.py -f archive_hashtest/run1.36151217102026.records --verify --workers 8
+# $ ./read_records.py -f archive_hashtest/run1.36151217102026.records --export run1.summary_data --export-style summary
+#
+# Records are numbered from 0.  The file is memory-mapped, so printing or
+# spot-checking a few records of a huge dump reads only those records.
+################################################################################
+
+# Import the required Python libraries.
+
+import argparse
+import random
+import sys
+
+# Import the shared hpc_performance record file functions.
+
+from record_container import close_record_reader
+from record_container import export_record
+from record_container import open_record_reader
+from record_container import read_record
+from record_container import verify_records
+
+# Parse the command line.
+
+parser = argparse.ArgumentParser(description='Inspect, verify, and export the binary record files written by hashtest.py and fibonacci_hashtest.py')
+parser.add_argument('--records-file', '-f', help='record file to read', required=True)
+parser.add_argument('--info', '-i', help='print the file metadata and record count', required=False, action='store_true')
+parser.add_argument('--record', '-r', help='print record N in the legacy text format (may be repeated)', required=False, type=int, action='append', default=[])
+parser.add_argument('--verify', '-v', help='recompute and check the hash of every record', required=False, action='store_true')
+parser.add_argument('--sample', '-s', help='recompute and check the hashes of SAMPLE randomly chosen records', required=False, type=int)
+parser.add_argument('--workers', '-W', help='number of worker processes for --verify and --sample (default = 1)', required=False, type=int, default=1)
+parser.add_argument('--export', '-e', help='export every record to this file in the legacy text format, or - for stdout', required=False)
+parser.add_argument('--export-style', help='legacy hashtest.py format to export: hashdata (with the base64 data) or summary (salt and hash only) (default = hashdata)', required=False, default='hashdata', choices=['hashdata', 'summary'])
+
+args = parser.parse_args()
+try:
+    reader = open_record_reader(args.records_file)
+except (OSError, ValueError) as e:
+    print("*** ERROR ***")
+    print(e)
+    print("Aborting...")
+    sys.exit(1)
+record_count = reader['count']
+
+# Print the metadata.
+
+if args.info:
+    print("records_file = %s" % args.records_file)
+    print("records      = %d" % record_count)
+    for key in sorted(reader['metadata']):
+        print("%-12s = %s" % (key, reader['metadata'][key]))
+
+# Print the requested records.
+
+for i in args.record:
+    try:
+        sys.stdout.write(export_record(reader, i, args.export_style))
+    except IndexError as e:
+        print("*** ERROR ***")
+        print(e)
+        print("Aborting...")
+        sys.exit(1)
+
+# Export the whole file.
+
+if args.export:
+    export_stream = sys.stdout if args.export == '-' else open(args.export, 'w')
+    for i in range(record_count):
+        export_stream.write(export_record(reader, i, args.export_style))
+    if export_stream is not sys.stdout:
+        export_stream.close()
+        print("Exported %d records  ==>  %s" % (record_count, args.export), file=sys.stderr)
+close_record_reader(reader)
+
+# Verify the hashes of all or a sample of the records.
+
+failed = []
+if args.verify or args.sample:
+    records = None if args.verify else random.sample(range(record_count), min(args.sample, record_count))
+    failed = verify_records(args.records_file, max(1, args.workers), records)
+    checked = record_count if records is None else len(records)
+    print("verified %d of %d records: %d passed, %d failed" % (checked, record_count, checked - len(failed), len(failed)), file=sys.stderr)
+    if failed:
+        reader = open_record_reader(args.records_file)
+        for i in failed[:20]:
+            print("*** WARNING *** record %d (key %d) does not match its hash" % (i, read_record(reader, i)[0]), file=sys.stderr)
+        close_record_reader(reader)
+
+# Cleanup and exit.
+
+if failed:
+    sys.exit(1)
+sys.exit(0)
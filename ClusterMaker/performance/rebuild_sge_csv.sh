@@ -2,7 +2,7 @@
 # Name:		rebuild_sge_csv.sh
 # Author:	Rodney Marable <rodney.marable@gmail.com>
 # Created On:	February 24, 2018
-# Last Changed: February 26, 2018
+# Last Changed: October 17, 2026
 # Purpose:	Rebuild summary CSV files generated from qsub-Axb_random.sh
 ################################################################################
 #
@@ -19,63 +19,42 @@ then
         exit 1
 fi
 
-# Get confirmation from the user before deleting anything.
+# Set PYTHON3.
 
-echo ""
-echo "rebuild_sge_csv.sh parses all existing performance data generated using"
-echo "bang.sh for cluster $CLUSTER_NAME and rebuilds the summary CSV files."
-echo "This is very useful for recovering from inadvertent data deletions and"
-echo "generating new plots with data collected in subsequent runs."
-echo ""
-echo "NOTE: The existing 'sge_job_data' and 'summary' directories will be deleted."
-echo ""
-read -p 'Type YES to confirm for cluster '"$CLUSTER_NAME:"' ' confirm
-case $confirm in
-"YES"|"yes")
-	echo ""
-	echo "Confirmed! Rebuilding the summary CSV file for $CLUSTER_NAME..."
-	;;
-*)
-	echo ""
-        echo "*** CONFIRMATION ERROR ***"
-        echo "Aborting..."
-        exit 1
-	;;
-esac
+if [ ! -f /etc/centos-release ]
+then
+        PYTHON3=python3
+else
+        if [[ `cat /etc/centos-release | awk '{print $4}' | grep -c "^7.*"` -gt 0 ]]
+        then
+                PYTHON3=python3.6
+        elif [[ `cat /etc/centos-release | awk '{print $4}' | grep -c "^6.*"` -gt 0 ]]
+        then
+                PYTHON3=python3
+        else
+                echo "You are running an unrecognized version of centos."
+                echo "This might not work."
+        fi
+fi
 
 # Set up some important file and directory paths.
-# Delete the existing sge_job_data and summary directores.
 
-RAW_CSV_DIR=`pwd`/csv/summary_raw
+RESULTS_DB=`pwd`/results.db
 SGE_JOB_DATA_DIR=`pwd`/sge_job_data
 SGE_DATA_FILE=$SGE_JOB_DATA_DIR/$CLUSTER_NAME.csv
-SUMMARY_DATA_DIR=`pwd`/summary
-for dir in $SGE_JOB_DATA_DIR $SUMMARY_DATA_DIR
-do
-	if [ -d $dir ]
-	then
-		rm -rf $dir
-		mkdir -p $dir
-	else
-		mkdir -p $dir
-	fi
-done
+if [ ! -d $SGE_JOB_DATA_DIR ]
+then
+	mkdir -p $SGE_JOB_DATA_DIR
+fi
 
-# Rebuild the CSV summary files for this cluster using previously collected
-# data and store the results in SGE_JOB_DATA_DIR.
+# Add the raw summary files for this cluster that have not been seen before
+# to the results store, then rebuild SGE_DATA_FILE from the store.  Existing
+# data is never deleted, so this is safe to run after every job.
 
-for cluster_job_ID in `ls $RAW_CSV_DIR/summary.$CLUSTER_NAME.job_Axb_random.*.csv | awk -F. '{print $4}' | uniq`
-do
-	sh csv_summary_time_measurement.sh $CLUSTER_NAME
-done
-for file in `ls $SUMMARY_DATA_DIR/summary.$CLUSTER_NAME.*.csv | sort -t. -k5,5n`
-do
-	cat $file | awk 'FNR > 1' >> $SGE_DATA_FILE.data
-done
-echo "cluster_jobID,task_id,matrix_size,compute_time,cluster_name" > $SGE_DATA_FILE
-cat $SGE_DATA_FILE.data >> $SGE_DATA_FILE
+echo ""
+echo "Ingesting new performance data generated from bang.sh for $CLUSTER_NAME..."
+$PYTHON3 ingest_results.py --cluster-name $CLUSTER_NAME --results-db $RESULTS_DB --export $SGE_DATA_FILE --export-format sge || exit 1
 
 # Cleanup and exit.
 
-rm $SGE_DATA_FILE.data
 exit 0
@@ -2,7 +2,7 @@
 # Name:		rebuild_standalone_csv.sh
 # Author:	Rodney Marable <rodney.marable@gmail.com>
 # Created On:	February 24, 2018
-# Last Changed: March 3, 2018
+# Last Changed: October 17, 2026
 # Purpose:	Rebuild summary CSV files generated from standalone instances
 ################################################################################
 
@@ -14,51 +14,50 @@
 if [ -z $1 ]
 then
         echo ""
-        echo "Usage: rebuild_Axb_random_csv.sh [ CLUSTER_NAME ]"
+        echo "Usage: rebuild_standalone_csv.sh [ CLUSTER_NAME ]"
         echo ""
         exit 1
 fi
-CLUSTER_NAME=$1
+CLUSTER_NAME=`echo $1 | tr '.' '-'`
 
-# Get confirmation from the user before deleting anything.
+# Set PYTHON3.
 
-echo ""
-echo "This script parses all existing performance data generated from bang.sh"
-echo "on this machine and rebuilds the CSV summary files.  This is useful for"
-echo "recovering from inadvertent data deletions."
-echo ""
-echo "The existing 'summary' directory will be recreated."
-echo ""
-read -p 'Type YES to confirm for cluster $CLUSTER_NAME: ' confirm
-case $confirm in
-"YES"|"yes")
-	echo ""
-	echo "Confirmed! Rebuilding the summary CSV file for $CLUSTER_NAME..."
-	;;
-*)
-	echo ""
-        echo "*** CONFIRMATION ERROR ***"
-        echo "Aborting..."
-        exit 1
-	;;
-esac
+if [ ! -f /etc/centos-release ]
+then
+        PYTHON3=python3
+else
+        if [[ `cat /etc/centos-release | awk '{print $4}' | grep -c "^7.*"` -gt 0 ]]
+        then
+                PYTHON3=python3.6
+        elif [[ `cat /etc/centos-release | awk '{print $4}' | grep -c "^6.*"` -gt 0 ]]
+        then
+                PYTHON3=python3
+        else
+                echo "You are running an unrecognized version of centos."
+                echo "This might not work."
+        fi
+fi
 
 # Set up some important paths.
-# Delete the existing 'summary' directory if it already exists.
 
-RAW_CSV=`pwd`/csv/summary_raw
-CSV=`pwd`/csv
-SUMMARY_DIR=`pwd`/summary
-if [ -d $SUMMARY_DIR ]
+RESULTS_DB=`pwd`/results.db
+SUMMARY_FINAL_DIR=`pwd`/summary_final
+SUMMARY_DATA_FILE=$SUMMARY_FINAL_DIR/summary.$CLUSTER_NAME.csv
+if [ ! -d $SUMMARY_FINAL_DIR ]
 then
-	rm -rf $SUMMARY_DIR
+	mkdir -p $SUMMARY_FINAL_DIR
 fi
 
-# Rebuild the CSV summary file.
+# Add any raw summary files that have not been seen before to the results
+# store and rebuild the summary CSV file for plotting from it.  Nothing is
+# deleted, so this is safe to run as often as needed.
 
-for csvfile in `ls $RAW_CSV/summary.$CLUSTER_NAME.*.csv | awk -F. '{print $3}'`
-do
-	sh csv_summary_time_measurement.sh $CLUSTER_NAME $csvfile
-done
-sh combine_csv_summary_files_for_plotting.sh $CLUSTER_NAME
+echo ""
+echo "Ingesting new performance data generated from bang.sh for $CLUSTER_NAME..."
+$PYTHON3 ingest_results.py --cluster-name $CLUSTER_NAME --results-db $RESULTS_DB --export $SUMMARY_DATA_FILE --export-format standalone || exit 1
+echo ""
+echo "To save and view the plots, please run this command (or just cut/paste):"
+echo ""
+echo "   ===>   $PYTHON3 make_standalone_plots.py --results-db $RESULTS_DB"
+echo ""
 exit 0
@@ -0,0 +1,239 @@
+################################################################################
+# Name:		record_container.py
+# Author:	Rodney Marable <rodney.marable@gmail.com>
+# Created On:	October 17, 2026
+# Last Changed:	October 17, 2026
+# Purpose:	Compact, indexed binary record files for the hashtest.py and
+#		fibonacci_hashtest.py dumps
+################################################################################
+
+# A record file is laid out as:
+#
+#	header	 RECORD_MAGIC, format version, metadata length (FILE_HEADER)
+#	metadata JSON object: kind, hash, encoding, hostname, seed, ...
+#	records	 data length, key, salt, digest (RECORD_HEADER), then the data
+#	index	 one little-endian uint64 file offset per record
+#	footer	 index offset, record count, INDEX_MAGIC (FILE_FOOTER)
+#
+# The key is the record count (hashtest.py) or n (fibonacci_hashtest.py), the
+# salt is the 16 bytes behind the 32 hex digit salt, and the digest is the raw
+# 64 byte blake2b digest of the salt's hex text followed by the hashed message.
+# The metadata "encoding" says how to rebuild the hashed message from the data:
+#	raw	 the data itself (hashtest.py random records)
+#	binary	 the data itself, F(n) as a big-endian integer
+#	decimal	 F(n) stored as a big-endian integer, hashed as decimal text
+# Because the index sits at the end of the file, record i is found in O(1)
+# without reading any of the records before it.
+
+RECORD_MAGIC = b'HPCREC01'
+INDEX_MAGIC = b'HPCRIDX1'
+RECORD_VERSION = 1
+FILE_HEADER = '<8sHI'
+RECORD_HEADER = '<IQ16s64s'
+FILE_FOOTER = '<QQ8s'
+
+# Suffix of the record files written by hashtest.py and fibonacci_hashtest.py
+# with --output-format records.
+
+RECORD_SUFFIX = '.records'
+
+########################
+# Function definitions #
+########################
+
+# Function: open_record_file()
+# Purpose: Create a record file at path with the given metadata dict and
+# return a writer for write_record() and close_record_file().
+
+def open_record_file(path, metadata, buffer_size=1048576):
+    import array
+    import json
+    import struct
+    metadata_bytes = json.dumps(metadata, sort_keys=True).encode()
+    f = open(path, 'wb', buffering=buffer_size)
+    f.write(struct.pack(FILE_HEADER, RECORD_MAGIC, RECORD_VERSION, len(metadata_bytes)))
+    f.write(metadata_bytes)
+    return { 'file': f, 'path': path, 'offsets': array.array('Q'), 'position': f.tell(), 'header': struct.Struct(RECORD_HEADER) }
+
+# Function: write_record()
+# Purpose: Append one record to a writer from open_record_file().  salt is
+# the 32 hex digit salt, digest the raw digest bytes, and data any bytes-like
+# object (a memoryview is written without copying).
+
+def write_record(writer, key, salt, digest, data):
+    header = writer['header']
+    writer['offsets'].append(writer['position'])
+    writer['file'].write(header.pack(len(data), key, bytes.fromhex(salt), digest))
+    writer['file'].write(data)
+    writer['position'] += header.size + len(data)
+
+# Function: close_record_file()
+# Purpose: Write the offset index and footer and close the file.  Returns the
+# number of records written.
+
+def close_record_file(writer):
+    import struct
+    import sys
+    offsets = writer['offsets']
+    if sys.byteorder != 'little':
+        offsets.byteswap()
+    writer['file'].write(offsets.tobytes())
+    writer['file'].write(struct.pack(FILE_FOOTER, writer['position'], len(offsets), INDEX_MAGIC))
+    writer['file'].close()
+    return len(offsets)
+
+# Function: open_record_reader()
+# Purpose: Memory-map the record file at path and return a reader for the
+# other functions below.  Abort with ValueError if it isn't a record file.
+
+def open_record_reader(path):
+    import json
+    import mmap
+    import struct
+    f = open(path, 'rb')
+    try:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        f.close()
+        raise ValueError('%s is empty' % path)
+    header_size = struct.calcsize(FILE_HEADER)
+    footer_size = struct.calcsize(FILE_FOOTER)
+    if len(mm) < header_size + footer_size:
+        mm.close()
+        f.close()
+        raise ValueError('%s is not a record file' % path)
+    magic, version, metadata_length = struct.unpack_from(FILE_HEADER, mm, 0)
+    index_offset, record_count, index_magic = struct.unpack_from(FILE_FOOTER, mm, len(mm) - footer_size)
+    if magic != RECORD_MAGIC or index_magic != INDEX_MAGIC or version > RECORD_VERSION:
+        mm.close()
+        f.close()
+        raise ValueError('%s is not a record file or was not closed cleanly' % path)
+    metadata = json.loads(mm[header_size:header_size + metadata_length].decode())
+    return { 'file': f, 'mmap': mm, 'path': path, 'metadata': metadata, 'count': record_count, 'index_offset': index_offset, 'header': struct.Struct(RECORD_HEADER) }
+
+# Function: close_record_reader()
+# Purpose: Unmap and close a reader from open_record_reader().
+
+def close_record_reader(reader):
+    reader['mmap'].close()
+    reader['file'].close()
+
+# Function: read_record()
+# Purpose: Return record i (counting from 0) of a reader as (key, salt hex
+# string, digest bytes, data).  The offset comes straight from the index and
+# data is a memoryview into the mapping, so the cost doesn't depend on i or
+# on the size of the record.
+
+def read_record(reader, i):
+    import struct
+    if not 0 <= i < reader['count']:
+        raise IndexError('record %d is out of range (0-%d)' % (i, reader['count'] - 1))
+    offset = struct.unpack_from('<Q', reader['mmap'], reader['index_offset'] + 8 * i)[0]
+    header = reader['header']
+    data_length, key, salt, digest = header.unpack_from(reader['mmap'], offset)
+    data = memoryview(reader['mmap'])[offset + header.size:offset + header.size + data_length]
+    return key, salt.hex(), digest, data
+
+# Function: record_message()
+# Purpose: Return the message that was hashed for a record's data, following
+# the metadata encoding.
+
+def record_message(reader, data):
+    if reader['metadata'].get('encoding') == 'decimal':
+        from fibonacci_engine import int_to_decimal
+        return int_to_decimal(int.from_bytes(data, 'big'), 'dc').encode()
+    return data
+
+# Function: verify_record()
+# Purpose: Recompute the blake2b digest of record i and return True if it
+# matches the stored digest.
+
+def verify_record(reader, i):
+    import hashlib
+    key, salt, digest, data = read_record(reader, i)
+    hasher = hashlib.blake2b(salt.encode())
+    hasher.update(record_message(reader, data))
+    return hasher.digest() == digest
+
+# Function: verify_record_list()
+# Purpose: Worker process entry point for verify_records().  Map the file in
+# this process and return the numbers of the records in indices whose digest
+# doesn't match.
+
+def verify_record_list(job):
+    path, indices = job
+    reader = open_record_reader(path)
+    try:
+        return [ i for i in indices if not verify_record(reader, i) ]
+    finally:
+        close_record_reader(reader)
+
+# Function: verify_records()
+# Purpose: Verify the records numbered in records (default = all of them) of
+# the file at path, split across a pool of workers processes that each map
+# the file themselves.  Returns the sorted list of records whose digest
+# doesn't match.
+
+def verify_records(path, workers=1, records=None):
+    import multiprocessing
+    if records is None:
+        reader = open_record_reader(path)
+        records = range(reader['count'])
+        close_record_reader(reader)
+    else:
+        records = sorted(records)
+    chunk_size = max(1, -(-len(records) // (workers * 4)))
+    jobs = [ (path, records[first:first + chunk_size]) for first in range(0, len(records), chunk_size) ]
+    if workers == 1:
+        results = [ verify_record_list(job) for job in jobs ]
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            results = pool.map(verify_record_list, jobs)
+    return sorted(i for result in results for i in result)
+
+# Function: export_record()
+# Purpose: Return record i in the legacy text format of the tool that wrote
+# the file: the hashtest.py hashdata_dump or summary_data format (style
+# "hashdata" or "summary"), or the fibonacci_hashtest.py dump format.
+
+def export_record(reader, i, style='hashdata'):
+    import binascii
+    from fibonacci_engine import decimal_digits
+    from fibonacci_engine import int_to_decimal
+    separator = "--------------------------------------------------------------------------------\n"
+    key, salt, digest, data = read_record(reader, i)
+    if reader['metadata'].get('kind') == 'fibonacci_hashtest':
+        value = int.from_bytes(data, 'big')
+        value_text = hex(value) if reader['metadata'].get('encoding') == 'binary' else int_to_decimal(value, 'dc')
+        return "  n         = %d\nF(n) digits = %d digits\nrandom salt = { %s }\nhash string = { %s }\nF(n) value  = %s\n%s" % (key, decimal_digits(value), salt, digest.hex(), value_text, separator)
+    if style == 'summary':
+        return "count = %d\ninput data size = %d bytes\nsalt:  { %s }\nhash:  { %s }\n%s" % (key, len(data), salt, digest.hex(), separator)
+    return "count = %d\ninput size = %d bytes\n[START_DATA_BLOCK]\n%s\n[END_DATA_BLOCK]\n%s" % (key, len(data), binascii.b2a_base64(data), separator)
+
+# Function: merge_record_files()
+# Purpose: Merge shard record files into one record file at path in the order
+# given and delete the shards.  The records are copied as-is and only the
+# index is rewritten.  The metadata of the first shard is kept.
+
+def merge_record_files(path, shard_paths, buffer_size=1048576):
+    import os
+    import struct
+    first_shard = open_record_reader(shard_paths[0])
+    writer = open_record_file(path, first_shard['metadata'], buffer_size)
+    close_record_reader(first_shard)
+    for shard_path in shard_paths:
+        shard = open_record_reader(shard_path)
+        records_start = struct.unpack_from('<Q', shard['mmap'], shard['index_offset'])[0] if shard['count'] else shard['index_offset']
+        shift = writer['position'] - records_start
+        for i in range(shard['count']):
+            writer['offsets'].append(struct.unpack_from('<Q', shard['mmap'], shard['index_offset'] + 8 * i)[0] + shift)
+        shard['file'].seek(records_start)
+        remaining = shard['index_offset'] - records_start
+        while remaining > 0:
+            chunk = shard['file'].read(min(buffer_size, remaining))
+            writer['file'].write(chunk)
+            remaining -= len(chunk)
+        writer['position'] += shard['index_offset'] - records_start
+        close_record_reader(shard)
+        os.remove(shard_path)
+    return close_record_file(writer)
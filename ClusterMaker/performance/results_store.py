@@ -0,0 +1,188 @@
+################################################################################
+# Name:		results_store.py
+# Author:	Rodney Marable <rodney.marable@gmail.com>
+# Created On:	October 17, 2026
+# Last Changed:	October 17, 2026
+# Purpose:	SQLite results store for the benchmark data generated by bang.sh
+#		and bang.py
+################################################################################
+
+# Default path of the results store, relative to the performance directory.
+
+RESULTS_DB = 'results.db'
+
+# Schema of the results store.
+#	clusters	one row per cluster stack or standalone instance
+#	runs		one row per bang.sh job (and SGE array task)
+#	data_points	one row per solved matrix size in a run
+#	ingested_files	the raw summary files that have already been read, with
+#			the size and mtime they had at the time
+# Data is only ever appended; a data point that is already present is left
+# untouched when its summary file is ingested again.
+
+RESULTS_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS clusters (
+    cluster_name TEXT PRIMARY KEY,
+    instance_type TEXT,
+    first_seen TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    cluster_name TEXT NOT NULL REFERENCES clusters(cluster_name),
+    cluster_jobid TEXT NOT NULL,
+    task_id TEXT NOT NULL DEFAULT '',
+    source_file TEXT NOT NULL,
+    ingested_at TEXT NOT NULL,
+    UNIQUE (cluster_name, cluster_jobid, task_id)
+);
+CREATE TABLE IF NOT EXISTS data_points (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    matrix_size INTEGER NOT NULL,
+    execute_node TEXT,
+    compute_time REAL,
+    raw_log_size_bytes INTEGER,
+    gzip_log_size_bytes INTEGER,
+    fileproc_time REAL,
+    UNIQUE (run_id, matrix_size)
+);
+CREATE TABLE IF NOT EXISTS ingested_files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    ingested_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS clusters_instance_type ON clusters (instance_type);
+CREATE INDEX IF NOT EXISTS runs_cluster_name ON runs (cluster_name);
+CREATE INDEX IF NOT EXISTS runs_cluster_jobid ON runs (cluster_jobid);
+CREATE INDEX IF NOT EXISTS data_points_matrix_size ON data_points (matrix_size);
+'''
+
+# Query returning the data points in the column order of the summary_final/
+# CSV files read by plot_engine.py, with the instance type appended.
+
+SUMMARY_QUERY = '''
+SELECT runs.cluster_name, runs.cluster_jobid AS cluster_jobID, data_points.matrix_size,
+       data_points.compute_time, data_points.raw_log_size_bytes,
+       data_points.gzip_log_size_bytes, data_points.fileproc_time,
+       runs.task_id, clusters.instance_type
+FROM data_points
+JOIN runs ON runs.run_id = data_points.run_id
+JOIN clusters ON clusters.cluster_name = runs.cluster_name
+'''
+
+########################
+# Function definitions #
+########################
+
+# Function: open_results_store()
+# Purpose: Open (and create if needed) the results store at db_path in WAL
+# mode, so plots can read it while a bang.py job is ingesting new results.
+
+def open_results_store(db_path=RESULTS_DB):
+    import sqlite3
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.executescript(RESULTS_SCHEMA)
+    return conn
+
+# Function: parse_summary_filename()
+# Purpose: Split a raw summary file name into (cluster_name, cluster_jobid,
+# task_id).  Standalone files are named summary.CLUSTER_NAME.JOBID.csv and Grid
+# Engine files summary.CLUSTER_NAME.job_Axb_random.JOB_ID.TASK_ID.csv.  Periods
+# in CLUSTER_NAME are already replaced with dashes by bang.sh and bang.py.
+
+def parse_summary_filename(path):
+    import os
+    name = os.path.basename(path)
+    if not name.startswith('summary.') or not name.endswith('.csv'):
+        raise ValueError('not a raw summary file: %s' % path)
+    fields = name[len('summary.'):-len('.csv')].split('.')
+    if len(fields) < 2:
+        raise ValueError('not a raw summary file: %s' % path)
+    cluster_name = fields[0]
+    if fields[1] == 'job_Axb_random' and len(fields) == 4:
+        return cluster_name, fields[2], fields[3]
+    return cluster_name, '.'.join(fields[1:]), ''
+
+# Function: ingest_summary_file()
+# Purpose: Add the data points in one raw summary file to the results store.
+# Files whose size and mtime match the ingested_files ledger are skipped
+# without being read.  Returns the number of new data points.
+
+def ingest_summary_file(conn, path, instance_type=None):
+    import csv
+    import os
+    import time
+    st = os.stat(path)
+    path = os.path.abspath(path)
+    seen = conn.execute('SELECT size, mtime_ns FROM ingested_files WHERE path = ?', (path,)).fetchone()
+    if seen == (st.st_size, st.st_mtime_ns):
+        return 0
+    cluster_name, cluster_jobid, task_id = parse_summary_filename(path)
+    now = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
+    added = 0
+    with conn:
+        conn.execute('INSERT OR IGNORE INTO clusters (cluster_name, instance_type, first_seen) VALUES (?, ?, ?)', (cluster_name, instance_type, now))
+        if instance_type:
+            conn.execute('UPDATE clusters SET instance_type = ? WHERE cluster_name = ? AND instance_type IS NULL', (instance_type, cluster_name))
+        conn.execute('INSERT OR IGNORE INTO runs (cluster_name, cluster_jobid, task_id, source_file, ingested_at) VALUES (?, ?, ?, ?, ?)', (cluster_name, cluster_jobid, task_id, path, now))
+        run_id = conn.execute('SELECT run_id FROM runs WHERE cluster_name = ? AND cluster_jobid = ? AND task_id = ?', (cluster_name, cluster_jobid, task_id)).fetchone()[0]
+        with open(path, newline='') as f:
+            for row in csv.reader(f):
+                if len(row) < 4 or row[0] == 'execute_node':
+                    continue
+                row = row + [ None ] * (8 - len(row))
+                cursor = conn.execute('INSERT OR IGNORE INTO data_points (run_id, matrix_size, execute_node, compute_time, raw_log_size_bytes, gzip_log_size_bytes, fileproc_time) VALUES (?, ?, ?, ?, ?, ?, ?)', (run_id, int(row[2]), row[0], float(row[3]), int(row[5]) if row[5] else None, int(row[6]) if row[6] else None, float(row[7]) if row[7] else None))
+                added += cursor.rowcount
+        conn.execute('INSERT OR REPLACE INTO ingested_files (path, size, mtime_ns, ingested_at) VALUES (?, ?, ?, ?)', (path, st.st_size, st.st_mtime_ns, now))
+    return added
+
+# Function: ingest_results()
+# Purpose: Ingest every raw summary file in raw_summary_dir, or only those for
+# cluster_name when it is given.  Returns (files_found, files_read, added).
+
+def ingest_results(conn, raw_summary_dir='csv/summary_raw', cluster_name=None, instance_type=None):
+    import glob
+    import os
+    pattern = 'summary.' + (cluster_name + '.' if cluster_name else '') + '*.csv'
+    csv_files = sorted(glob.glob(os.path.join(raw_summary_dir, pattern)))
+    files_read = 0
+    added = 0
+    for csv_file in csv_files:
+        before = conn.total_changes
+        added += ingest_summary_file(conn, csv_file, instance_type)
+        if conn.total_changes != before:
+            files_read += 1
+    return len(csv_files), files_read, added
+
+# Function: summary_query()
+# Purpose: Build the SQL and parameters used by query_summary() so the
+# plotting scripts can hand the same query to pandas.read_sql_query().
+
+def summary_query(cluster_names=None, instance_type=None, matrix_sizes=None):
+    clauses = []
+    params = []
+    if cluster_names:
+        clauses.append('runs.cluster_name IN (%s)' % ','.join('?' * len(cluster_names)))
+        params += list(cluster_names)
+    if instance_type:
+        clauses.append('clusters.instance_type = ?')
+        params.append(instance_type)
+    if matrix_sizes:
+        clauses.append('data_points.matrix_size IN (%s)' % ','.join('?' * len(matrix_sizes)))
+        params += [ int(matrix_size) for matrix_size in matrix_sizes ]
+    query = SUMMARY_QUERY
+    if clauses:
+        query += 'WHERE ' + ' AND '.join(clauses) + '\n'
+    query += 'ORDER BY runs.cluster_name, CAST(runs.cluster_jobid AS INTEGER), runs.cluster_jobid, CAST(runs.task_id AS INTEGER), data_points.matrix_size'
+    return query, params
+
+# Function: query_summary()
+# Purpose: Return the data points in the results store as a list of tuples in
+# SUMMARY_QUERY column order, optionally limited to the given cluster names,
+# instance type, or matrix sizes, sorted by cluster, job, and matrix size.
+
+def query_summary(conn, cluster_names=None, instance_type=None, matrix_sizes=None):
+    query, params = summary_query(cluster_names, instance_type, matrix_sizes)
+    return conn.execute(query, params).fetchall()
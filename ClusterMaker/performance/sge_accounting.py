@@ -0,0 +1,148 @@
+################################################################################
+# Name:		sge_accounting.py
+# Author:	Rodney Marable <rodney.marable@gmail.com>
+# Created On:	October 17, 2026
+# Last Changed:	October 17, 2026
+# Purpose:	Single-pass parser for the Grid Engine accounting file
+################################################################################
+
+# Fields of an accounting(5) record used by this parser, by position.  Records
+# are colon-separated and lines starting with '#' are comments.
+
+ACCOUNTING_FIELDS = {
+    'hostname': 1,
+    'job_name': 4,
+    'job_number': 5,
+    'submission_time': 8,
+    'start_time': 9,
+    'end_time': 10,
+    'failed': 11,
+    'exit_status': 12,
+    'slots': 34,
+    'task_number': 35,
+    'cpu': 36,
+    'maxvmem': 42,
+}
+
+# Column headers of the per-job CSV file written by
+# combine_sge_data_files_for_plotting.sh and read by make_sge_cluster_plots.py,
+# and of the per-task CSV file written alongside it.
+
+JOB_HEADER = "cluster_name,cluster_job_ID,task_array_size,sge_queue_wait_time,sge_job_execute_time,total_run_time"
+TASK_HEADER = "cluster_name,cluster_job_ID,task_id,hostname,qsub_time,start_time,end_time,sge_queue_wait_time,sge_job_execute_time,slots,cpu_seconds,maxvmem_bytes,failed,exit_status"
+
+########################
+# Function definitions #
+########################
+
+# Function: accounting_time()
+# Purpose: Convert an accounting file timestamp to epoch seconds.  Grid Engine
+# 8.2 and later write milliseconds, older releases write seconds.
+
+def accounting_time(value):
+    t = int(float(value))
+    if t > 100000000000:
+        t = t // 1000
+    return t
+
+# Function: parse_accounting_record()
+# Purpose: Return a dict of the ACCOUNTING_FIELDS in one accounting record, or
+# None for comments, blank lines, and truncated records.
+
+def parse_accounting_record(line):
+    fields = line.rstrip('\n').split(':')
+    if line.startswith('#') or len(fields) <= ACCOUNTING_FIELDS['maxvmem']:
+        return None
+    f = ACCOUNTING_FIELDS
+    return {
+        'hostname': fields[f['hostname']],
+        'job_name': fields[f['job_name']],
+        'job_number': fields[f['job_number']],
+        'submission_time': accounting_time(fields[f['submission_time']]),
+        'start_time': accounting_time(fields[f['start_time']]),
+        'end_time': accounting_time(fields[f['end_time']]),
+        'failed': int(fields[f['failed']].split()[0]),
+        'exit_status': int(fields[f['exit_status']]),
+        'slots': int(fields[f['slots']]),
+        'task_number': int(fields[f['task_number']]),
+        'cpu': float(fields[f['cpu']]),
+        'maxvmem': float(fields[f['maxvmem']]),
+    }
+
+# Function: read_accounting()
+# Purpose: Stream the accounting file once and aggregate its records by job
+# and task.  Only jobs in job_ids (a set of job number strings) and/or named
+# job_name are kept; the job number is checked before the rest of the record
+# is parsed, so unrelated jobs cost almost nothing.  Parallel jobs write one
+# record per PE task, which are merged into their array task here.
+# Returns { job_number: { task_number: task_dict } }.
+
+def read_accounting(lines, job_ids=None, job_name=None):
+    jobs = {}
+    for line in lines:
+        if line.startswith('#'):
+            continue
+        head = line.split(':', ACCOUNTING_FIELDS['job_number'] + 1)
+        if len(head) <= ACCOUNTING_FIELDS['job_number']:
+            continue
+        if job_ids is not None and head[ACCOUNTING_FIELDS['job_number']] not in job_ids:
+            continue
+        if job_name is not None and head[ACCOUNTING_FIELDS['job_name']] != job_name:
+            continue
+        record = parse_accounting_record(line)
+        if record is None:
+            continue
+        tasks = jobs.setdefault(record['job_number'], {})
+        task = tasks.get(record['task_number'])
+        if task is None:
+            tasks[record['task_number']] = record
+            continue
+        task['submission_time'] = min(task['submission_time'], record['submission_time'])
+        if record['start_time'] > 0:
+            task['start_time'] = min(task['start_time'], record['start_time']) if task['start_time'] > 0 else record['start_time']
+        task['end_time'] = max(task['end_time'], record['end_time'])
+        task['slots'] = max(task['slots'], record['slots'])
+        task['cpu'] += record['cpu']
+        task['maxvmem'] = max(task['maxvmem'], record['maxvmem'])
+        task['failed'] = task['failed'] or record['failed']
+        task['exit_status'] = task['exit_status'] or record['exit_status']
+    return jobs
+
+# Function: summarize_job()
+# Purpose: Reduce the tasks of one job to (task_array_size, queue wait time,
+# execute time, total run time) in seconds, the same values qacct produced for
+# combine_sge_data_files_for_plotting.sh: the queue wait runs from the first
+# qsub to the first task start and the execute time from there to the last
+# task end.  Tasks that never started are ignored for the start time.
+
+def summarize_job(tasks):
+    qsub_time = min(task['submission_time'] for task in tasks.values())
+    start_times = [ task['start_time'] for task in tasks.values() if task['start_time'] > 0 ]
+    start_time = min(start_times) if start_times else qsub_time
+    end_time = max(max(task['end_time'] for task in tasks.values()), start_time)
+    sge_queue_time = start_time - qsub_time
+    sge_run_time = end_time - start_time
+    return len(tasks), sge_queue_time, sge_run_time, sge_queue_time + sge_run_time
+
+# Function: job_rows()
+# Purpose: Return the per-job CSV rows (without JOB_HEADER) for every job in
+# jobs, sorted by job number.
+
+def job_rows(jobs, cluster_name):
+    rows = []
+    for job_number in sorted(jobs, key=int):
+        task_array_size, sge_queue_time, sge_run_time, total_run_time = summarize_job(jobs[job_number])
+        rows.append("%s,%s,%d,%d,%d,%d" % (cluster_name, job_number, task_array_size, sge_queue_time, sge_run_time, total_run_time))
+    return rows
+
+# Function: task_rows()
+# Purpose: Return the per-task CSV rows (without TASK_HEADER) for every task
+# of every job in jobs, sorted by job and task number.
+
+def task_rows(jobs, cluster_name):
+    rows = []
+    for job_number in sorted(jobs, key=int):
+        for task_number, task in sorted(jobs[job_number].items()):
+            start_time = task['start_time'] if task['start_time'] > 0 else task['submission_time']
+            rows.append("%s,%s,%d,%s,%d,%d,%d,%d,%d,%d,%.3f,%d,%d,%d" % (cluster_name, job_number, task_number, task['hostname'], task['submission_time'], task['start_time'], task['end_time'], start_time - task['submission_time'], max(task['end_time'] - start_time, 0), task['slots'], task['cpu'], task['maxvmem'], task['failed'], task['exit_status']))
+    return rows
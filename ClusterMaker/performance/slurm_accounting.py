@@ -0,0 +1,129 @@
+################################################################################
+# Name:		slurm_accounting.py
+# Author:	Rodney Marable <rodney.marable@gmail.com>
+# Created On:	October 17, 2026
+# Last Changed:	October 17, 2026
+# Purpose:	Parser for Slurm "sacct --parsable2" job accounting output
+################################################################################
+
+# Fields requested from sacct, in order.  read_sacct() expects this layout
+# with no header line, as written by "sacct --parsable2 --noheader" with
+# --format set to ','.join(SACCT_FIELDS).
+
+SACCT_FIELDS = [ 'JobID', 'JobName', 'State', 'Submit', 'Start', 'End', 'AllocCPUS', 'TotalCPU', 'MaxVMSize', 'ExitCode', 'NodeList' ]
+
+########################
+# Function definitions #
+########################
+
+# Function: sacct_command()
+# Purpose: Return the sacct command line that pulls every job and job step
+# needed by read_sacct() in one call, for the given job IDs and/or job name.
+
+def sacct_command(job_ids=None, job_name=None, starttime=None):
+    command = [ 'sacct', '--parsable2', '--noheader', '--format=' + ','.join(SACCT_FIELDS) ]
+    if job_ids:
+        command.append('--jobs=' + ','.join(sorted(job_ids, key=int)))
+    if job_name:
+        command.append('--name=' + job_name)
+    if starttime:
+        command.append('--starttime=' + starttime)
+    return command
+
+# Function: sacct_time()
+# Purpose: Convert a sacct timestamp (YYYY-MM-DDTHH:MM:SS, local time) to epoch
+# seconds.  Returns 0 for Unknown and None, which sacct reports for jobs that
+# have not started or ended yet.
+
+def sacct_time(value):
+    import time
+    if not value or value in ('Unknown', 'None'):
+        return 0
+    return int(time.mktime(time.strptime(value, '%Y-%m-%dT%H:%M:%S')))
+
+# Function: sacct_duration()
+# Purpose: Convert a sacct duration ([DD-[HH:]]MM:SS[.mmm]) to seconds.
+
+def sacct_duration(value):
+    if not value:
+        return 0.0
+    days = 0
+    if '-' in value:
+        days, value = value.split('-', 1)
+    seconds = 0.0
+    for part in value.split(':'):
+        seconds = seconds * 60 + float(part)
+    return int(days) * 86400 + seconds
+
+# Function: sacct_bytes()
+# Purpose: Convert a sacct memory size such as 1234K or 1.5G to bytes.
+
+def sacct_bytes(value):
+    units = { 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4 }
+    if not value:
+        return 0.0
+    if value[-1] in units:
+        return float(value[:-1]) * units[value[-1]]
+    return float(value)
+
+# Function: read_sacct()
+# Purpose: Aggregate sacct --parsable2 lines by job and array task.  The
+# allocation line of each task (JobID 123_4, or 123 for jobs that are not
+# arrays) gives the submit, start, and end times, CPUs, and exit code; the
+# maxvmem is the largest MaxVMSize of its steps (123_4.batch, 123_4.0, ...).
+# Pending array ranges (123_[5-10]) and heterogeneous jobs are skipped, and so
+# are lines with the wrong number of fields: --parsable2 doesn't escape "|",
+# so a job name containing one would shift every field after it.  The lines
+# with too many fields are counted in a warning on stderr.  The
+# task dicts have the same keys as sge_accounting.read_accounting(), so the
+# sge_accounting job_rows() and task_rows() functions produce the same CSV
+# files for both schedulers.
+# Returns { job_number: { task_number: task_dict } }.
+
+def read_sacct(lines, job_ids=None, job_name=None):
+    import re
+    import sys
+    job_id_pattern = re.compile(r'^(\d+)(?:_(\d+))?(?:\.(.+))?$')
+    jobs = {}
+    steps = []
+    misaligned = 0
+    for line in lines:
+        fields = line.rstrip('\n').split('|')
+        if len(fields) != len(SACCT_FIELDS):
+            if len(fields) > len(SACCT_FIELDS):
+                misaligned += 1
+            continue
+        record = dict(zip(SACCT_FIELDS, fields))
+        match = job_id_pattern.match(record['JobID'])
+        if match is None:
+            continue
+        job_number, task_number, step = match.group(1), int(match.group(2) or 0), match.group(3)
+        if job_ids is not None and job_number not in job_ids:
+            continue
+        if step is not None:
+            steps.append((job_number, task_number, record))
+            continue
+        if job_name is not None and record['JobName'] != job_name:
+            continue
+        exit_status, signal = (record['ExitCode'].split(':') + [ '0' ])[:2]
+        jobs.setdefault(job_number, {})[task_number] = {
+            'hostname': record['NodeList'],
+            'job_name': record['JobName'],
+            'job_number': job_number,
+            'submission_time': sacct_time(record['Submit']),
+            'start_time': sacct_time(record['Start']),
+            'end_time': sacct_time(record['End']),
+            'failed': 0 if record['State'] == 'COMPLETED' else 1,
+            'exit_status': int(exit_status or 0) or int(signal or 0),
+            'slots': int(record['AllocCPUS'] or 0),
+            'task_number': task_number,
+            'cpu': sacct_duration(record['TotalCPU']),
+            'maxvmem': 0.0,
+        }
+    for job_number, task_number, record in steps:
+        task = jobs.get(job_number, {}).get(task_number)
+        if task is not None:
+            task['maxvmem'] = max(task['maxvmem'], sacct_bytes(record['MaxVMSize']))
+    if misaligned:
+        print("*** WARNING *** skipped %d sacct line(s) with more than %d fields" % (misaligned, len(SACCT_FIELDS)), file=sys.stderr)
+    return jobs
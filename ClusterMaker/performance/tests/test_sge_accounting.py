@@ -0,0 +1,98 @@
+################################################################################
+# Name:		test_sge_accounting.py
+# Author:	Rodney Marable <rodney.marable@gmail.com>
+# Created On:	October 17, 2026
+# Last Changed:	October 17, 2026
+# Purpose:	Check sge_accounting.read_accounting() against a canned
+#		Grid Engine accounting file
+################################################################################
+#
+# Usage:
+# $ python3 -m pytest ClusterMaker/performance/tests
+################################################################################
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sge_accounting import ACCOUNTING_FIELDS
+from sge_accounting import accounting_time
+from sge_accounting import job_rows
+from sge_accounting import read_accounting
+from sge_accounting import task_rows
+
+# Base timestamp of the canned records, in epoch seconds.
+
+T = 1760000000
+
+# Function: record()
+# Purpose: Return one colon-separated accounting(5) line with the
+# ACCOUNTING_FIELDS set and every other field zero.
+
+def record(hostname, job_name, job_number, task_number, submission_time, start_time, end_time, failed=0, exit_status=0, slots=1, cpu=0.0, maxvmem=0):
+    fields = [ '0' ] * 45
+    fields[0] = 'all.q'
+    values = { 'hostname': hostname, 'job_name': job_name, 'job_number': job_number, 'submission_time': submission_time, 'start_time': start_time, 'end_time': end_time, 'failed': failed, 'exit_status': exit_status, 'slots': slots, 'task_number': task_number, 'cpu': cpu, 'maxvmem': maxvmem }
+    for name, position in ACCOUNTING_FIELDS.items():
+        fields[position] = str(values[name])
+    return ':'.join(fields) + '\n'
+
+# Canned accounting file:
+#
+# Job 10 task 1 ran as a two-slot PE job and wrote one record per PE task.
+# Job 10 task 2 was written by Grid Engine 8.2+ with millisecond timestamps,
+# and a truncated record for task 3 follows it.  Job 11 was deleted before it
+# started (start_time 0).  Job 12 has a different job name.
+
+ACCOUNTING_FILE = [
+    '# Version: 8.1.9\n',
+    '# ITEM: qname:hostname:group:owner:job_name:job_number:...\n',
+    record('node1', 'job_Axb_random', '10', 1, T, T + 10, T + 100, slots=2, cpu=80.0, maxvmem=1000),
+    record('node2', 'job_Axb_random', '10', 1, T, T + 5, T + 120, slots=2, cpu=20.5, maxvmem=3000),
+    record('node3', 'job_Axb_random', '10', 2, T * 1000, (T + 20) * 1000, (T + 80) * 1000),
+    ':'.join(record('node3', 'job_Axb_random', '10', 3, T, T + 1, T + 2).split(':')[:20]) + '\n',
+    record('node4', 'job_Axb_random', '11', 0, T + 100, 0, 0, failed=19),
+    record('node5', 'other_job', '12', 0, T, T + 1, T + 2),
+    '\n',
+]
+
+def test_accounting_time():
+    assert accounting_time(str(T)) == T
+    assert accounting_time(str(T * 1000)) == T
+    assert accounting_time('0') == 0
+
+def test_read_accounting_skips_comments_and_truncated_records():
+    jobs = read_accounting(ACCOUNTING_FILE)
+    assert sorted(jobs) == [ '10', '11', '12' ]
+    assert sorted(jobs['10']) == [ 1, 2 ]
+
+def test_read_accounting_merges_pe_tasks():
+    task = read_accounting(ACCOUNTING_FILE)['10'][1]
+    assert task['hostname'] == 'node1'
+    assert (task['start_time'], task['end_time']) == (T + 5, T + 120)
+    assert task['cpu'] == 100.5
+    assert task['maxvmem'] == 3000
+    assert task['slots'] == 2
+
+def test_read_accounting_milliseconds():
+    task = read_accounting(ACCOUNTING_FILE)['10'][2]
+    assert (task['submission_time'], task['start_time'], task['end_time']) == (T, T + 20, T + 80)
+
+def test_read_accounting_filters():
+    assert sorted(read_accounting(ACCOUNTING_FILE, job_ids={ '11' })) == [ '11' ]
+    assert sorted(read_accounting(ACCOUNTING_FILE, job_name='other_job')) == [ '12' ]
+    assert sorted(read_accounting(ACCOUNTING_FILE, job_ids={ '10', '12' }, job_name='job_Axb_random')) == [ '10' ]
+    assert read_accounting(ACCOUNTING_FILE, job_ids={ '99' }) == {}
+
+def test_job_rows():
+    jobs = read_accounting(ACCOUNTING_FILE)
+    assert job_rows(jobs, 'sge01') == [ 'sge01,10,2,5,115,120', 'sge01,11,1,0,0,0', 'sge01,12,1,1,1,2' ]
+
+def test_task_rows():
+    jobs = read_accounting(ACCOUNTING_FILE, job_ids={ '10', '11' })
+    assert task_rows(jobs, 'sge01') == [
+        'sge01,10,1,node1,%d,%d,%d,5,115,2,100.500,3000,0,0' % (T, T + 5, T + 120),
+        'sge01,10,2,node3,%d,%d,%d,20,60,1,0.000,0,0,0' % (T, T + 20, T + 80),
+        'sge01,11,0,node4,%d,0,0,0,0,1,0.000,0,19,0' % (T + 100),
+    ]
@@ -0,0 +1,92 @@
+################################################################################
+# Name:		test_slurm_accounting.py
+# Author:	Rodney Marable <rodney.marable@gmail.com>
+# Created On:	October 17, 2026
+# Last Changed:	October 17, 2026
+# Purpose:	Check slurm_accounting.read_sacct() against canned sacct output
+################################################################################
+#
+# Usage:
+# $ python3 -m pytest ClusterMaker/performance/tests
+################################################################################
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sge_accounting import job_rows
+from sge_accounting import task_rows
+from slurm_accounting import SACCT_FIELDS
+from slurm_accounting import read_sacct
+from slurm_accounting import sacct_bytes
+from slurm_accounting import sacct_duration
+from slurm_accounting import sacct_time
+
+# Canned "sacct --parsable2 --noheader" output in the SACCT_FIELDS layout:
+# JobID|JobName|State|Submit|Start|End|AllocCPUS|TotalCPU|MaxVMSize|ExitCode|NodeList
+#
+# Job 123 is an array with one completed task (4) whose batch, extern, and
+# srun steps report MaxVMSize, one failed task (5), and a pending range
+# (6-9).  Job 124 is a plain job cancelled before it started.
+
+SACCT_OUTPUT = [
+    '123_4|job_Axb_random|COMPLETED|2026-10-17T10:00:00|2026-10-17T10:00:30|2026-10-17T10:05:30|2|09:30.500||0:0|node1\n',
+    '123_4.batch|batch|COMPLETED|2026-10-17T10:00:30|2026-10-17T10:00:30|2026-10-17T10:05:30|2|09:30.500|1024K|0:0|node1\n',
+    '123_4.extern|extern|COMPLETED|2026-10-17T10:00:30|2026-10-17T10:00:30|2026-10-17T10:05:30|2|00:00:00|2048K|0:0|node1\n',
+    '123_4.0|Axb_random.py|COMPLETED|2026-10-17T10:00:31|2026-10-17T10:00:31|2026-10-17T10:05:29|2|09:29.000|512K|0:0|node1\n',
+    '123_5|job_Axb_random|FAILED|2026-10-17T10:00:00|2026-10-17T10:01:00|2026-10-17T10:03:00|2|01:00||1:0|node2\n',
+    '123_5.batch|batch|FAILED|2026-10-17T10:01:00|2026-10-17T10:01:00|2026-10-17T10:03:00|2|01:00|1.5M|1:0|node2\n',
+    '123_[6-9]|job_Axb_random|PENDING|2026-10-17T10:00:00|Unknown|Unknown|2|00:00:00||0:0|None assigned\n',
+    '124|job_Axb_random|CANCELLED by 1000|2026-10-17T11:00:00|None|2026-10-17T11:10:00|0|00:00:00||0:15|None assigned\n',
+]
+
+def test_sacct_conversions():
+    assert sacct_duration('1-02:03:04') == 93784
+    assert sacct_duration('09:30.500') == 570.5
+    assert sacct_duration('') == 0.0
+    assert sacct_bytes('1024K') == 1048576
+    assert sacct_bytes('1.5M') == 1.5 * 1024 ** 2
+    assert sacct_time('Unknown') == 0
+    assert sacct_time('None') == 0
+
+def test_read_sacct_tasks():
+    jobs = read_sacct(SACCT_OUTPUT)
+    assert sorted(jobs) == [ '123', '124' ]
+    assert sorted(jobs['123']) == [ 4, 5 ]
+    task = jobs['123'][4]
+    assert task['hostname'] == 'node1'
+    assert task['slots'] == 2
+    assert task['cpu'] == 570.5
+    assert task['maxvmem'] == 2048 * 1024
+    assert (task['failed'], task['exit_status']) == (0, 0)
+    task = jobs['123'][5]
+    assert task['maxvmem'] == 1.5 * 1024 ** 2
+    assert (task['failed'], task['exit_status']) == (1, 1)
+    task = jobs['124'][0]
+    assert task['start_time'] == 0
+    assert (task['failed'], task['exit_status']) == (1, 15)
+
+def test_read_sacct_rows():
+    jobs = read_sacct(SACCT_OUTPUT)
+    assert job_rows(jobs, 'slurm01') == [ 'slurm01,123,2,30,300,330', 'slurm01,124,1,0,600,600' ]
+    rows = [ row.split(',') for row in task_rows(jobs, 'slurm01') ]
+    assert [ row[:4] for row in rows ] == [ [ 'slurm01', '123', '4', 'node1' ], [ 'slurm01', '123', '5', 'node2' ], [ 'slurm01', '124', '0', 'None assigned' ] ]
+    assert rows[0][4] == str(sacct_time('2026-10-17T10:00:00'))
+    assert [ row[7:] for row in rows ] == [
+        [ '30', '300', '2', '570.500', '2097152', '0', '0' ],
+        [ '60', '120', '2', '60.000', '1572864', '1', '1' ],
+        [ '0', '600', '0', '0.000', '0', '1', '15' ],
+    ]
+
+def test_read_sacct_filters():
+    assert sorted(read_sacct(SACCT_OUTPUT, job_ids={ '124' })) == [ '124' ]
+    assert read_sacct(SACCT_OUTPUT, job_name='other') == {}
+
+def test_read_sacct_skips_misaligned_lines(capsys):
+    extra = '125|job|Axb|COMPLETED|2026-10-17T12:00:00|2026-10-17T12:00:00|2026-10-17T12:01:00|1|00:10||0:0|node3\n'
+    short = '126|job_Axb_random|COMPLETED\n'
+    assert len(extra.split('|')) == len(SACCT_FIELDS) + 1
+    jobs = read_sacct(SACCT_OUTPUT + [ extra, short ])
+    assert sorted(jobs) == [ '123', '124' ]
+    assert 'skipped 1 sacct line(s)' in capsys.readouterr().err
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+#
+################################################################################
+# Name:		update_price_cache.py
+# Author:	Rodney Marable <rodney.marable@gmail.com>
+# Created On:	October 17, 2026
+# Last Changed:	October 17, 2026
+# Purpose:	Refresh or edit the local EC2 price cache used by the cost plots
+################################################################################
+#
+# Usage:
+# $ update_price_cache.py [-h] [--price-cache PRICE_CACHE] [--region REGION]
+#                         [--instance-types INSTANCE_TYPES]
+#                         [--markets {ondemand,spot,both}] [--set SET] [--list]
+#
+# Examples:
+# $ ./update_price_cache.py --region us-east-1 --instance-types t2.xlarge,c5.2xlarge
+# $ ./update_price_cache.py --region us-east-1 --set t2.xlarge:ondemand=0.1856
+# $ ./update_price_cache.py --list
+#
+# Prices are fetched from the AWS Price List API (on-demand) and
+# describe_spot_price_history (spot) when AWS credentials and a network
+# connection are available.  The plotting scripts only ever read the cache, so
+# they work fully offline once it has been populated.
+################################################################################
+
+# Import the required Python libraries.
+
+import argparse
+import sys
+
+# Import the shared hpc_performance price cache.
+
+from price_cache import PRICE_CACHE
+from price_cache import PRICE_MARKETS
+from price_cache import load_price_cache
+from price_cache import refresh_price_cache
+from price_cache import save_price_cache
+from price_cache import set_price
+
+# Parse the command line.
+
+parser = argparse.ArgumentParser(description='Refresh or edit the local EC2 price cache used by the cost plots')
+parser.add_argument('--price-cache', '-p', help='path to the price cache (default = %s)' % PRICE_CACHE, required=False, default=PRICE_CACHE)
+parser.add_argument('--region', '-r', help='AWS Region to price (required with --instance-types and --set)', required=False)
+parser.add_argument('--instance-types', '-i', help='comma-separated list of EC2 instance types to fetch current prices for', required=False)
+parser.add_argument('--markets', '-m', help='markets to fetch: ondemand, spot, or both (default = both)', required=False, default='both', choices=PRICE_MARKETS + [ 'both' ])
+parser.add_argument('--set', '-s', help='record a price by hand as INSTANCE_TYPE:MARKET=PRICE (may be repeated)', required=False, action='append', default=[])
+parser.add_argument('--list', '-l', help='print the cached prices', required=False, action='store_true')
+
+args = parser.parse_args()
+if (args.instance_types or args.set) and not args.region:
+    parser.error('--region is required with --instance-types and --set')
+markets = PRICE_MARKETS if args.markets == 'both' else [ args.markets ]
+cache = load_price_cache(args.price_cache)
+
+# Record any prices given by hand.
+
+for setting in args.set:
+    try:
+        key, price = setting.split('=', 1)
+        instance_type, market = key.split(':', 1)
+        if market not in PRICE_MARKETS:
+            raise ValueError
+        set_price(cache, args.region, instance_type, market, float(price))
+    except ValueError:
+        parser.error('--set must look like INSTANCE_TYPE:MARKET=PRICE with MARKET one of %s: %s' % (', '.join(PRICE_MARKETS), setting))
+
+# Fetch the current prices.  Keep the cached prices if AWS can't be reached.
+
+if args.instance_types:
+    import botocore.exceptions
+    instance_types = [ instance_type.strip() for instance_type in args.instance_types.split(',') if instance_type.strip() ]
+    try:
+        for instance_type, market, price in refresh_price_cache(cache, args.region, instance_types, markets):
+            if price is None:
+                print("*** WARNING *** No %s price was found for %s in %s" % (market, instance_type, args.region))
+            else:
+                print("%s %s %s = $%.4f per hour" % (args.region, instance_type, market, price))
+    except (botocore.exceptions.BotoCoreError, botocore.exceptions.ClientError) as e:
+        print("*** WARNING *** Unable to fetch prices from AWS, keeping the cached prices:", e)
+
+if args.set or args.instance_types:
+    save_price_cache(cache, args.price_cache)
+    print("Saved  ==>  %s" % args.price_cache)
+
+# Print the cached prices.
+
+if args.list:
+    for region in sorted(cache['prices']):
+        for instance_type in sorted(cache['prices'][region]):
+            entry = cache['prices'][region][instance_type]
+            for market in PRICE_MARKETS:
+                if market in entry:
+                    print("%s %s %s = $%.4f per hour (updated %s)" % (region, instance_type, market, entry[market], entry[market + '_updated']))
+
+# Cleanup and exit.
+
+sys.exit(0)
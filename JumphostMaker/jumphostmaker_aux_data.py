@@ -2,7 +2,7 @@
 # Name:		jumphostmaker_aux_data.py
 # Author:	Rodney Marable <rodney.marable@gmail.com>
 # Created On:	April 16, 2019
-# Last Changed:	June 25, 2019
+# Last Changed:	October 17, 2026
 # Purpose:	Data structures and functions for make-pcluster-jumphost.py
 ################################################################################
 
@@ -42,6 +42,87 @@ def get_ami_info(base_os, region):
     aws_ami = amis[0]['ImageId']
     return(aws_ami)
 
+# Number of seconds each kind of cached AWS lookup stays valid.  Lookups of
+# resources these scripts create or delete (stacks, buckets, IAM roles, key
+# pairs, security groups) are never cached.
+
+aws_cache_ttls = {
+    'aws_account_id': 30 * 86400,
+    'availability_zones': 7 * 86400,
+    'ami_info': 86400,
+    'vpcs': 3600,
+    'subnets': 3600
+}
+
+# Function: open_aws_cache()
+# Purpose: Return a handle to the on-disk AWS metadata cache shared by the
+# maker scripts, creating it if needed.  The cache is a SQLite database under
+# $XDG_CACHE_HOME (default = ~/.cache) keyed by AWS account, Region, and
+# query, so parallel builds can safely share it.  With refresh=True every
+# lookup ignores the cached values and stores fresh ones.  If the cache can't
+# be opened, lookups simply aren't cached.
+
+def open_aws_cache(refresh=False, path=None):
+    import contextlib
+    import os
+    import sqlite3
+    if path is None:
+        path = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'parallelclustermaker', 'aws_metadata.sqlite')
+    aws_cache = { 'path': path, 'refresh': refresh, 'enabled': True }
+    try:
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        with contextlib.closing(sqlite3.connect(path, timeout=30)) as connection:
+            with connection:
+                connection.execute('CREATE TABLE IF NOT EXISTS aws_metadata (account TEXT, region TEXT, query TEXT, value TEXT, expires REAL, PRIMARY KEY (account, region, query))')
+    except (OSError, sqlite3.Error):
+        aws_cache['enabled'] = False
+    return aws_cache
+
+# Function: cached_aws_call()
+# Purpose: Return the result of function() for query in account and region,
+# from the cache if an entry younger than ttl seconds exists.  Results are
+# stored as JSON and returned in that form (timestamps become strings)
+# whether or not they came from the cache.  Exceptions and empty results are
+# never cached, so a missing resource is looked up again on the next run.
+
+def cached_aws_call(aws_cache, account, region, query, function, ttl):
+    import contextlib
+    import json
+    import sqlite3
+    import time
+    if aws_cache['enabled'] and not aws_cache['refresh']:
+        try:
+            with contextlib.closing(sqlite3.connect(aws_cache['path'], timeout=30)) as connection:
+                row = connection.execute('SELECT value FROM aws_metadata WHERE account = ? AND region = ? AND query = ? AND expires > ?', (account, region, query, time.time())).fetchone()
+        except sqlite3.Error:
+            row = None
+        if row is not None:
+            return json.loads(row[0])
+    value_text = json.dumps(function(), default=str, sort_keys=True)
+    value = json.loads(value_text)
+    if aws_cache['enabled'] and value:
+        try:
+            with contextlib.closing(sqlite3.connect(aws_cache['path'], timeout=30)) as connection:
+                with connection:
+                    connection.execute('INSERT OR REPLACE INTO aws_metadata VALUES (?, ?, ?, ?, ?)', (account, region, query, value_text, time.time() + ttl))
+                    connection.execute('DELETE FROM aws_metadata WHERE expires <= ?', (time.time(),))
+        except sqlite3.Error:
+            pass
+    return value
+
+# Function: cached_aws_account_id()
+# Purpose: Return the AWS Account ID of the current credentials.  It is
+# cached under a hash of the access key ID, so a warm run makes no STS call.
+
+def cached_aws_account_id(aws_cache, stsclient):
+    import boto3
+    import hashlib
+    credentials = boto3.Session().get_credentials()
+    if credentials is None:
+        return stsclient.get_caller_identity()['Account']
+    credentials_key = 'credentials ' + hashlib.sha256(credentials.access_key.encode()).hexdigest()[:16]
+    return cached_aws_call(aws_cache, credentials_key, 'global', 'aws_account_id', lambda: stsclient.get_caller_identity()['Account'], aws_cache_ttls['aws_account_id'])
+
 # Function: illegal_az_msg()
 # Purpose: Return an error message when an invalid AZ is provided
 
@@ -4,7 +4,7 @@
 # Name:         make-pcluster-jumphost.py
 # Author:       Rodney Marable <rodney.marable@gmail.com>
 # Created On:   April 18, 2019
-# Last Changed: June 26, 2019
+# Last Changed: October 17, 2026
 # Purpose:      Create an EC2 jumphost to run the ParallelClusterMaker toolkit
 ################################################################################
 
@@ -27,9 +27,13 @@ from nested_lookup import nested_lookup
 # Source: jumphostmaker_aux_data.py
 
 from jumphostmaker_aux_data import add_security_group_rule
+from jumphostmaker_aux_data import aws_cache_ttls
+from jumphostmaker_aux_data import cached_aws_account_id
+from jumphostmaker_aux_data import cached_aws_call
 from jumphostmaker_aux_data import ctrlC_Abort
 from jumphostmaker_aux_data import get_ami_info
 from jumphostmaker_aux_data import illegal_az_msg
+from jumphostmaker_aux_data import open_aws_cache
 from jumphostmaker_aux_data import p_fail
 from jumphostmaker_aux_data import p_val
 from jumphostmaker_aux_data import print_TextHeader
@@ -54,6 +58,7 @@ parser.add_argument('--debug_mode', '-D', choices=['true', 'false'], help='Enabl
 parser.add_argument('--instance_owner_department', choices=['analytics', 'clinical', 'commercial', 'compbio', 'compchem', 'datasci', 'design', 'development', 'hpc', 'imaging', 'manufacturing', 'medical', 'modeling', 'operations', 'proteomics', 'robotics', 'qa', 'research', 'scicomp'], help='Department of the instance_owner (default = hpc)', required=False, default='hpc')
 parser.add_argument('--prod_level', choices=['dev', 'test', 'stage', 'prod'], help='Operating stage of the jumphost  (default = dev)', required=False, default='dev')
 parser.add_argument('--project_id', '-P', help='Project name or ID number (default = UNDEFINED)', required=False, default='UNDEFINED')
+parser.add_argument('--refresh_cache', '--refresh-cache', choices=['true', 'false'], help='Ignore the cached AWS metadata (AZs, VPCs, subnets, account ID, AMI) and refresh it (default = false)', required=False, default='false')
 parser.add_argument('--security_group', help='Primary security group for the EC2 pcluster-jumphost (default = parallelclustermaker_jumphost)', required=False, default='parallelclustermaker_jumphost')
 parser.add_argument('--turbot_account', '-T', help='Turbot account ID (default = abd).  Set to "disabled" in non-Turbot environments.', required=False, default='disabled')
 
@@ -68,6 +73,7 @@ instance_owner = args.instance_owner
 instance_owner_email = args.instance_owner_email
 instance_owner_department = args.instance_owner_department
 prod_level = args.prod_level
+refresh_cache = args.refresh_cache
 project_id = args.project_id
 region = az[:-1]
 security_group = args.security_group
@@ -187,10 +193,18 @@ p_val('ebs_volume_type', debug_mode)
 
 # Perform error checking on the selected AWS Region and Availability Zone.
 # Abort if a non-existent Availability Zone was chosen.
+#
+# The AWS Account ID, Availability Zones, VPCs, subnets, and latest AMI change
+# rarely, so they are read from the AWS metadata cache shared with the
+# ClusterMaker scripts when a fresh entry exists.  Use "--refresh_cache true"
+# to ignore the cache after changing the network configuration.
 
+aws_cache = open_aws_cache(refresh_cache == 'true')
 try:
     ec2client = boto3.client('ec2', region_name = region)
-    az_information = ec2client.describe_availability_zones()
+    stsclient = boto3.client('sts', region_name=region, endpoint_url='https://sts.' + region + '.amazonaws.com')
+    aws_account_id = cached_aws_account_id(aws_cache, stsclient)
+    az_information = cached_aws_call(aws_cache, aws_account_id, region, 'availability_zones', lambda: ec2client.describe_availability_zones()['AvailabilityZones'], aws_cache_ttls['availability_zones'])
 except (ValueError):
     illegal_az_msg(az)
 except (botocore.exceptions.EndpointConnectionError):
@@ -199,18 +213,11 @@ else:
     p_val('region', debug_mode)
     p_val('az', debug_mode)
 
-# Parse the AWS Account ID.
-
-stsclient = boto3.client('sts', region_name=region, endpoint_url='https://sts.' + region + '.amazonaws.com')
-aws_account_id = stsclient.get_caller_identity()["Account"]
-
 # Parse the subnet_id, vpc_id, and vpc_name from the selected AWS Region and
 # Availability Zone.
 
-subnet_information = ec2client.describe_subnets(
-    Filters=[ { 'Name': 'availabilityZone', 'Values': [ az, ] }, ],
-)
-vpc_information = ec2client.describe_vpcs()
+subnet_information = { 'Subnets': cached_aws_call(aws_cache, aws_account_id, region, 'subnets ' + az, lambda: ec2client.describe_subnets(Filters=[ { 'Name': 'availabilityZone', 'Values': [ az, ] }, ])['Subnets'], aws_cache_ttls['subnets']) }
+vpc_information = { 'Vpcs': cached_aws_call(aws_cache, aws_account_id, region, 'vpcs', lambda: ec2client.describe_vpcs()['Vpcs'], aws_cache_ttls['vpcs']) }
 
 try:
     subnet_id = subnet_information['Subnets'][0]['SubnetId']
@@ -255,7 +262,7 @@ p_val('vpc_security_group_ids', debug_mode)
 base_os = 'alinux2'
 ec2_user = 'ec2-user'
 ec2_user_home = '/home/' + ec2_user
-aws_ami = get_ami_info(base_os, region)
+aws_ami = cached_aws_call(aws_cache, aws_account_id, region, 'ami_info ' + base_os, lambda: get_ami_info(base_os, region), aws_cache_ttls['ami_info'])
 p_val('aws_ami', debug_mode)
 p_val('base_os', debug_mode)
 